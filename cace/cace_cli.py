@@ -15,6 +15,7 @@ import os
 import sys
 import json
 import time
+import yaml
 import signal
 import logging
 import argparse
@@ -51,6 +52,8 @@ from .logging import (
 )
 
 from .parameter.parameter import ResultType
+from .common.memory_governor import parse_memory_size
+from .common.sim_cache import parse_cache_size, DEFAULT_CACHE_SIZE
 
 
 def start_parameter(param, progress, task_ids, steps):
@@ -154,6 +157,14 @@ def cli():
         default=4,
         help="the maximum number of parameters running in parallel",
     )
+    parser.add_argument(
+        "--priority",
+        type=str,
+        choices=["interactive", "batch"],
+        default="batch",
+        help="""priority of the jobs of this run, interactive jobs get a free CPU
+        before waiting batch jobs""",
+    )
     parser.add_argument(
         "-f",
         "--force",
@@ -170,6 +181,12 @@ def cli():
         type=str,
         help='override the default "runs/" directory',
     )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="RUN_DIR",
+        help="""continue an interrupted run in RUN_DIR, only missing or failed simulations are run again""",
+    )
     parser.add_argument(
         "--no-plot", action="store_true", help="do not generate any graphs"
     )
@@ -186,11 +203,67 @@ def cli():
         action="store_true",
         help="runs simulations sequentially",
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=["thread", "asyncio"],
+        default="thread",
+        help="""run subprocesses from a pool of threads or from a single asyncio event loop""",
+    )
+    parser.add_argument(
+        "--ngspice-backend",
+        type=str,
+        choices=["subprocess", "shared"],
+        default="subprocess",
+        help="""run local simulations as ngspice subprocesses or via the shared
+        library libngspice in reusable worker processes""",
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        default=[],
+        help="""run simulations also on these cace-workers, given as tcp://host:port or unix://path""",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=parse_memory_size,
+        help="""hold back new simulations and tools while their expected memory
+        would exceed this budget, e.g. 16G or 75%%""",
+    )
+    parser.add_argument(
+        "--sim-cache",
+        help="""reuse the results of identical simulations from this directory
+        and add new results to it""",
+    )
+    parser.add_argument(
+        "--sim-cache-size",
+        type=parse_cache_size,
+        default=DEFAULT_CACHE_SIZE,
+        help="""evict the least recently used simulations once the cache exceeds
+        this size, e.g. 512M or 10G (default: 10G)""",
+    )
     parser.add_argument(
         "--no-progress-bar",
         action="store_true",
         help="do not display the progress bar",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="cancel the remaining simulations of a parameter once a result violates its spec",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="""print the number of simulations and the expected runtime of the
+        parameters based on previous runs, without running any tool""",
+    )
+    parser.add_argument(
+        "--plan-output",
+        type=str,
+        metavar="FILE",
+        help="""save the plan of --plan to FILE (YAML)""",
+    )
     parser.add_argument(
         "--nofail",
         action="store_true",
@@ -206,45 +279,63 @@ def cli():
 
     # Create the ParameterManager
     parameter_manager = ParameterManager(
-        max_runs=args.max_runs, run_path=args.run_path, max_jobs=args.jobs
+        max_runs=args.max_runs,
+        run_path=args.run_path,
+        max_jobs=args.jobs,
+        resume_dir=args.resume,
     )
 
-    # Load the datasheet
+    # Load the datasheet, a plan does not create a run directory
     if args.datasheet:
-        if parameter_manager.load_datasheet(args.datasheet):
+        if parameter_manager.load_datasheet(args.datasheet, init_run_dir=not args.plan):
             sys.exit(0)
     # Else search for it starting from the cwd
     else:
-        if parameter_manager.find_datasheet(os.getcwd()):
+        if parameter_manager.find_datasheet(os.getcwd(), init_run_dir=not args.plan):
             sys.exit(0)
 
+    # Only load the runtimes of previous runs
+    if args.plan:
+        parameter_manager.prepare_run_dir(dry_run=True)
+
     # Save the datasheet
     if args.output:
         parameter_manager.save_datasheet(args.output)
 
-    # Log warnings and errors to files
     handlers: List[logging.Handler] = []
-    for level in ["WARNING", "ERROR"]:
-        path = os.path.join(parameter_manager.run_dir, f"{level.lower()}.log")
+
+    # A plan has no run directory for logs
+    if not args.plan:
+        # Log warnings and errors to files
+        for level in ["WARNING", "ERROR"]:
+            path = os.path.join(parameter_manager.run_dir, f"{level.lower()}.log")
+            handler = logging.FileHandler(path, mode="a+")
+            handler.setLevel(level)
+            handler.addFilter(LevelFilter([level]))
+            handlers.append(handler)
+            register_additional_handler(handler)
+
+        # Log everything to a file
+        path = os.path.join(parameter_manager.run_dir, "flow.log")
         handler = logging.FileHandler(path, mode="a+")
-        handler.setLevel(level)
-        handler.addFilter(LevelFilter([level]))
+        handler.setLevel("VERBOSE")
         handlers.append(handler)
         register_additional_handler(handler)
 
-    # Log everything to a file
-    path = os.path.join(parameter_manager.run_dir, "flow.log")
-    handler = logging.FileHandler(path, mode="a+")
-    handler.setLevel("VERBOSE")
-    handlers.append(handler)
-    register_additional_handler(handler)
-
     # Set runtime options
     parameter_manager.set_runtime_options("force", args.force)
     parameter_manager.set_runtime_options("noplot", args.no_plot)
     parameter_manager.set_runtime_options("nosim", False)
     parameter_manager.set_runtime_options("sequential", args.sequential)
     parameter_manager.set_runtime_options("netlist_source", args.source)
+    parameter_manager.set_runtime_options("engine", args.engine)
+    parameter_manager.set_runtime_options("ngspice_backend", args.ngspice_backend)
+    parameter_manager.set_runtime_options("memory_budget", args.memory_budget)
+    parameter_manager.set_runtime_options("workers", args.workers)
+    parameter_manager.set_runtime_options("fail_fast", args.fail_fast)
+    parameter_manager.set_runtime_options("sim_cache", args.sim_cache)
+    parameter_manager.set_runtime_options("sim_cache_size", args.sim_cache_size)
+    parameter_manager.set_runtime_options("priority", args.priority)
     parameter_manager.set_runtime_options(
         "parallel_parameters", args.parallel_parameters
     )
@@ -324,7 +415,9 @@ def cli():
         err("No parameters specified to run.")
         sys.exit(1)
 
-    info(f'Running parameters: {", ".join(queued_pnames)}')
+    info(
+        f'{"Planning" if args.plan else "Running"} parameters: {", ".join(queued_pnames)}'
+    )
 
     for queued_pname in queued_pnames:
         if not queued_pname in pnames:
@@ -343,6 +436,27 @@ def cli():
             end_cb=lambda param: end_parameter(param, progress, task_ids, task_id),
         )
 
+    # Only estimate the cost of the queued parameters
+    if args.plan:
+        progress.remove_task(task_id)
+        progress.stop()
+
+        plan = parameter_manager.plan_parameters()
+        console.print(Markdown(parameter_manager.summarize_plan(plan)))
+
+        # Save the plan
+        if args.plan_output:
+            info(f"Writing the plan to {args.plan_output}")
+            with open(args.plan_output, "w") as ofile:
+                yaml.dump(plan, ofile, default_flow_style=False, sort_keys=False)
+
+        for registered_handlers in handlers:
+            deregister_additional_handler(registered_handlers)
+
+        parameter_manager.shutdown()
+
+        sys.exit(0)
+
     # Set the total number of parameters in the progress bar
     progress.update(task_id, total=parameter_manager.num_queued_parameters())
 
@@ -370,6 +484,13 @@ def cli():
     delta = str(timedelta(seconds=time.time() - timestamp_start)).split(".")[0]
     info(f"Done with CACE simulations and evaluations in {delta}.")
 
+    # Print how long jobs have been waiting for a free CPU
+    for priority, stats in parameter_manager.get_job_statistics().items():
+        if stats["jobs"]:
+            info(
+                f'{stats["jobs"]} {priority} jobs waited {stats["mean_wait"]:.2f}s on average (max {stats["max_wait"]:.2f}s) for a free CPU.'
+            )
+
     # Print the summary to the console
     summary = parameter_manager.summarize_datasheet()
     console.print(Markdown(summary))
@@ -403,6 +524,9 @@ def cli():
     else:
         info(f"CACE failed, skipping documentation generation.")
 
+    # Stop the remaining worker processes before exiting
+    parameter_manager.shutdown()
+
     # Exit with final status
     if args.nofail:
         sys.exit(0)
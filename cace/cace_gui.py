@@ -433,7 +433,7 @@ class CACEGui(ttk.Frame):
 
         self.update_simulate_all_button(from_callback=True)
 
-    def simulate_param(self, pname, process=True):
+    def simulate_param(self, pname, process=True, priority="interactive"):
         """Simulate a single parameter"""
 
         self.parameter_manager.set_runtime_options("force", self.settings.get_force())
@@ -443,6 +443,8 @@ class CACEGui(ttk.Frame):
         )
         self.parameter_manager.set_runtime_options("noplot", self.settings.get_noplot())
         self.parameter_manager.set_runtime_options("debug", self.settings.get_debug())
+        # By default ahead of the jobs of "Simulate All"
+        self.parameter_manager.set_runtime_options("priority", priority)
         self.parameter_manager.set_runtime_options(
             "parallel_parameters", self.settings.get_parallel_parameters()
         )
@@ -650,7 +652,7 @@ class CACEGui(ttk.Frame):
 
         # Queue all of the parameters
         for pname in self.parameter_manager.get_all_pnames():
-            self.simulate_param(pname, False)
+            self.simulate_param(pname, False, "batch")
 
         # Now simulate all parameters
         self.parameter_manager.run_parameters_async()
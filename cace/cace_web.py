@@ -57,6 +57,13 @@ def runsim():
     parameter_manager.max_jobs = rd["jobs"]
 
     parameter_manager.prepare_run_dir()
+
+    # Read when a parameter is queued, a single parameter
+    # goes ahead of the jobs of a larger run
+    parameter_manager.set_runtime_options(
+        "priority", "interactive" if len(params) == 1 else "batch"
+    )
+
     for pname in params:
         parameter_manager.queue_parameter(
             pname=pname,
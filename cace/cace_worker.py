@@ -0,0 +1,360 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import sys
+import hmac
+import time
+import shutil
+import select
+import socket
+import tarfile
+import argparse
+import tempfile
+import threading
+import subprocess
+import socketserver
+
+from .__version__ import __version__
+from .common.executor import (
+    TOKEN_ENV,
+    parse_address,
+    send_message,
+    recv_message,
+    file_hash,
+    pack_tar,
+    unpack_tar,
+)
+from .logging import set_log_level
+from .logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# Included files are cached by their SHA-256
+SHA_REGEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_below(path, root):
+    """Whether path resolves to a location below root"""
+
+    root = os.path.realpath(root)
+    return os.path.realpath(path).startswith(root + os.sep)
+
+
+class Worker:
+    """Runs the simulation jobs received from CACE"""
+
+    def __init__(self, jobs, work_dir, pdk_root, token=None):
+        self.jobs = jobs
+        self.work_dir = work_dir
+        self.pdk_root = pdk_root
+
+        # Shared secret that clients must send, if set
+        self.token = token
+
+        self.cache_dir = os.path.join(work_dir, "cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.jobs_sem = threading.Semaphore(jobs)
+
+    def handle(self, sock):
+        message, _ = recv_message(sock)
+
+        if not isinstance(message, dict) or not isinstance(message.get("type"), str):
+            send_message(sock, {"type": "error", "message": "Invalid request"})
+            return
+
+        if self.token and not hmac.compare_digest(
+            str(message.get("token", "")), self.token
+        ):
+            warn("Rejected a request with an invalid token.")
+            send_message(sock, {"type": "error", "message": "Invalid token"})
+            return
+
+        if message["type"] == "hello":
+            send_message(
+                sock, {"type": "hello", "jobs": self.jobs, "version": __version__}
+            )
+        elif message["type"] == "run":
+            self.run_job(sock, message)
+        else:
+            send_message(
+                sock,
+                {"type": "error", "message": f'Unknown request: {message["type"]}'},
+            )
+
+    def validate_job(self, message):
+        """
+        Return the reason if a job is malformed or
+        refers to files outside of its directory
+        """
+
+        if not isinstance(message.get("simfile"), str):
+            return "Missing simfile"
+
+        includes = message.get("includes")
+        if not isinstance(includes, dict) or not all(
+            isinstance(arcname, str) and isinstance(sha, str)
+            for arcname, sha in includes.items()
+        ):
+            return "Invalid includes"
+
+        if not isinstance(message.get("pdk_root"), (str, type(None))):
+            return "Invalid pdk_root"
+
+        # Any directory below the job directory
+        outpath = os.path.join(self.work_dir, "job")
+
+        if not is_below(os.path.join(outpath, message["simfile"]), outpath):
+            return f'Invalid simfile {message["simfile"]}'
+
+        for arcname, sha in message["includes"].items():
+            if not SHA_REGEX.match(sha):
+                return f"Invalid hash of include {arcname}"
+            if not is_below(os.path.join(outpath, arcname), outpath):
+                return f"Invalid include {arcname}"
+
+        return None
+
+    def run_job(self, sock, message):
+        if reason := self.validate_job(message):
+            warn(f"Rejected job: {reason}")
+            send_message(sock, {"type": "error", "message": reason})
+            return
+
+        # Request the included files that are not cached yet
+        includes = message["includes"]
+        missing = [
+            arcname
+            for arcname, sha in includes.items()
+            if not os.path.isfile(os.path.join(self.cache_dir, sha))
+        ]
+        send_message(sock, {"type": "missing", "missing": missing})
+
+        _, payload = recv_message(sock)
+
+        with self.jobs_sem, tempfile.TemporaryDirectory(dir=self.work_dir) as outpath:
+            unpack_tar(payload, outpath)
+            received = set(os.listdir(outpath))
+
+            # Update the cache and restore the cached includes
+            for arcname, sha in includes.items():
+                path = os.path.join(outpath, arcname)
+                cached = os.path.join(self.cache_dir, sha)
+                if arcname in missing:
+                    if file_hash(path) != sha:
+                        raise ValueError(f"Corrupted include {arcname}")
+                    shutil.copyfile(path, cached + ".tmp")
+                    os.replace(cached + ".tmp", cached)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    shutil.copyfile(cached, path)
+
+            # Use the PDK installed on this node
+            if (
+                self.pdk_root
+                and message["pdk_root"]
+                and message["pdk_root"] != self.pdk_root
+            ):
+                for name in [message["simfile"], ".spiceinit"]:
+                    path = os.path.join(outpath, name)
+                    if os.path.isfile(path):
+                        with open(path, "r", errors="replace") as ifile:
+                            data = ifile.read()
+                        with open(path, "w") as ofile:
+                            ofile.write(
+                                data.replace(message["pdk_root"], self.pdk_root)
+                            )
+
+            start_time = time.monotonic()
+            returncode = self.run_ngspice(sock, outpath, message["simfile"])
+            runtime = time.monotonic() - start_time
+
+            # Connection closed, the job was canceled
+            if returncode == None:
+                info(f"Canceled {message['simfile']}.")
+                return
+
+            info(f"Finished {message['simfile']} in {runtime:.1f}s ({returncode}).")
+
+            # Return the new files
+            results = {}
+            for entry in sorted(os.listdir(outpath)):
+                path = os.path.join(outpath, entry)
+                if entry in received or not os.path.isfile(path):
+                    continue
+                # Like local runs, only keep non-empty output logs
+                if entry.endswith(".out") and not os.path.getsize(path):
+                    continue
+                results[entry] = path
+
+            send_message(
+                sock,
+                {"type": "result", "returncode": returncode, "runtime": runtime},
+                pack_tar(results),
+            )
+
+    def run_ngspice(self, sock, outpath, simfile):
+        """Run ngspice, returns None if the connection was closed"""
+
+        with open(os.path.join(outpath, "ngspice_stdout.out"), "w") as stdout, open(
+            os.path.join(outpath, "ngspice_stderr.out"), "w"
+        ) as stderr:
+            process = subprocess.Popen(
+                ["ngspice", "--batch", simfile],
+                cwd=outpath,
+                stdout=stdout,
+                stderr=stderr,
+                stdin=subprocess.DEVNULL,
+            )
+
+            while process.poll() == None:
+                # Kill the simulation if CACE hangs up
+                readable, _, _ = select.select([sock], [], [], 0.2)
+                if readable and not sock.recv(1, socket.MSG_PEEK):
+                    process.kill()
+                    process.wait()
+                    return None
+
+        return process.returncode
+
+
+class RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            self.server.worker.handle(self.request)
+        except (OSError, ConnectionError, ValueError, tarfile.TarError) as e:
+            err(f"Failed to handle request: {e}")
+
+
+class ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ThreadingTCP6Server(ThreadingTCPServer):
+    address_family = socket.AF_INET6
+
+
+class ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def worker():
+    """
+    Run simulation jobs for CACE on this machine.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="cace-worker",
+        description="""Runs the simulations that CACE sends to it,
+        so that a characterization can be distributed over multiple machines.""",
+        epilog="Online documentation at: https://cace.readthedocs.io/",
+    )
+
+    # version number
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+
+    parser.add_argument(
+        "address",
+        help="""address to listen on, either tcp://host:port or unix://path""",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="""maximum number of simulations running in parallel""",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=str,
+        help="""directory for the simulations, by default a temporary directory""",
+    )
+    parser.add_argument(
+        "--token",
+        type=str,
+        default=os.environ.get(TOKEN_ENV),
+        help=f"""only accept requests from clients with this shared secret,
+        by default read from ${TOKEN_ENV}""",
+    )
+    parser.add_argument(
+        "-l",
+        "--log-level",
+        type=str,
+        choices=["ALL", "DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="""set the log level for a more fine-grained output""",
+    )
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    # Set the log level
+    if args.log_level:
+        set_log_level(args.log_level)
+
+    work_dir = args.work_dir
+    if not work_dir:
+        work_dir = tempfile.mkdtemp(prefix="cace-worker-")
+    os.makedirs(work_dir, exist_ok=True)
+
+    worker = Worker(args.jobs, work_dir, os.environ.get("PDK_ROOT"), args.token)
+
+    family, address = parse_address(args.address)
+
+    # Netlists can run arbitrary commands via shell
+    if family != socket.AF_UNIX and not args.token:
+        if address[0] in ["localhost", "127.0.0.1", "::1"]:
+            info("Accepting requests from this machine only.")
+        else:
+            warn(
+                "Accepting requests from any client without a token, only use this on a trusted network."
+            )
+
+    if family == socket.AF_UNIX:
+        if os.path.exists(address):
+            os.remove(address)
+        server = ThreadingUnixServer(address, RequestHandler)
+    elif family == socket.AF_INET6:
+        server = ThreadingTCP6Server(address, RequestHandler)
+    else:
+        server = ThreadingTCPServer(address, RequestHandler)
+
+    server.worker = worker
+
+    info(f"Listening on {args.address} with {args.jobs} jobs in '{work_dir}'.")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    worker()
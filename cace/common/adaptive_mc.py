@@ -0,0 +1,188 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import threading
+import numpy
+from statistics import NormalDist
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+
+def mean_interval(values, z):
+    """Confidence interval of the mean"""
+
+    mean = numpy.mean(values)
+    half = z * numpy.std(values, ddof=1) / math.sqrt(len(values))
+    return (mean - half, mean + half)
+
+
+def median_interval(values, z):
+    """Distribution-free confidence interval of the median"""
+
+    values = numpy.sort(values)
+    n = len(values)
+    k = z * math.sqrt(n) / 2
+
+    lower = max(math.floor(n / 2 - k), 0)
+    upper = min(math.ceil(n / 2 + k), n - 1)
+    return (values[lower], values[upper])
+
+
+class AdaptiveMonteCarlo:
+    """
+    Decides when the Monte Carlo iterations of a condition set are
+    sufficient. After each batch of iterations, a result is settled if
+    the outcome of each of its limits can not change anymore with the
+    given confidence, or if its mean is known to the given relative
+    precision. A condition set is settled once all results are settled.
+    """
+
+    def __init__(self, limits, iterations, batch, confidence=0.95, precision=None):
+        # The limits of each result as {variable: [(entry, calculation, limit, value)]}
+        self.limits = limits
+
+        # Planned iterations of each condition set
+        self.iterations = iterations
+
+        self.batch = max(batch, 2)
+        self.confidence = confidence
+        self.precision = precision
+
+        # Two-sided quantile of the standard normal distribution
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+        # Values and number of iterations by condition set
+        self._values = {}
+        self._counts = {}
+
+        # Reason by settled condition set
+        self.settled = {}
+
+        self._lock = threading.Lock()
+
+    def add(self, key, values):
+        """
+        Add the results of an iteration of a condition set.
+        Returns the reason once the condition set is settled.
+        """
+
+        with self._lock:
+            if key in self.settled:
+                return None
+
+            collected = self._values.setdefault(key, {})
+            for variable in self.limits:
+                if variable in values:
+                    collected.setdefault(variable, []).append(values[variable])
+
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+
+            # Check after each batch only
+            if count % self.batch != 0 or count >= self.iterations:
+                return None
+
+            reason = self.check(collected, count)
+            if reason:
+                self.settled[key] = reason
+
+            return reason
+
+    def check(self, collected, count):
+        """Return the reason if all results are settled, else None"""
+
+        reasons = []
+
+        for variable, limits in self.limits.items():
+            if not variable in collected:
+                return None
+
+            values = numpy.concatenate(collected[variable]).astype(numpy.float64)
+            if len(values) < 2:
+                return None
+
+            # Values that the remaining iterations are expected to add
+            remaining = (self.iterations - count) * len(values) / count
+
+            if limits and all(
+                self.is_decided(values, calculation, value, remaining)
+                for entry, calculation, limit, value in limits
+            ):
+                reasons.append(f"{variable} decided")
+                continue
+
+            if self.precision != None:
+                lower, upper = mean_interval(values, self.z)
+                if (upper - lower) / 2 <= self.precision * abs(numpy.mean(values)):
+                    reasons.append(f"{variable} within {self.precision:.1%}")
+                    continue
+
+            return None
+
+        if not reasons:
+            return None
+
+        return ", ".join(reasons) + f" with {self.confidence:.0%} confidence"
+
+    def is_decided(self, values, calculation, value, remaining):
+        """Whether the remaining values can not change the outcome of a limit"""
+
+        if calculation in ["minimum", "maximum"]:
+            mean = numpy.mean(values)
+            sigma = numpy.std(values, ddof=1)
+
+            # A violated extreme can not recover
+            if calculation == "minimum":
+                if numpy.min(values) < value:
+                    return True
+                # Conservatively move the distribution towards the limit
+                mean -= self.z * sigma / math.sqrt(len(values))
+            else:
+                if numpy.max(values) > value:
+                    return True
+                mean += self.z * sigma / math.sqrt(len(values))
+
+            if remaining <= 0:
+                return True
+
+            # Probability of a single value beyond the limit
+            if sigma > 0:
+                below = NormalDist(mean, sigma).cdf(value)
+            else:
+                below = 1.0 if mean < value else 0.0
+
+            beyond = below if calculation == "minimum" else 1 - below
+
+            # None of the remaining values crosses the limit
+            return (1 - beyond) ** remaining >= self.confidence
+
+        if calculation == "average":
+            lower, upper = mean_interval(values, self.z)
+        elif calculation == "median":
+            lower, upper = median_interval(values, self.z)
+        else:
+            return False
+
+        # The estimate is on the same side of the limit
+        return value < lower or value > upper
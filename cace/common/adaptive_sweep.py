@@ -0,0 +1,225 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import numpy
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+
+class AdaptiveSweep:
+    """
+    Refines the grid of condition sets in rounds instead of simulating
+    all combinations. The first round simulates the extremes and the
+    typical value of each swept condition. Each further round adds the
+    midpoints of the intervals where a result is close to one of its
+    limits or deviates from a linear change, until no interval needs
+    refinement or the grid is exhausted.
+
+    Condition sets are numbered like generate_condition_sets(), the
+    first condition changes fastest.
+    """
+
+    def __init__(self, shape, axes, typical, limits, tolerance=0.1):
+        # Number of values of each condition
+        self.shape = shape
+
+        # Swept conditions as {dimension: [(value index, value)]} in ascending order
+        self.axes = axes
+
+        # Value index of the typical value by dimension
+        self.typical = typical
+
+        # Limit values of each result as {variable: [value]}
+        self.limits = limits
+
+        self.tolerance = tolerance
+
+        self.strides = []
+        stride = 1
+        for size in shape:
+            self.strides.append(stride)
+            stride *= size
+
+        self.num_sets = stride
+
+        # Condition sets that were selected
+        self.simulated = set()
+
+        # Range of each result as {index: {variable: (minimum, maximum)}}
+        self.results = {}
+
+    def index(self, coords):
+        return sum(coord * stride for coord, stride in zip(coords, self.strides))
+
+    def coords(self, index):
+        return [
+            (index // stride) % size for stride, size in zip(self.strides, self.shape)
+        ]
+
+    def initial_sets(self):
+        """The coarse grid of the first round"""
+
+        choices = []
+        for dimension, size in enumerate(self.shape):
+            if not dimension in self.axes:
+                choices.append(range(size))
+                continue
+
+            axis = [value_index for value_index, value in self.axes[dimension]]
+
+            # The extremes and the typical value
+            coarse = {axis[0], axis[-1]}
+            if self.typical.get(dimension) in axis:
+                coarse.add(self.typical[dimension])
+
+            # Else the middle of the axis
+            if len(coarse) < 3:
+                coarse.add(axis[len(axis) // 2])
+
+            choices.append(sorted(coarse))
+
+        return self.select(self.index(coords) for coords in itertools.product(*choices))
+
+    def select(self, indices):
+        selected = sorted(set(indices) - self.simulated)
+        self.simulated.update(selected)
+        return selected
+
+    def add(self, index, values):
+        """Add the results of a condition set"""
+
+        ranges = self.results.setdefault(index, {})
+
+        for variable in self.limits:
+            if not variable in values or len(values[variable]) == 0:
+                continue
+
+            data = numpy.asarray(values[variable], dtype=numpy.float64)
+            low, high = float(numpy.min(data)), float(numpy.max(data))
+
+            if variable in ranges:
+                low = min(low, ranges[variable][0])
+                high = max(high, ranges[variable][1])
+
+            ranges[variable] = (low, high)
+
+    def refine(self):
+        """Return the condition sets of the next round"""
+
+        # Range of each result over all simulated condition sets
+        spans = {}
+        for ranges in self.results.values():
+            for variable, (low, high) in ranges.items():
+                if variable in spans:
+                    low = min(low, spans[variable][0])
+                    high = max(high, spans[variable][1])
+                spans[variable] = (low, high)
+
+        refined = set()
+
+        for dimension, axis in self.axes.items():
+            for line in self.lines(dimension):
+                refined.update(self.refine_line(dimension, axis, line, spans))
+
+        return self.select(refined)
+
+    def lines(self, dimension):
+        """Simulated condition sets grouped by all other coordinates"""
+
+        lines = {}
+        for index in self.results:
+            coords = self.coords(index)
+            coords[dimension] = None
+            lines.setdefault(tuple(coords), []).append(index)
+        return lines.values()
+
+    def refine_line(self, dimension, axis, line, spans):
+        """Midpoints of the intervals along one condition that need refinement"""
+
+        positions = {
+            value_index: position for position, (value_index, _) in enumerate(axis)
+        }
+
+        # Simulated points of the line in ascending order of the condition
+        points = sorted(
+            (positions[self.coords(index)[dimension]], index)
+            for index in line
+            if self.coords(index)[dimension] in positions
+        )
+
+        refine = [False] * max(len(points) - 1, 0)
+
+        for variable, (low, high) in spans.items():
+            margin = self.tolerance * (high - low)
+
+            for bound in [0, 1]:
+                series = []
+                for position, index in points:
+                    ranges = self.results[index]
+                    series.append(
+                        ranges[variable][bound] if variable in ranges else None
+                    )
+
+                for number in range(len(points) - 1):
+                    first, second = series[number], series[number + 1]
+                    if first == None or second == None:
+                        continue
+
+                    # A limit is within or close to the interval
+                    for limit in self.limits[variable]:
+                        if (
+                            min(first, second) - margin
+                            <= limit
+                            <= max(first, second) + margin
+                        ):
+                            refine[number] = True
+
+                # Deviation from a linear change at the inner points
+                for number in range(1, len(points) - 1):
+                    previous, current, following = series[number - 1 : number + 2]
+                    if previous == None or current == None or following == None:
+                        continue
+
+                    x0 = axis[points[number - 1][0]][1]
+                    x1 = axis[points[number][0]][1]
+                    x2 = axis[points[number + 1][0]][1]
+
+                    linear = previous + (following - previous) * (x1 - x0) / (x2 - x0)
+
+                    if abs(current - linear) > margin:
+                        refine[number - 1] = True
+                        refine[number] = True
+
+        midpoints = []
+        for number, needed in enumerate(refine):
+            first = points[number][0]
+            second = points[number + 1][0]
+
+            # There are values between the points
+            if needed and second - first > 1:
+                coords = self.coords(points[number][1])
+                coords[dimension] = axis[(first + second) // 2][0]
+                midpoints.append(self.index(coords))
+
+        return midpoints
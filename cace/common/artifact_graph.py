@@ -0,0 +1,172 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from .cace_regenerate import (
+    regenerate_schematic_netlist,
+    regenerate_netlist,
+    regenerate_gds,
+)
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# The schematic netlist provides the port order of the extracted netlists
+ARTIFACT_DEPENDENCIES = {
+    "schematic": [],
+    "layout": ["schematic"],
+    "pex": ["schematic"],
+    "rcx": ["schematic"],
+    "gds": [],
+}
+
+ARTIFACTS = list(ARTIFACT_DEPENDENCIES.keys())
+
+
+class ArtifactGraph:
+    """
+    Produces the inputs of the parameters, i.e. the netlists and the
+    GDSII layout. Each artifact is a task that is started on request
+    once its dependencies have completed, so that a parameter can
+    start as soon as its own inputs are ready.
+    """
+
+    def __init__(self, datasheet, runtime_options, notify=None):
+        self.datasheet = datasheet
+        self.runtime_options = runtime_options
+
+        # Called whenever an artifact has completed
+        self.notify = notify
+
+        self.futures = {}
+        self._lock = threading.Lock()
+
+        # Extractions share the "cace_extfiles" directory of magic
+        self._extract_lock = threading.Lock()
+
+        # One thread per artifact, so dependencies can never starve
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(ARTIFACTS), thread_name_prefix="cace-artifact"
+        )
+
+    def request(self, artifacts):
+        """Start producing the artifacts and their dependencies"""
+
+        started = []
+
+        with self._lock:
+            for artifact in artifacts:
+                self._request(artifact, started)
+
+        # Not holding the lock, the callback may run right away
+        if self.notify:
+            for future in started:
+                future.add_done_callback(lambda future: self.notify())
+
+    def _request(self, artifact, started):
+        if artifact in self.futures:
+            return self.futures[artifact]
+
+        if not artifact in ARTIFACT_DEPENDENCIES:
+            raise ValueError(f"Unknown artifact: {artifact}")
+
+        dependencies = [
+            self._request(dependency, started)
+            for dependency in ARTIFACT_DEPENDENCIES[artifact]
+        ]
+
+        dbg(f"Requesting artifact {artifact}.")
+
+        future = self._executor.submit(self._produce, artifact, dependencies)
+        self.futures[artifact] = future
+        started.append(future)
+
+        return future
+
+    def _produce(self, artifact, dependencies):
+        # Extraction does not fail if the schematic netlist is missing
+        for dependency in dependencies:
+            dependency.exception()
+
+        try:
+            if artifact == "schematic":
+                return bool(
+                    regenerate_schematic_netlist(self.datasheet, self.runtime_options)
+                )
+
+            if artifact == "gds":
+                return regenerate_gds(self.datasheet, self.runtime_options) == 0
+
+            with self._extract_lock:
+                return bool(
+                    regenerate_netlist(self.datasheet, artifact, self.runtime_options)
+                )
+
+        except Exception:
+            traceback.print_exc()
+            return False
+
+    def done(self, artifacts):
+        """Whether all artifacts have completed, successfully or not"""
+
+        with self._lock:
+            return all(
+                artifact in self.futures and self.futures[artifact].done()
+                for artifact in artifacts
+            )
+
+    def failed(self, artifacts):
+        """Return the completed artifacts that could not be produced"""
+
+        with self._lock:
+            return [
+                artifact
+                for artifact in artifacts
+                if artifact in self.futures
+                and self.futures[artifact].done()
+                and not self.futures[artifact].result()
+            ]
+
+    def idle(self):
+        """Whether no artifact is being produced"""
+
+        with self._lock:
+            return all(future.done() for future in self.futures.values())
+
+    def wait(self, artifacts):
+        """Produce the artifacts and wait for them, returns the failed ones"""
+
+        self.request(artifacts)
+
+        with self._lock:
+            futures = [self.futures[artifact] for artifact in artifacts]
+
+        for future in futures:
+            future.exception()
+
+        return self.failed(artifacts)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
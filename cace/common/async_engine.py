@@ -0,0 +1,196 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import asyncio
+import threading
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+
+class AsyncProcessHandle:
+    """
+    Handle to a subprocess running in the AsyncEngine,
+    provides kill() like a Popen object.
+    """
+
+    def __init__(self, future):
+        self.future = future
+
+    def kill(self):
+        # Cancelling the task kills the process
+        self.future.cancel()
+
+
+class AsyncEngine:
+    """
+    Drives all subprocesses from a single asyncio event loop,
+    which runs in its own thread. Coroutines are submitted from
+    other threads and return a concurrent.futures.Future.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        with self._lock:
+            # Start the event loop on first use
+            if not self._loop:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="cace-async-engine",
+                    daemon=True,
+                )
+                self._thread.start()
+
+                dbg("Started asyncio engine.")
+
+            return self._loop
+
+    def submit(self, coro):
+        """Schedule a coroutine on the event loop"""
+
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def shutdown(self):
+        """Stop the event loop"""
+
+        with self._lock:
+            if self._loop:
+                # Cancel the remaining tasks, this kills their processes
+                asyncio.run_coroutine_threadsafe(
+                    self._cancel_tasks(), self._loop
+                ).result()
+
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+
+    async def _cancel_tasks(self):
+        tasks = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_subprocess(
+        self,
+        proc,
+        args=[],
+        env=None,
+        input=None,
+        cwd=None,
+        write_file=True,
+        started_cb=None,
+    ):
+        """
+        Run a subprocess and stream its output into the log and into
+        files in cwd. If the task is cancelled, the process is killed.
+        started_cb is called with the pid of the process.
+        """
+
+        if not cwd:
+            cwd = os.getcwd()
+
+        dbg(
+            f'Subprocess {proc} {" ".join(args)} at \'[repr.filename][link=file://{os.path.abspath(cwd)}]{os.path.relpath(cwd)}[/link][/repr.filename]\'…'
+        )
+
+        process = await asyncio.create_subprocess_exec(
+            proc,
+            *args,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.PIPE if input else asyncio.subprocess.DEVNULL,
+            env=env,
+        )
+
+        if started_cb:
+            started_cb(process.pid)
+
+        stderr_lines = []
+
+        async def stream(reader, name, lines=None):
+            """Forward the output line by line"""
+
+            outfile = None
+            try:
+                while line := await reader.readline():
+                    line = line.decode(errors="replace")
+
+                    dbg(line.rstrip())
+
+                    if lines != None:
+                        lines.append(line)
+
+                    if write_file:
+                        if not outfile:
+                            outfile = open(f"{os.path.join(cwd, proc)}_{name}.out", "w")
+                        outfile.write(line)
+            finally:
+                if outfile:
+                    outfile.close()
+
+        async def feed():
+            """Write the input and close stdin"""
+
+            if input != None:
+                dbg(f"input: {input}")
+                process.stdin.write(input.encode())
+                await process.stdin.drain()
+                process.stdin.close()
+
+        try:
+            await asyncio.gather(
+                feed(),
+                stream(process.stdout, "stdout"),
+                stream(process.stderr, "stderr", stderr_lines),
+            )
+            returncode = await process.wait()
+
+        except asyncio.CancelledError:
+            if process.returncode == None:
+                process.kill()
+                await process.wait()
+            raise
+
+        if returncode != 0:
+            err(f"Subprocess exited with error code {returncode}")
+
+            # Print stderr
+            if stderr_lines:
+                err("Error output generated by subprocess:")
+                for line in stderr_lines:
+                    err(line.rstrip("\n"))
+
+        return returncode
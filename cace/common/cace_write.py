@@ -398,6 +398,100 @@ def markdown_summary(datasheet, runtime_options, results, result_types):
     return result
 
 
+def format_duration(seconds):
+    """Format seconds as H:MM:SS, or "?" if unknown"""
+
+    if seconds == None:
+        return "?"
+
+    return str(datetime.timedelta(seconds=round(seconds)))
+
+
+def markdown_plan(datasheet, plan):
+    """
+    Returns a summary of a simulation plan formatted in Markdown,
+    the parameters with the largest CPU time first
+    """
+
+    result = ""
+
+    # Table spacings
+    sp = [20, 20, 10, 12, 12, 8]
+
+    result += f'\n# CACE Plan for {datasheet["name"]}\n\n'
+
+    result += f'**netlist source**: {plan["netlist_source"]}\n\n'
+
+    result += "".join(
+        [
+            f'| {"Parameter": ^{sp[0]}} ',
+            f'| {"Tool": ^{sp[1]}} ',
+            f'| {"Runs": ^{sp[2]}} ',
+            f'| {"CPU Time": ^{sp[3]}} ',
+            f'| {"Wall Time": ^{sp[4]}} ',
+            f'| {"Share": ^{sp[5]}} |\n',
+        ]
+    )
+    result += "".join(
+        [
+            f'| :{"-"*(sp[0]-1)} ',
+            f'| :{"-"*(sp[1]-1)} ',
+            f'| {"-"*(sp[2]-1)}: ',
+            f'| {"-"*(sp[3]-1)}: ',
+            f'| {"-"*(sp[4]-1)}: ',
+            f'| {"-"*(sp[5]-1)}: |\n',
+        ]
+    )
+
+    # Parameters without a runtime history last
+    parameters = sorted(
+        plan["parameters"].items(),
+        key=lambda item: (
+            item[1]["cpu_time"] == None,
+            -(item[1]["cpu_time"] or 0),
+            -item[1]["runs"],
+        ),
+    )
+
+    for pname, param_plan in parameters:
+        display = datasheet["parameters"][pname].get("display", pname)
+
+        runs_str = str(param_plan["runs"])
+        if param_plan.get("adaptive"):
+            runs_str = f"≤ {runs_str}"
+        if "error" in param_plan:
+            runs_str = "?"
+
+        share_str = "?"
+        if param_plan["cpu_time"] != None and plan["cpu_time"]:
+            share_str = f'{param_plan["cpu_time"] / plan["cpu_time"]:.0%}'
+
+        result += "".join(
+            [
+                f"| {display: <{sp[0]}} ",
+                f'| {param_plan["tool"]: <{sp[1]}} ',
+                f"| {runs_str: >{sp[2]}} ",
+                f'| {format_duration(param_plan["cpu_time"]): >{sp[3]}} ',
+                f'| {format_duration(param_plan["wall_time"]): >{sp[4]}} ',
+                f"| {share_str: >{sp[5]}} |\n",
+            ]
+        )
+
+    result += "\n"
+
+    result += f'**runs**: {plan["runs"]}, '
+    result += f'**CPU time**: {plan["cpu_time"] / 3600:.2f} CPU-hours, '
+    result += f'**wall time**: {format_duration(plan["wall_time"])} with {plan["jobs"]} jobs\n\n'
+
+    if plan["unknown"]:
+        result += f'No runtimes of previous runs for {", ".join(plan["unknown"])}, not included in the estimate.\n\n'
+
+    if any(param_plan.get("adaptive") for param_plan in plan["parameters"].values()):
+        result += "Adaptive parameters may simulate fewer runs than planned.\n"
+
+    return result
+
+
 def uchar_sub(string):
     """
     Convert from unicode to text format
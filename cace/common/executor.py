@@ -0,0 +1,441 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import re
+import json
+import socket
+import struct
+import hashlib
+import tarfile
+import threading
+from abc import abstractmethod, ABC
+
+from ..__version__ import __version__
+from .common import get_pdk_root
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# Directory for the included files in a job bundle
+INCLUDES_DIR = "includes"
+
+# Shared secret of the workers
+TOKEN_ENV = "CACE_WORKER_TOKEN"
+
+# Header: length of the JSON message, length of the payload
+HEADER = struct.Struct(">IQ")
+
+INCLUDE_REGEX = re.compile(
+    r'^(\s*\.(?:include|inc|lib)\s+)(["\']?)([^\s"\']+)\2(.*)$', re.IGNORECASE
+)
+
+
+def parse_address(url):
+    """Return the socket family and address for tcp://host:port or unix://path"""
+
+    if url.startswith("unix://"):
+        return (socket.AF_UNIX, url[len("unix://") :])
+
+    if url.startswith("tcp://"):
+        url = url[len("tcp://") :]
+
+    host, _, port = url.rpartition(":")
+
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid worker address: {url}")
+
+    # IPv6 addresses contain colons, e.g. tcp://[::1]:7777
+    host = host.strip("[]")
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+
+    return (family, (host, int(port)))
+
+
+def connect(url):
+    """Open a connection to a worker"""
+
+    family, address = parse_address(url)
+
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+
+    return sock
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def send_message(sock, message, payload=b""):
+    """Send a JSON message, followed by an optional binary payload"""
+
+    data = json.dumps(message).encode()
+    sock.sendall(HEADER.pack(len(data), len(payload)) + data)
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_message(sock):
+    """Receive a JSON message and its payload"""
+
+    length, payload_length = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    message = json.loads(_recv_exactly(sock, length))
+    payload = _recv_exactly(sock, payload_length) if payload_length else b""
+    return (message, payload)
+
+
+def file_hash(path):
+    """Return the SHA-256 of a file"""
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as ifile:
+        while chunk := ifile.read(1 << 20):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def pack_tar(files):
+    """Pack a dict of {arcname: path or bytes} into a tar.gz"""
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for arcname, source in files.items():
+            if isinstance(source, bytes):
+                info = tarfile.TarInfo(arcname)
+                info.size = len(source)
+                tar.addfile(info, io.BytesIO(source))
+            else:
+                tar.add(source, arcname=arcname, recursive=False)
+    return buffer.getvalue()
+
+
+def unpack_tar(payload, path):
+    """Extract a tar.gz, refusing members outside of path"""
+
+    with tarfile.open(fileobj=io.BytesIO(payload), mode="r:gz") as tar:
+        # Only regular files and directories below path
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(path, filter="data")
+        else:
+            root = os.path.realpath(path)
+            for member in tar.getmembers():
+                target = os.path.realpath(os.path.join(path, member.name))
+                if not (member.isfile() or member.isdir()) or not (
+                    target == root or target.startswith(root + os.sep)
+                ):
+                    raise ValueError(f"Invalid member in bundle: {member.name}")
+            tar.extractall(path)
+
+
+class JobBundle:
+    """
+    The simulation directory of a job together with all files it
+    includes from outside of the PDK. Paths to included files are
+    rewritten relative to the bundle, so it can run on another node.
+    """
+
+    def __init__(self, outpath, simfile, pdk_root):
+        self.outpath = os.path.abspath(outpath)
+        self.simfile = simfile
+        self.pdk_root = os.path.abspath(pdk_root) if pdk_root else None
+
+        # Rewritten netlists {arcname: bytes}
+        self.files = {}
+
+        # Included files {arcname: path}
+        self.includes = {}
+
+        self._arcnames = {}
+
+        simpath = os.path.join(self.outpath, simfile)
+        self.files[simfile] = self._rewrite(simpath, "").encode()
+
+        # Everything else in the simulation directory
+        for entry in sorted(os.listdir(self.outpath)):
+            path = os.path.join(self.outpath, entry)
+            if entry != simfile and os.path.isfile(path):
+                self.files[entry] = path
+
+    def _include(self, path):
+        """Add an included file to the bundle, returns its arcname"""
+
+        if path in self._arcnames:
+            return self._arcnames[path]
+
+        arcname = os.path.join(
+            INCLUDES_DIR, f"{len(self._arcnames)}_{os.path.basename(path)}"
+        )
+        self._arcnames[path] = arcname
+
+        # Includes may include further files
+        self.includes[arcname] = self._rewrite(path, INCLUDES_DIR).encode()
+
+        return arcname
+
+    def _rewrite(self, path, directory):
+        """Rewrite the paths in a netlist located at directory in the bundle"""
+
+        with open(path, "r", errors="replace") as ifile:
+            lines = ifile.read().split("\n")
+
+        for index, line in enumerate(lines):
+            # Results are written to the simulation directory
+            line = line.replace(self.outpath + os.sep, "").replace(self.outpath, ".")
+
+            match = INCLUDE_REGEX.match(line)
+            if match:
+                prefix, quote, include, suffix = match.groups()
+
+                resolved = os.path.join(os.path.dirname(path), include)
+                if not os.path.isabs(include) and not os.path.isfile(resolved):
+                    resolved = os.path.join(self.outpath, include)
+                resolved = os.path.abspath(resolved)
+
+                # PDK files are expected to be installed on the worker
+                in_pdk = self.pdk_root and resolved.startswith(self.pdk_root + os.sep)
+
+                if os.path.isfile(resolved) and not in_pdk:
+                    arcname = self._include(resolved)
+                    include = os.path.relpath(arcname, directory or ".")
+                    line = f"{prefix}{quote}{include}{quote}{suffix}"
+
+            lines[index] = line
+
+        return "\n".join(lines)
+
+    def hashes(self):
+        """Return the SHA-256 of each included file"""
+
+        return {
+            arcname: hashlib.sha256(data).hexdigest()
+            for arcname, data in self.includes.items()
+        }
+
+    def pack(self, missing=None):
+        """Pack the bundle, only the missing includes are added"""
+
+        files = dict(self.files)
+        for arcname, data in self.includes.items():
+            if missing == None or arcname in missing:
+                files[arcname] = data
+        return pack_tar(files)
+
+
+class Executor(ABC):
+    """Base class of the backends that execute simulation jobs"""
+
+    name = "executor"
+    local = True
+
+    def __init__(self, jobs=1):
+        # Number of jobs that can run at once
+        self.jobs = jobs
+
+    @abstractmethod
+    def run(self, job):
+        """Run the job, returns the return code of the simulator"""
+
+        pass
+
+    def shutdown(self):
+        """Free the resources of the executor"""
+
+        pass
+
+
+class LocalExecutor(Executor):
+    """Run ngspice on this machine"""
+
+    name = "local"
+
+    def run(self, job):
+        return job.run_subprocess(
+            "ngspice",
+            ["--batch", job.simfile],
+            cwd=job.outpath,
+        )
+
+
+class RemoteProcessHandle:
+    """Provides kill() for a job running on a worker"""
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def kill(self):
+        # The worker kills the simulation when the connection is closed
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class RemoteExecutor(Executor):
+    """Send the job to a cace-worker and fetch the results"""
+
+    local = False
+
+    def __init__(self, url):
+        self.url = url
+        self.name = url
+
+        self.token = os.environ.get(TOKEN_ENV)
+
+        # Ask the worker for its number of jobs
+        with connect(url) as sock:
+            send_message(
+                sock, {"type": "hello", "version": __version__, "token": self.token}
+            )
+            message, _ = recv_message(sock)
+
+        if message["type"] == "error":
+            raise ConnectionError(message["message"])
+
+        if message.get("version") != __version__:
+            warn(
+                f'Worker {url} runs CACE {message.get("version")}, expected {__version__}.'
+            )
+
+        super().__init__(message["jobs"])
+
+    def run(self, job):
+        bundle = JobBundle(job.outpath, job.simfile, get_pdk_root())
+
+        try:
+            with connect(self.url) as sock:
+                job.subproc_handle = RemoteProcessHandle(sock)
+
+                dbg(f"Sending {job.outpath} to worker {self.url}…")
+
+                send_message(
+                    sock,
+                    {
+                        "type": "run",
+                        "simfile": job.simfile,
+                        "pdk_root": get_pdk_root(),
+                        "includes": bundle.hashes(),
+                        "token": self.token,
+                    },
+                )
+
+                # The worker caches included files
+                message, _ = recv_message(sock)
+
+                if message["type"] == "error":
+                    err(f'Worker {self.url}: {message["message"]}')
+                    return -1
+
+                send_message(sock, {"type": "bundle"}, bundle.pack(message["missing"]))
+
+                message, payload = recv_message(sock)
+
+                if message["type"] == "error":
+                    err(f'Worker {self.url}: {message["message"]}')
+                    return -1
+
+                unpack_tar(payload, job.outpath)
+
+        except (OSError, ConnectionError, ValueError) as e:
+            if job.canceled:
+                return -1
+
+            err(f"Worker {self.url} failed to run {job.outpath}: {e}")
+            return -1
+
+        finally:
+            job.subproc_handle = None
+
+        returncode = message["returncode"]
+
+        if returncode != 0:
+            err(f"Subprocess exited with error code {returncode}")
+
+        return returncode
+
+
+class ExecutorPool:
+    """Hands out the slots of all executors to the jobs"""
+
+    def __init__(self):
+        self.executors = []
+        self._running = {}
+        self._cond = threading.Condition()
+
+    def add(self, executor):
+        with self._cond:
+            self.executors.append(executor)
+            self._running[executor] = 0
+            self._cond.notify_all()
+
+    def remove(self, executor):
+        with self._cond:
+            self.executors.remove(executor)
+
+    @property
+    def jobs(self):
+        """Total number of jobs of all executors"""
+
+        return sum(executor.jobs for executor in self.executors)
+
+    def has_remote(self):
+        return any(not executor.local for executor in self.executors)
+
+    def acquire(self, canceled=None):
+        """
+        Wait for a free slot, returns the executor with the most free slots.
+        Returns None if canceled() became True while waiting.
+        """
+
+        with self._cond:
+            while True:
+                free = [
+                    (executor.jobs - self._running[executor], executor.local, executor)
+                    for executor in self.executors
+                    if self._running[executor] < executor.jobs
+                ]
+
+                if free:
+                    executor = max(free, key=lambda entry: entry[:2])[2]
+                    self._running[executor] += 1
+                    return executor
+
+                if canceled and canceled():
+                    return None
+
+                self._cond.wait(0.5)
+
+    def release(self, executor):
+        with self._cond:
+            self._running[executor] -= 1
+            self._cond.notify_all()
@@ -0,0 +1,271 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import asyncio
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# Priority lanes, lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BATCH: "batch",
+}
+
+
+def get_priority(name):
+    """Return the priority lane for the given name"""
+
+    for priority, priority_name in PRIORITY_NAMES.items():
+        if priority_name == name:
+            return priority
+
+    raise ValueError(f"Unknown priority: {name}")
+
+
+class Ticket:
+    """
+    A request for a number of permits,
+    granted by the FairSemaphore in FIFO order.
+    """
+
+    def __init__(self, count, priority, seq):
+        self.count = count
+        self.priority = priority
+        self.seq = seq
+
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.withdrawn = False
+
+        self._event = threading.Event()
+
+    def wait(self, timeout=None) -> bool:
+        """Wait until the ticket is granted, returns False if withdrawn"""
+
+        self._event.wait(timeout)
+        return self.granted
+
+    def _wake(self):
+        self._event.set()
+
+
+class AsyncTicket(Ticket):
+    """
+    A ticket that is awaited from an asyncio event loop
+    instead of blocking a thread.
+    """
+
+    def __init__(self, count, priority, seq, loop):
+        super().__init__(count, priority, seq)
+
+        self._loop = loop
+        self._future = loop.create_future()
+
+    async def wait_async(self) -> bool:
+        """Wait until the ticket is granted, returns False if withdrawn"""
+
+        await self._future
+        return self.granted
+
+    def _wake(self):
+        super()._wake()
+        self._loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self._future.done():
+            self._future.set_result(None)
+
+
+class FairSemaphore:
+    """
+    A semaphore that hands out permits in FIFO order per priority lane.
+
+    Requests are never overtaken by later requests, so a request for
+    many permits cannot starve behind a stream of single-permit requests.
+    Waiters in a lower priority lane are promoted by one lane for every
+    `aging` seconds they have been waiting.
+    """
+
+    def __init__(self, value: int = 1, aging: float = 30.0):
+        if value < 0:
+            raise ValueError("Initial value must be >= 0")
+
+        self._value = value
+        self._counter = value
+        self._aging = aging
+
+        self._lock = threading.Lock()
+        self._lanes = {priority: deque() for priority in PRIORITY_NAMES}
+        self._seq = itertools.count()
+
+        # Wait-time statistics per priority lane
+        self._stats = {
+            priority: {"jobs": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for priority in PRIORITY_NAMES
+        }
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, type, value, traceback):
+        self.release()
+
+    @contextmanager
+    def permits(self, count: int = 1, priority: int = PRIORITY_BATCH):
+        """Hold count permits for the duration of the context"""
+
+        ticket = self.acquire(count, priority)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket.count)
+
+    def request(self, count: int = 1, priority: int = PRIORITY_BATCH) -> Ticket:
+        """Enqueue a request for count permits without waiting for it"""
+
+        return self._enqueue(Ticket(self._clamp(count), priority, next(self._seq)))
+
+    def request_async(
+        self, count: int = 1, priority: int = PRIORITY_BATCH
+    ) -> AsyncTicket:
+        """Enqueue a request for count permits from within an event loop"""
+
+        return self._enqueue(
+            AsyncTicket(
+                self._clamp(count),
+                priority,
+                next(self._seq),
+                asyncio.get_running_loop(),
+            )
+        )
+
+    def acquire(self, count: int = 1, priority: int = PRIORITY_BATCH) -> Ticket:
+        """Acquire count permits atomically, or wait until they are available."""
+
+        ticket = self.request(count, priority)
+        ticket.wait()
+        return ticket
+
+    def withdraw(self, ticket: Ticket) -> bool:
+        """
+        Remove a waiting ticket from the queue.
+        Returns False if the permits were already granted.
+        """
+
+        with self._lock:
+            if ticket.granted or ticket.withdrawn:
+                return False
+
+            self._lanes[ticket.priority].remove(ticket)
+            ticket.withdrawn = True
+            ticket._wake()
+
+            # The next waiter may fit now
+            self._dispatch()
+
+        return True
+
+    def locked(self, count: int = 1) -> bool:
+        """Return True if acquire(count) would not return immediately."""
+
+        with self._lock:
+            waiting = any(self._lanes.values())
+            return waiting or self._counter < min(count, self._value)
+
+    def release(self, count: int = 1) -> None:
+        """Release count permits."""
+
+        with self._lock:
+            self._counter += count
+            self._dispatch()
+
+    def statistics(self):
+        """Return the wait-time statistics for each priority lane"""
+
+        with self._lock:
+            statistics = {}
+            for priority, stats in self._stats.items():
+                statistics[PRIORITY_NAMES[priority]] = {
+                    "jobs": stats["jobs"],
+                    "waiting": len(self._lanes[priority]),
+                    "mean_wait": (
+                        stats["total_wait"] / stats["jobs"] if stats["jobs"] else 0.0
+                    ),
+                    "max_wait": stats["max_wait"],
+                }
+            return statistics
+
+    def _clamp(self, count):
+        """Requests larger than the semaphore could never be granted"""
+
+        return max(min(count, self._value), 0)
+
+    def _enqueue(self, ticket):
+        """Add a ticket to its lane and try to grant it"""
+
+        with self._lock:
+            self._lanes[ticket.priority].append(ticket)
+            self._dispatch()
+
+        return ticket
+
+    def _head(self, now):
+        """Return the ticket that is served next"""
+
+        head = None
+        head_key = None
+
+        for priority, lane in self._lanes.items():
+            if not lane:
+                continue
+
+            ticket = lane[0]
+
+            # Promote long waiting tickets to a higher priority lane
+            promotion = int((now - ticket.enqueued) / self._aging) if self._aging else 0
+            key = (max(priority - promotion, 0), ticket.seq)
+
+            if head_key == None or key < head_key:
+                head = ticket
+                head_key = key
+
+        return head
+
+    def _dispatch(self):
+        """Grant permits to waiting tickets, must hold the lock"""
+
+        now = time.monotonic()
+
+        while ticket := self._head(now):
+            # Strictly in order, nobody may overtake the head
+            if ticket.count > self._counter:
+                break
+
+            self._lanes[ticket.priority].popleft()
+            self._counter -= ticket.count
+
+            waited = now - ticket.enqueued
+            stats = self._stats[ticket.priority]
+            stats["jobs"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+
+            ticket.granted = True
+            ticket._wake()
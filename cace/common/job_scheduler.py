@@ -0,0 +1,261 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, CancelledError
+
+from .async_engine import AsyncEngine, AsyncProcessHandle
+from .memory_governor import MemoryGovernor
+from .executor import ExecutorPool, LocalExecutor, RemoteExecutor
+from .ngspice_shared import SharedNgspiceExecutor, find_libngspice
+from .script_runner import ScriptRunner
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+
+class JobScheduler:
+    """
+    A single run-wide queue for the simulation jobs of all parameters.
+    The jobs are executed by a fixed number of workers, so that the
+    queue drains continuously across parameter boundaries.
+
+    With the "asyncio" engine, jobs are coroutines on a single event
+    loop instead and only hold a thread while they are being set up.
+
+    Jobs are executed locally or by remote cace-workers, the number
+    of workers includes the capacity of the remote workers.
+
+    Free workers take the queued job of the highest priority lane,
+    in the order of submission within a lane.
+    """
+
+    engines = ["thread", "asyncio"]
+
+    # How ngspice is run on this machine
+    ngspice_backends = ["subprocess", "shared"]
+
+    def __init__(self, max_workers: int = 1, engine: str = "thread"):
+        self.max_workers = max_workers
+        self.engine = engine
+
+        self.async_engine = AsyncEngine()
+        self.memory_governor = MemoryGovernor()
+
+        self.executors = ExecutorPool()
+        self.executors.add(LocalExecutor(max_workers))
+
+        # Postprocessing of user-defined scripts
+        self.script_runner = ScriptRunner(max_workers)
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+        # Queued jobs by (priority, seq, job, future)
+        self._queue = []
+        self._seq = itertools.count()
+
+    def set_engine(self, engine):
+        if not engine in self.engines:
+            err(f"Unknown engine: {engine}")
+            return
+
+        if engine == "asyncio" and self.executors.has_remote():
+            warn("Remote workers require the thread engine, ignoring asyncio.")
+            return
+
+        self.engine = engine
+
+    def set_ngspice_backend(self, backend):
+        """Run local simulations as subprocesses or via libngspice"""
+
+        if not backend in self.ngspice_backends:
+            err(f"Unknown ngspice backend: {backend}")
+            return
+
+        local = next(
+            executor for executor in self.executors.executors if executor.local
+        )
+
+        if backend == "shared":
+            if isinstance(local, SharedNgspiceExecutor):
+                return
+
+            if self.engine == "asyncio":
+                warn(
+                    "libngspice requires the thread engine, using ngspice subprocesses."
+                )
+                return
+
+            library = find_libngspice()
+
+            if not library:
+                warn("Could not find libngspice, using ngspice subprocesses.")
+                return
+
+            info(f"Running simulations with '{library}'.")
+            executor = SharedNgspiceExecutor(local.jobs, library)
+
+        else:
+            if not isinstance(local, SharedNgspiceExecutor):
+                return
+
+            executor = LocalExecutor(local.jobs)
+
+        self.executors.remove(local)
+        self.executors.add(executor)
+        local.shutdown()
+
+    def set_workers(self, urls):
+        """Connect to the remote workers that are not known yet"""
+
+        known = [executor.name for executor in self.executors.executors]
+
+        for url in urls:
+            if url in known:
+                continue
+
+            try:
+                executor = RemoteExecutor(url)
+            except (OSError, ConnectionError, ValueError, KeyError) as e:
+                err(f"Could not connect to worker {url}: {e}")
+                continue
+
+            self.executors.add(executor)
+            info(f"Connected to worker {url} with {executor.jobs} jobs.")
+
+        with self._lock:
+            if self._executor and self.executors.jobs > self.max_workers:
+                warn("Workers added after the first job are not used.")
+
+            if not self._executor:
+                self.max_workers = self.executors.jobs
+
+    def submit(self, job):
+        """Queue a job, returns a future for its return value"""
+
+        if self.engine == "asyncio":
+            job.future = self.async_engine.submit(job.run_async(self.async_engine))
+            return job.future
+
+        with self._lock:
+            # Create the workers on first use
+            if not self._executor:
+                dbg(f"Starting job scheduler with {self.max_workers} workers.")
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="cace-job",
+                )
+
+            job.future = Future()
+            heapq.heappush(
+                self._queue, (job.priority, next(self._seq), job, job.future)
+            )
+
+            # Each worker task runs the next job of the queue
+            self._executor.submit(self._run_next)
+
+            return job.future
+
+    def _run_next(self):
+        """Run the queued job of the highest priority"""
+
+        while True:
+            with self._lock:
+                if not self._queue:
+                    return
+                _, _, job, future = heapq.heappop(self._queue)
+
+            # Skip canceled jobs
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                future.set_result(job.run())
+            except BaseException as e:
+                # Also SystemExit of a canceled job
+                future.set_exception(e)
+            return
+
+    def run_subprocess(self, owner, proc, args=[], env=None, input=None, cwd=None):
+        """
+        Run a subprocess on the asyncio engine and wait for it.
+        owner.subproc_handle is set while the process is running.
+        """
+
+        # Wait for enough free memory
+        reservation = self.memory_governor.reserve(owner.pname, lambda: owner.canceled)
+        if not reservation:
+            return -1
+
+        future = self.async_engine.submit(
+            self.async_engine.run_subprocess(
+                proc,
+                args,
+                env=env,
+                input=input,
+                cwd=cwd,
+                started_cb=lambda pid: self.memory_governor.attach(reservation, pid),
+            )
+        )
+
+        owner.subproc_handle = AsyncProcessHandle(future)
+
+        try:
+            returncode = future.result()
+        except CancelledError:
+            err(f"Subprocess {proc} was killed")
+            returncode = -1
+        finally:
+            self.memory_governor.release(reservation)
+
+        owner.subproc_handle = None
+
+        return returncode
+
+    def shutdown(self, wait=True):
+        """Stop the workers, queued jobs are canceled"""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+            queued, self._queue = self._queue, []
+
+        # The workers need the lock to take the next job
+        for _, _, _, future in queued:
+            future.cancel()
+
+        if executor:
+            # cancel_futures requires Python 3.9
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=wait, cancel_futures=True)
+            else:
+                executor.shutdown(wait=wait)
+
+        for executor in self.executors.executors:
+            executor.shutdown()
+
+        self.script_runner.shutdown()
+
+        self.async_engine.shutdown()
@@ -0,0 +1,305 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import asyncio
+import threading
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+MEMORY_UNITS = {
+    "": 1,
+    "K": 1024,
+    "M": 1024**2,
+    "G": 1024**3,
+    "T": 1024**4,
+}
+
+# Footprint of processes that exit before they are sampled
+MIN_PROCESS_MEMORY = 16 * MEMORY_UNITS["M"]
+
+
+def get_total_memory():
+    """Return the total physical memory in bytes or None"""
+
+    try:
+        with open("/proc/meminfo", "r") as ifile:
+            for line in ifile:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return None
+
+
+def parse_memory_size(value):
+    """
+    Parse a memory size such as "512M", "16G" or "75%"
+    (of the physical memory) into bytes.
+    """
+
+    match = re.fullmatch(r"\s*([0-9.]+)\s*(%|[KMGT]?)i?B?\s*", str(value), re.I)
+
+    if not match:
+        raise ValueError(f"Invalid memory size: {value}")
+
+    number = float(match.group(1))
+    unit = match.group(2).upper()
+
+    if unit == "%":
+        total = get_total_memory()
+        if total == None:
+            raise ValueError("Can not determine the physical memory size.")
+        return int(total * number / 100)
+
+    return int(number * MEMORY_UNITS[unit])
+
+
+def format_memory_size(value):
+    """Format bytes in a human readable way"""
+
+    for unit in ["T", "G", "M", "K"]:
+        if value >= MEMORY_UNITS[unit]:
+            return f"{value / MEMORY_UNITS[unit]:.1f}{unit}iB"
+
+    return f"{value}B"
+
+
+def get_process_rss(pid):
+    """Return the resident memory of a process and its children in bytes"""
+
+    rss = 0
+
+    try:
+        with open(f"/proc/{pid}/status", "r") as ifile:
+            for line in ifile:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        # The process has already exited
+        return 0
+
+    # Tools may start further processes
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", "r") as ifile:
+            children = ifile.read().split()
+    except OSError:
+        children = []
+
+    for child in children:
+        rss += get_process_rss(int(child))
+
+    return rss
+
+
+class Reservation:
+    """The memory held by a running subprocess of a parameter"""
+
+    def __init__(self, pname, expected):
+        self.pname = pname
+        self.expected = expected
+
+        self.pids = []
+        self.rss = 0
+
+    def usage(self):
+        # Processes start small, assume they will grow to the expected size
+        return max(self.rss, self.expected)
+
+
+class MemoryGovernor:
+    """
+    Tracks the resident memory of running subprocesses via /proc.
+
+    If a budget is set, new subprocesses are held back until their
+    expected footprint fits into the budget. The footprint of each
+    parameter is learned from the peak resident memory of its
+    processes in this and in previous runs.
+    """
+
+    def __init__(self, budget=None, interval=0.5):
+        self.budget = budget
+        self.interval = interval
+
+        # Previous runs, provides get_parameter_memory()
+        self.history = None
+
+        # Peak memory of a single process per parameter
+        self.peaks = {}
+
+        # Parameters with at least one completed process
+        self.completed = set()
+
+        self._reservations = []
+        self._cond = threading.Condition()
+        self._sampler = None
+
+    def set_budget(self, budget):
+        self.budget = budget
+
+        if budget != None:
+            info(f"Memory budget for subprocesses is {format_memory_size(budget)}.")
+
+    def get_peak(self, pname):
+        """Return the peak memory observed in this run or None"""
+
+        with self._cond:
+            return self.peaks.get(pname)
+
+    def expected(self, pname):
+        """Expected memory footprint of a subprocess of the parameter"""
+
+        expected = self.peaks.get(pname, 0)
+
+        if self.history:
+            expected = max(expected, self.history.get_parameter_memory(pname) or 0)
+
+        return expected
+
+    def known(self, pname):
+        """Whether the footprint of the parameter has been learned"""
+
+        if pname in self.completed:
+            return True
+
+        return self.history and self.history.get_parameter_memory(pname) != None
+
+    def used(self):
+        """Memory currently used or expected to be used by subprocesses"""
+
+        with self._cond:
+            return sum(reservation.usage() for reservation in self._reservations)
+
+    def reserve(self, pname, canceled=None):
+        """
+        Wait until a subprocess of the parameter fits into the budget.
+        Returns None if canceled() became True while waiting.
+        """
+
+        with self._cond:
+            while not (reservation := self._try_reserve(pname)):
+                if canceled and canceled():
+                    return None
+
+                # Resident memory changes without notification
+                self._cond.wait(self.interval)
+
+        return reservation
+
+    async def reserve_async(self, pname):
+        """Wait until a subprocess of the parameter fits into the budget"""
+
+        while True:
+            with self._cond:
+                if reservation := self._try_reserve(pname):
+                    return reservation
+
+            await asyncio.sleep(self.interval)
+
+    def attach(self, reservation, pid):
+        """Start tracking the process of a reservation"""
+
+        with self._cond:
+            reservation.pids.append(pid)
+
+    def release(self, reservation):
+        """The subprocess has exited"""
+
+        if reservation == None:
+            return
+
+        with self._cond:
+            self._reservations.remove(reservation)
+
+            # The process was started, its footprint is known now
+            if reservation.pids:
+                self.completed.add(reservation.pname)
+
+                # Exited before the first sample, assume the smallest footprint seen
+                if not self.peaks.get(reservation.pname):
+                    self.peaks[reservation.pname] = min(
+                        [peak for peak in self.peaks.values() if peak]
+                        or [MIN_PROCESS_MEMORY]
+                    )
+
+            self._cond.notify_all()
+
+    def _try_reserve(self, pname):
+        """Reserve memory if possible, must hold the lock"""
+
+        expected = self.expected(pname)
+        used = sum(reservation.usage() for reservation in self._reservations)
+
+        # Always admit a single process, else it could never run
+        if self.budget != None and self._reservations:
+            if used + expected > self.budget:
+                return None
+
+            # Unknown footprint, run one process until it is learned
+            if not self.known(pname) and any(
+                reservation.pname == pname for reservation in self._reservations
+            ):
+                return None
+
+        reservation = Reservation(pname, expected)
+        self._reservations.append(reservation)
+
+        if not self._sampler or not self._sampler.is_alive():
+            self._sampler = threading.Thread(
+                target=self._sample, name="cace-memory", daemon=True
+            )
+            self._sampler.start()
+
+        return reservation
+
+    def _sample(self):
+        """Periodically read the resident memory of all processes"""
+
+        while True:
+            with self._cond:
+                if not self._reservations:
+                    self._sampler = None
+                    return
+                reservations = list(self._reservations)
+
+            # Read /proc without holding the lock
+            samples = [
+                sum(get_process_rss(pid) for pid in reservation.pids)
+                for reservation in reservations
+            ]
+
+            with self._cond:
+                for reservation, rss in zip(reservations, samples):
+                    reservation.rss = rss
+
+                    if rss > self.peaks.get(reservation.pname, 0):
+                        self.peaks[reservation.pname] = rss
+
+                # Waiters may fit now
+                self._cond.notify_all()
+
+            with self._cond:
+                self._cond.wait(self.interval)
@@ -0,0 +1,393 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import ctypes
+import signal
+import ctypes.util
+import threading
+import multiprocessing
+
+from .executor import LocalExecutor
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# Callbacks of the ngspice shared library API
+SendChar = ctypes.CFUNCTYPE(
+    ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_void_p
+)
+SendStat = ctypes.CFUNCTYPE(
+    ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_void_p
+)
+ControlledExit = ctypes.CFUNCTYPE(
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_bool,
+    ctypes.c_bool,
+    ctypes.c_int,
+    ctypes.c_void_p,
+)
+
+CONTROL_REGEX = re.compile(r"^\s*\.control\b", re.IGNORECASE | re.MULTILINE)
+
+
+def find_libngspice():
+    """Return the path to libngspice or None"""
+
+    # Same variable as used by PySpice
+    if path := os.environ.get("NGSPICE_LIBRARY_PATH"):
+        return path if os.path.isfile(path) else None
+
+    return ctypes.util.find_library("ngspice")
+
+
+class NgspiceShared:
+    """
+    Runs netlists with libngspice in the current process,
+    the output is written to the same files as in batch mode.
+    Like the ngspice executable, libngspice reads the .spiceinit
+    of the current directory once, when it is initialized.
+    """
+
+    def __init__(self, library):
+        self.lib = ctypes.CDLL(library)
+
+        self.lib.ngSpice_Init.argtypes = [
+            SendChar,
+            SendStat,
+            ControlledExit,
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+        ]
+        self.lib.ngSpice_Init.restype = ctypes.c_int
+        self.lib.ngSpice_Command.argtypes = [ctypes.c_char_p]
+        self.lib.ngSpice_Command.restype = ctypes.c_int
+
+        self.stdout = []
+        self.stderr = []
+
+        # Exit status if the netlist called quit
+        self.exit_status = None
+
+        # Keep references, else the callbacks are garbage collected
+        self._send_char = SendChar(self._on_char)
+        self._send_stat = SendStat(self._on_stat)
+        self._controlled_exit = ControlledExit(self._on_exit)
+
+        self.lib.ngSpice_Init(
+            self._send_char,
+            self._send_stat,
+            self._controlled_exit,
+            None,
+            None,
+            None,
+            None,
+        )
+
+    def _on_char(self, text, ident, userdata):
+        text = text.decode(errors="replace")
+
+        # Output is prefixed with the stream
+        stream, _, line = text.partition(" ")
+        if stream == "stderr":
+            self.stderr.append(line)
+        else:
+            self.stdout.append(line)
+
+        return 0
+
+    def _on_stat(self, text, ident, userdata):
+        return 0
+
+    def _on_exit(self, status, immediate, quit, ident, userdata):
+        self.exit_status = status
+        return 0
+
+    def command(self, command):
+        """Send a command, returns True on error"""
+
+        return self.lib.ngSpice_Command(command.encode()) != 0
+
+    def run(self, simfile, cwd):
+        """Simulate a netlist like ngspice --batch, returns the exit status"""
+
+        os.chdir(cwd)
+
+        self.stdout = []
+        self.stderr = []
+        self.exit_status = None
+
+        error = False
+
+        with open(simfile, "r", errors="replace") as ifile:
+            has_control = CONTROL_REGEX.search(ifile.read())
+
+        error |= self.command(f"source {simfile}")
+
+        # Without a control section, run the analyses like in batch mode
+        if not has_control and self.exit_status == None:
+            error |= self.command("run")
+
+        # Free the circuit and its results for the next netlist
+        if self.exit_status == None:
+            self.command("remcirc")
+            self.command("destroy all")
+
+        for name, lines in [
+            ("ngspice_stdout.out", self.stdout),
+            ("ngspice_stderr.out", self.stderr),
+        ]:
+            if lines:
+                with open(name, "w") as ofile:
+                    ofile.write("\n".join(lines) + "\n")
+
+        if self.exit_status != None:
+            return self.exit_status
+
+        return 1 if error else 0
+
+
+def _worker_main(conn, library, cwd):
+    """Entry point of a worker process"""
+
+    # CACE cancels the simulations on Ctrl+C and kills the worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    try:
+        # libngspice reads the .spiceinit of cwd
+        os.chdir(cwd)
+        ngspice = NgspiceShared(library)
+    except OSError as e:
+        conn.send(("error", str(e)))
+        return
+
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            simfile, cwd = conn.recv()
+        except EOFError:
+            return
+
+        try:
+            returncode = ngspice.run(simfile, cwd)
+        except OSError as e:
+            ngspice.stderr.append(str(e))
+            returncode = 1
+
+        # After quit, libngspice needs a new process
+        conn.send(("done", (returncode, ngspice.exit_status != None)))
+
+        if ngspice.exit_status != None:
+            return
+
+
+class NgspiceWorker:
+    """A process that has loaded libngspice, kill() cancels the simulation"""
+
+    def __init__(self, library, cwd, key):
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+
+        # Netlists with the same key can share the worker
+        self.key = key
+
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, library, cwd),
+            name="cace-ngspice",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+        self.pid = self.process.pid
+
+        # Exited after quit or was killed
+        self.finished = False
+
+        try:
+            status, message = self.conn.recv()
+        except EOFError:
+            status, message = ("error", "The worker process exited.")
+
+        if status == "error":
+            self.process.join()
+            raise OSError(message)
+
+    def run(self, simfile, cwd):
+        """Run a netlist, returns the exit status or None if killed"""
+
+        try:
+            self.conn.send((simfile, cwd))
+            _, (returncode, finished) = self.conn.recv()
+        except (EOFError, OSError):
+            self.finished = True
+            return None
+
+        self.finished = finished
+        return returncode
+
+    def kill(self):
+        self.finished = True
+        self.process.kill()
+
+    def close(self):
+        self.conn.close()
+        self.process.join()
+
+
+class SharedNgspiceExecutor(LocalExecutor):
+    """
+    Run ngspice on this machine via libngspice in a pool of worker
+    processes, avoiding the start-up of a new ngspice per simulation.
+    Falls back to subprocesses if the library can not be loaded.
+
+    Options and variables set by a netlist or a .spiceinit remain set
+    in the worker, so a worker is only reused for the same parameter
+    and .spiceinit.
+    """
+
+    name = "libngspice"
+
+    def __init__(self, jobs, library):
+        super().__init__(jobs)
+
+        self.library = library
+
+        # Idle worker processes, the most recently used last
+        self._idle = []
+        self._lock = threading.Lock()
+
+        self._failed = False
+
+        # Parameters whose netlists quit ngspice
+        self._quit = set()
+
+    def _acquire(self, cwd, key):
+        with self._lock:
+            for index in reversed(range(len(self._idle))):
+                if self._idle[index].key == key:
+                    return self._idle.pop(index)
+
+        return NgspiceWorker(self.library, cwd, key)
+
+    def _release(self, worker):
+        if worker.finished:
+            worker.close()
+            return
+
+        with self._lock:
+            self._idle.append(worker)
+
+            # Stop the least recently used workers
+            stale = self._idle[: -self.jobs]
+            del self._idle[: -self.jobs]
+
+        for stale_worker in stale:
+            self._stop(stale_worker)
+
+    def _stop(self, worker):
+        worker.conn.close()
+        worker.process.join(1)
+        if worker.process.is_alive():
+            worker.process.kill()
+
+    def run(self, job):
+        if self._failed:
+            return super().run(job)
+
+        memory_governor = job.memory_governor
+
+        # Wait for enough free memory
+        reservation = memory_governor.reserve(job.param["name"], lambda: job.canceled)
+        if not reservation:
+            return -1
+
+        cwd = os.path.abspath(job.outpath)
+
+        # The worker must have read the same .spiceinit
+        spiceinit = ""
+        if os.path.isfile(os.path.join(cwd, ".spiceinit")):
+            with open(os.path.join(cwd, ".spiceinit"), "r", errors="replace") as ifile:
+                spiceinit = ifile.read()
+
+        try:
+            try:
+                worker = self._acquire(cwd, (job.param["name"], spiceinit))
+            except OSError as e:
+                with self._lock:
+                    if not self._failed:
+                        warn(
+                            f"Could not load {self.library}: {e}, using ngspice subprocesses."
+                        )
+                    self._failed = True
+                memory_governor.release(reservation)
+                reservation = None
+                return super().run(job)
+
+            memory_governor.attach(reservation, worker.pid)
+            job.subproc_handle = worker
+
+            dbg(
+                f"Simulating {job.simfile} in '{os.path.relpath(job.outpath)}' with {self.library}…"
+            )
+
+            try:
+                returncode = worker.run(job.simfile, cwd)
+            finally:
+                job.subproc_handle = None
+                self._release(worker)
+        finally:
+            memory_governor.release(reservation)
+
+        # The simulation was canceled
+        if returncode == None:
+            return -1
+
+        # libngspice can not be used anymore after quit
+        if worker.finished and not job.canceled:
+            with self._lock:
+                first = not job.param["name"] in self._quit
+                self._quit.add(job.param["name"])
+            if first:
+                warn(
+                    f'Parameter {job.param["name"]}: The netlist calls quit, libngspice is loaded again for each simulation.'
+                )
+
+        if returncode != 0 and not job.canceled:
+            err(f"Simulation exited with error code {returncode}")
+
+        return returncode
+
+    def shutdown(self):
+        """Stop the idle worker processes"""
+
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for worker in idle:
+            self._stop(worker)
@@ -0,0 +1,140 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import numpy
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+
+class RawPlot:
+    """A plot of a SPICE rawfile, vectors are columns of data"""
+
+    def __init__(self, name, flags, names, data, truncated=False):
+        self.name = name
+        self.flags = flags
+        self.names = names
+
+        # Array of shape (points, variables)
+        self.data = data
+
+        # Whether points are missing, e.g. of an interrupted simulation
+        self.truncated = truncated
+
+    @property
+    def vectors(self):
+        """The vectors of the plot in the order of the rawfile"""
+
+        return [self.data[:, index] for index in range(len(self.names))]
+
+    def vector(self, name):
+        return self.data[:, self.names.index(name)]
+
+
+def read_rawfile(path):
+    """
+    Read the plots of a SPICE rawfile. Binary data is memory-mapped,
+    so the vectors are read from disk only when they are accessed.
+    """
+
+    plots = []
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as ifile:
+        while ifile.tell() < size:
+            header = {}
+            names = []
+
+            # Read the header of the next plot
+            while True:
+                line = ifile.readline()
+                if not line:
+                    return plots
+
+                line = line.decode("latin-1").rstrip("\r\n")
+                key, _, value = line.partition(":")
+                key = key.strip().lower()
+
+                if key == "variables":
+                    for _ in range(int(header["no. variables"])):
+                        fields = ifile.readline().decode("latin-1").split()
+                        names.append(fields[1])
+                elif key in ["binary", "values"]:
+                    break
+                else:
+                    header[key] = value.strip()
+
+            flags = header.get("flags", "real").lower().split()
+            points = int(header["no. points"])
+            dtype = numpy.complex128 if "complex" in flags else numpy.float64
+            truncated = False
+
+            if key == "binary":
+                offset = ifile.tell()
+                row_size = numpy.dtype(dtype).itemsize * len(names)
+
+                # An interrupted simulation writes less points
+                if row_size and (size - offset) // row_size < points:
+                    points = (size - offset) // row_size
+                    truncated = True
+
+                if points > 0:
+                    data = numpy.memmap(
+                        path,
+                        dtype=dtype,
+                        mode="r",
+                        offset=offset,
+                        shape=(points, len(names)),
+                    )
+                else:
+                    data = numpy.empty((0, len(names)), dtype=dtype)
+
+                ifile.seek(offset + points * row_size)
+
+            else:
+                data = numpy.empty((points, len(names)), dtype=dtype)
+
+                for point in range(points):
+                    for index in range(len(names)):
+                        fields = []
+                        while not fields:
+                            line = ifile.readline()
+                            if not line:
+                                raise ValueError(f"Unexpected end of rawfile {path}")
+                            fields = line.decode("latin-1").split()
+
+                        # The first value of a point is preceded by its index
+                        value = fields[-1]
+                        if "," in value:
+                            real, imag = value.split(",")
+                            data[point, index] = complex(float(real), float(imag))
+                        else:
+                            data[point, index] = float(value)
+
+            dbg(
+                f"Read plot '{header.get('plotname')}' with {len(names)} vectors of {points} points."
+            )
+
+            plots.append(RawPlot(header.get("plotname"), flags, names, data, truncated))
+
+    return plots
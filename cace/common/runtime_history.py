@@ -0,0 +1,188 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import glob
+import yaml
+import threading
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# Name of the file in each run directory
+RUNTIMES_FILE = "runtimes.yaml"
+
+
+class RuntimeHistory:
+    """
+    Records the wall time of each parameter and simulation
+    in the run directory and provides the runtimes of
+    previous runs for scheduling decisions.
+    """
+
+    def __init__(self):
+        # Runtimes from previous runs
+        self.previous = {}
+
+        # Runtimes of the current run
+        self.current = {}
+
+        self._lock = threading.Lock()
+
+    def load(self, runs_dir, exclude=None, max_runs=10):
+        """
+        Load the runtimes of the most recent runs.
+        Newer runs take precedence over older runs.
+        """
+
+        self.previous = {}
+
+        runs = sorted(glob.glob(os.path.join(runs_dir, "*")), reverse=True)
+
+        # Runs without simulations, e.g. plans, do not count
+        runs = [
+            run
+            for run in runs
+            if (exclude == None or os.path.abspath(run) != os.path.abspath(exclude))
+            and os.path.isfile(os.path.join(run, RUNTIMES_FILE))
+        ]
+
+        for run in runs[:max_runs]:
+            for pname, entry in self.read(run).items():
+                if not pname in self.previous:
+                    self.previous[pname] = entry
+
+        dbg(f"Loaded runtime history for {len(self.previous)} parameters.")
+
+    def read(self, run):
+        """Return the runtimes recorded in a run directory"""
+
+        runtimes_path = os.path.join(run, RUNTIMES_FILE)
+
+        if not os.path.isfile(runtimes_path):
+            return {}
+
+        try:
+            with open(runtimes_path, "r") as ifile:
+                runtimes = yaml.safe_load(ifile)
+        except yaml.YAMLError:
+            warn(f"Could not read runtimes from {runtimes_path}.")
+            return {}
+
+        if not isinstance(runtimes, dict):
+            return {}
+
+        return runtimes
+
+    def resume(self, run):
+        """
+        Continue the runtimes of an interrupted run, they take
+        precedence and are kept unless recorded again
+        """
+
+        runtimes = self.read(run)
+
+        with self._lock:
+            self.previous.update(runtimes)
+            self.current.update(runtimes)
+
+    def keep_parameter(self, pname):
+        """Keep the previous entry of a parameter that was not simulated"""
+
+        with self._lock:
+            if pname in self.previous:
+                self.current[pname] = self.previous[pname]
+
+    def get_parameter_runtime(self, pname):
+        """Return the previous wall time of a parameter or None"""
+
+        if pname in self.previous:
+            return self.previous[pname].get("runtime")
+
+        return None
+
+    def get_parameter_memory(self, pname):
+        """Return the previous peak memory of a subprocess of a parameter or None"""
+
+        if pname in self.previous:
+            return self.previous[pname].get("memory")
+
+        return None
+
+    def get_simulation_runtime(self, pname, run):
+        """Return the previous wall time of a simulation or None"""
+
+        if pname in self.previous:
+            return self.previous[pname].get("simulations", {}).get(run)
+
+        return None
+
+    def get_simulation_runtimes(self, pname):
+        """Return the previous wall times of all simulations of a parameter"""
+
+        if pname in self.previous:
+            return self.previous[pname].get("simulations", {})
+
+        return {}
+
+    def get_simulated_runs(self, pname):
+        """Return the number of runs covered by the simulation wall times or None"""
+
+        if pname in self.previous:
+            return self.previous[pname].get("runs")
+
+        return None
+
+    def record_parameter(
+        self, pname, runtime, simulations=None, memory=None, runs=None
+    ):
+        """Record the wall time of a parameter and its simulations"""
+
+        with self._lock:
+            entry = {"runtime": round(runtime, 3)}
+
+            # Peak resident memory of a single subprocess
+            if memory:
+                entry["memory"] = memory
+
+            if simulations:
+                entry["simulations"] = {
+                    run: round(value, 3) for run, value in simulations.items()
+                }
+
+            # Batches simulate several runs at once
+            if runs:
+                entry["runs"] = runs
+
+            self.current[pname] = entry
+
+    def save(self, path):
+        """Write the runtimes of the current run"""
+
+        with self._lock:
+            with open(path, "w") as ofile:
+                yaml.dump(
+                    self.current,
+                    ofile,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
@@ -0,0 +1,200 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import sys
+import pickle
+import threading
+import traceback
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.machinery import SourceFileLoader
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# Loaded scripts of this process by (path, mtime)
+_scripts = {}
+
+
+class ThreadStdout:
+    """
+    Replaces sys.stdout to capture the output of the threads
+    that run a script, the output of other threads is passed on
+    """
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.local = threading.local()
+
+    def write(self, text):
+        output = getattr(self.local, "output", None)
+        if output != None:
+            return output.write(text)
+        return self.stdout.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stdout, name)
+
+
+_stdout_lock = threading.Lock()
+
+
+def capture_stdout(output):
+    """Capture the output of the current thread in output, or stop with None"""
+
+    with _stdout_lock:
+        if not isinstance(sys.stdout, ThreadStdout):
+            sys.stdout = ThreadStdout(sys.stdout)
+        sys.stdout.local.output = output
+
+
+def load_script(script_path):
+    """Load a user-defined script, once per process"""
+
+    key = (os.path.abspath(script_path), os.path.getmtime(script_path))
+
+    if not key in _scripts:
+        _scripts[key] = SourceFileLoader("user_script", script_path).load_module()
+
+    return _scripts[key]
+
+
+def run_postprocess(script_path, results, conditions):
+    """
+    Call postprocess() of a user-defined script.
+    Returns the results, the output of the script and the
+    formatted exception if the script failed.
+    """
+
+    output = io.StringIO()
+
+    capture_stdout(output)
+    try:
+        script_values = load_script(script_path).postprocess(results, conditions)
+        return (script_values, output.getvalue(), None)
+    except Exception:
+        return (None, output.getvalue(), traceback.format_exc())
+    finally:
+        capture_stdout(None)
+
+
+def run_postprocess_pooled(script_path, results, conditions):
+    """Like run_postprocess(), but fails if the results can not be sent back"""
+
+    result = run_postprocess(script_path, results, conditions)
+
+    try:
+        pickle.dumps(result)
+    except Exception:
+        return (None, result[1], traceback.format_exc())
+
+    return result
+
+
+class ScriptRunner:
+    """
+    Runs the postprocessing of user-defined scripts in a pool of
+    processes, so that scripts run in parallel. Falls back to the
+    current process if the script or its data can not be sent to
+    the pool.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers if max_workers else os.cpu_count()
+
+        self._pool = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if not self._pool and not self._failed:
+                dbg(f"Starting {self.max_workers} script processes.")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _run_locally(self, script_path, results, conditions):
+        future = Future()
+        future.set_result(run_postprocess(script_path, results, conditions))
+        return future
+
+    def submit(self, script_path, results, conditions):
+        """Run postprocess(), returns a future of run_postprocess()"""
+
+        pool = self._get_pool()
+
+        if pool:
+            try:
+                future = pool.submit(
+                    run_postprocess_pooled, script_path, results, conditions
+                )
+                return ScriptTask(future, self, script_path, results, conditions)
+            except (BrokenProcessPool, RuntimeError, OSError) as e:
+                self._disable(e)
+
+        return self._run_locally(script_path, results, conditions)
+
+    def _disable(self, reason):
+        with self._lock:
+            if not self._failed:
+                warn(f"Running user-defined scripts in the CACE process: {reason}")
+            self._failed = True
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool:
+                # cancel_futures requires Python 3.9
+                if sys.version_info >= (3, 9):
+                    self._pool.shutdown(wait=False, cancel_futures=True)
+                else:
+                    self._pool.shutdown(wait=False)
+                self._pool = None
+
+
+class ScriptTask:
+    """
+    A script running in the pool, runs it locally if its
+    data could not be sent to the pool
+    """
+
+    def __init__(self, future, runner, script_path, results, conditions):
+        self.future = future
+        self.runner = runner
+        self.args = (script_path, results, conditions)
+
+    def result(self):
+        try:
+            return self.future.result()
+        except BrokenProcessPool as e:
+            # The script may have run already, e.g. it exited the process
+            self.runner._disable(e)
+            return (None, "", f"The script process terminated abruptly: {e}")
+        except Exception as e:
+            # E.g. results that can not be pickled, the script did not run
+            self.runner._disable(e)
+            return self.runner._run_locally(*self.args).result()
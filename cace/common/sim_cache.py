@@ -0,0 +1,276 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import shutil
+import hashlib
+import threading
+import subprocess
+
+from .executor import INCLUDE_REGEX
+from .memory_governor import MEMORY_UNITS, format_memory_size
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# Bump to invalidate all entries after changing the key
+CACHE_VERSION = "1"
+
+DEFAULT_CACHE_SIZE = 10 * MEMORY_UNITS["G"]
+
+
+def parse_cache_size(value):
+    """Parse a size such as "512M" or "10G" into bytes"""
+
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMGT]?)i?B?\s*", str(value), re.I)
+
+    if not match:
+        raise ValueError(f"Invalid cache size: {value}")
+
+    return int(float(match.group(1)) * MEMORY_UNITS[match.group(2).upper()])
+
+
+class SimulationCache:
+    """
+    Stores the output files of simulations in a directory, keyed by a
+    hash of the netlist, all files it includes, the spiceinit and the
+    version of ngspice. The least recently used entries are evicted
+    once the cache exceeds its size.
+    """
+
+    def __init__(self, path, max_size=DEFAULT_CACHE_SIZE):
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+        # Digests of included files by (path, size, mtime)
+        self._digests = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def ngspice_version(self):
+        """The version banner of ngspice, read once"""
+
+        with self._lock:
+            if self._version == None:
+                try:
+                    self._version = subprocess.run(
+                        ["ngspice", "--version"],
+                        stdin=subprocess.DEVNULL,
+                        capture_output=True,
+                        text=True,
+                        timeout=30,
+                    ).stdout
+                except (OSError, subprocess.SubprocessError):
+                    self._version = "unknown"
+            return self._version
+
+    def _file_digest(self, path, visited):
+        """Hash a file including everything it includes"""
+
+        stat = os.stat(path)
+        signature = (path, stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            if signature in self._digests:
+                return self._digests[signature]
+
+        digest = hashlib.sha256()
+        self._hash_netlist(digest, path, None, visited)
+
+        with self._lock:
+            self._digests[signature] = digest.hexdigest()
+
+        return digest.hexdigest()
+
+    def _hash_netlist(self, digest, path, outpath, visited):
+        # Libraries may include sections of themselves
+        visited.add(os.path.abspath(path))
+
+        with open(path, "rb") as ifile:
+            data = ifile.read()
+
+        text = data.decode("latin-1")
+
+        # The run directory differs between runs
+        if outpath:
+            text = text.replace(outpath, "<simpath>")
+
+        digest.update(text.encode("latin-1"))
+
+        for line in text.splitlines():
+            match = INCLUDE_REGEX.match(line)
+            if not match:
+                continue
+
+            include = match.group(3).replace("<simpath>", outpath or "")
+
+            resolved = os.path.join(os.path.dirname(path), include)
+            if not os.path.isabs(include) and not os.path.isfile(resolved):
+                resolved = os.path.join(outpath or ".", include)
+            resolved = os.path.abspath(resolved)
+
+            if resolved in visited:
+                continue
+            visited.add(resolved)
+
+            if os.path.isfile(resolved):
+                digest.update(self._file_digest(resolved, visited).encode())
+            else:
+                digest.update(f"missing {include}".encode())
+
+    def key(self, outpath, simfile):
+        """Return the key of a simulation, None if it can not be hashed"""
+
+        outpath = os.path.abspath(outpath)
+
+        digest = hashlib.sha256()
+        digest.update(CACHE_VERSION.encode())
+        digest.update(self.ngspice_version().encode())
+
+        try:
+            spiceinit = os.path.join(outpath, ".spiceinit")
+            if os.path.isfile(spiceinit):
+                self._hash_netlist(digest, spiceinit, outpath, set())
+
+            self._hash_netlist(digest, os.path.join(outpath, simfile), outpath, set())
+        except OSError as e:
+            dbg(f"Could not hash {simfile}: {e}")
+            return None
+
+        return digest.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def restore(self, key, outpath):
+        """Copy the output files of an entry to outpath, returns True on a hit"""
+
+        entry = self._entry(key)
+
+        try:
+            for name in os.listdir(entry):
+                shutil.copy2(os.path.join(entry, name), os.path.join(outpath, name))
+
+            # Mark as recently used
+            os.utime(entry)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def snapshot(self, outpath):
+        """The files of a run directory before the simulation"""
+
+        snapshot = {}
+        for name in os.listdir(outpath):
+            path = os.path.join(outpath, name)
+            if os.path.isfile(path):
+                snapshot[name] = os.stat(path).st_mtime_ns
+        return snapshot
+
+    def store(self, key, outpath, snapshot):
+        """Add the files written by the simulation to the cache"""
+
+        entry = self._entry(key)
+        temp = f"{entry}.{os.getpid()}.{threading.get_ident()}"
+
+        try:
+            os.makedirs(temp, exist_ok=True)
+
+            for name in os.listdir(outpath):
+                path = os.path.join(outpath, name)
+                if not os.path.isfile(path):
+                    continue
+                if snapshot.get(name) == os.stat(path).st_mtime_ns:
+                    continue
+                shutil.copy2(path, os.path.join(temp, name))
+
+            # Complete entries only, another process may have added it
+            os.rename(temp, entry)
+        except OSError:
+            shutil.rmtree(temp, ignore_errors=True)
+            return
+
+        with self._lock:
+            self.stored += 1
+
+    def evict(self):
+        """Remove the least recently used entries above the size"""
+
+        entries = []
+        total = 0
+
+        for prefix in os.listdir(self.path):
+            prefix_path = os.path.join(self.path, prefix)
+            if not os.path.isdir(prefix_path):
+                continue
+
+            for key in os.listdir(prefix_path):
+                entry = os.path.join(prefix_path, key)
+                try:
+                    size = sum(
+                        os.path.getsize(os.path.join(entry, name))
+                        for name in os.listdir(entry)
+                    )
+                    entries.append((os.stat(entry).st_mtime, size, entry))
+                except OSError:
+                    continue
+                total += size
+
+        evicted = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            evicted += 1
+
+        if evicted:
+            verbose(f"Evicted {evicted} simulations from the cache.")
+
+        return total
+
+    def summary(self):
+        """Statistics of the cache as Markdown"""
+
+        size = self.evict()
+
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0
+
+        result = "\n## Simulation Cache\n\n"
+        result += f"**cache**: {self.path}\n\n"
+        result += f"**hits**: {self.hits} of {lookups} ({rate:.0f}%), **stored**: {self.stored}\n\n"
+        result += f"**size**: {format_memory_size(size)} of {format_memory_size(self.max_size)}\n"
+
+        return result
@@ -0,0 +1,231 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# name = value pairs of .param lines
+ASSIGNREX = re.compile(r"([A-Za-z_][\w.]*)\s*=\s*('[^']*'|\{[^}]*\}|[^\s=]+)")
+
+# Plain numbers with an optional unit suffix
+NUMREX = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?[a-zA-Z]*$")
+
+# Commands that would end the batch early
+QUITREX = re.compile(r"^\s*(quit|exit)\b", re.IGNORECASE)
+
+
+class BatchNetlist:
+    """
+    A SPICE netlist split into the structure of its circuit, the values
+    that ngspice can change without loading the netlist again and the
+    commands of its control section.
+    """
+
+    def __init__(self, text):
+        self.lines = text.splitlines()
+
+        # Lines of the circuit without the values, for comparison
+        self.structure = []
+
+        # Changeable values as {(command, name): value}
+        self.values = {}
+
+        # Commands of the .control section
+        self.control = None
+
+        # Lines of the circuit, without the control section
+        self.circuit = []
+
+        in_control = False
+        subckt_depth = 0
+
+        # The first line is the title
+        for line in self._join(self.lines[1:]):
+            stripped = line.strip()
+            lower = stripped.lower()
+
+            if in_control:
+                if lower.startswith(".endc"):
+                    in_control = False
+                elif not QUITREX.match(stripped):
+                    self.control.append(line)
+                continue
+
+            if lower.startswith(".control"):
+                in_control = True
+                self.control = []
+                continue
+
+            self.circuit.append(line)
+
+            # Comments and empty lines are not compared
+            if not stripped or stripped.startswith("*"):
+                continue
+
+            if lower.startswith(".subckt"):
+                subckt_depth += 1
+            elif lower.startswith(".ends"):
+                subckt_depth = max(subckt_depth - 1, 0)
+
+            # Parameters of subcircuits are local
+            if subckt_depth == 0:
+                shape = self._parse(stripped, lower)
+                if shape != None:
+                    self.structure.append(shape)
+                    continue
+
+            self.structure.append(stripped)
+
+    def _join(self, lines):
+        """Join continuation lines"""
+
+        joined = []
+        for line in lines:
+            if line.startswith("+") and joined:
+                joined[-1] += " " + line[1:]
+            else:
+                joined.append(line)
+        return joined
+
+    def _parse(self, line, lower):
+        """Record the values of a line, returns its structure or None"""
+
+        fields = line.split()
+
+        if lower.startswith(".param"):
+            return self._assignments(line, "alterparam")
+
+        # Options such as the seed are only read when loading the netlist,
+        # except for the temperature
+        if lower.startswith(".temp") and len(fields) == 2:
+            self.values[("option", "temp")] = fields[1]
+            return ".temp"
+
+        # Elements with a single value, e.g. "V1 in 0 DC 1.8"
+        if fields[0][0].lower() in "vircl":
+            if len(fields) == 5 and fields[0][0].lower() in "vi":
+                if fields[3].lower() != "dc":
+                    return None
+            elif len(fields) != 4:
+                return None
+
+            if not NUMREX.match(fields[-1]):
+                return None
+
+            self.values[("alter", fields[0].lower())] = fields[-1]
+            return " ".join(fields[:-1])
+
+        return None
+
+    def _assignments(self, line, command):
+        keyword, rest = (line.split(None, 1) + [""])[:2]
+
+        # Anything else than assignments
+        if ASSIGNREX.sub("", rest).strip():
+            return None
+
+        names = []
+        for name, value in ASSIGNREX.findall(rest):
+            self.values[(command, name.lower())] = value
+            names.append(name.lower())
+
+        return f"{keyword.lower()} {' '.join(names)}"
+
+    def key(self):
+        """Netlists with the same key can be simulated in one batch"""
+
+        if self.control == None:
+            return None
+
+        return "\n".join(self.structure)
+
+
+def batch_commands(netlist, varying):
+    """Return the control commands that apply the values of a netlist"""
+
+    commands = []
+
+    params = [key for key in varying if key[0] == "alterparam"]
+    for _, name in params:
+        commands.append(f"alterparam {name} = {netlist.values[('alterparam', name)]}")
+
+    # Load the circuit again with the new parameters
+    if params:
+        commands.append("reset")
+
+    for command, name in varying:
+        if command == "option":
+            commands.append(f"option {name} = {netlist.values[(command, name)]}")
+        elif command == "alter":
+            commands.append(f"alter {name} = {netlist.values[(command, name)]}")
+
+    return commands
+
+
+def write_batch_netlist(path, netlists, outpaths):
+    """
+    Write a netlist that simulates all netlists in a single run of ngspice.
+    The circuit of the first netlist is loaded once, the values of each
+    netlist are applied before running its control section in its own
+    directory. All netlists must have the same key.
+    """
+
+    first = netlists[0]
+
+    # Only the values that differ between the netlists need to be applied
+    varying = [
+        key
+        for key in first.values
+        if any(netlist.values.get(key) != first.values[key] for netlist in netlists)
+    ]
+
+    dbg(f"Batch of {len(netlists)} netlists, changing {varying}.")
+
+    control = [".control"]
+    for index, (netlist, outpath) in enumerate(zip(netlists, outpaths)):
+        control.append(f"* Condition set {index}")
+        control.append(f"cd {outpath}")
+
+        # The first netlist is already loaded
+        if index > 0 and varying:
+            control.extend(batch_commands(netlist, varying))
+
+        control.extend(netlist.control)
+
+        # Free the results before the next condition set
+        control.append("destroy all")
+    control.append(".endc")
+
+    lines = [first.lines[0] if first.lines else "* CACE batch"]
+
+    # Insert the new control section before .end
+    for line in first.circuit:
+        if line.strip().lower() == ".end":
+            lines.extend(control)
+            control = []
+        lines.append(line)
+    lines.extend(control)
+
+    with open(path, "w") as ofile:
+        ofile.write("\n".join(lines) + "\n")
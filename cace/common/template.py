@@ -0,0 +1,269 @@
+# Copyright 2026 CACE Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+from .safe_eval import safe_eval
+
+from ..logging import (
+    dbg,
+    verbose,
+    info,
+    subproc,
+    rule,
+    success,
+    warn,
+    err,
+)
+
+# Vectors in name[number|range] format
+VECTREX = re.compile(r"([^\[]+)\[([0-9:]+)\]")
+
+# Regular expressions
+# varex:		variable name {name}
+# sweepex:		name in {cond|value} format
+# brackrex:		expressions in [expression] format
+# Indexed by (legacy format, escaped)
+PATTERNS = {
+    (True, True): (
+        re.compile(r"\\\{([^\\\}]+)\\\}"),
+        re.compile(r"\\\{([^\\\}]+)\|([^ \\\}]+)\\\}"),
+        re.compile(r"\[([^\]]+)\]"),
+    ),
+    (False, True): (
+        re.compile(r"CACE\\\{([^\\\}]+)\\\}"),
+        re.compile(r"CACE\\\{([^\\\}]+)\|([^ \\\}]+)\\\}"),
+        re.compile(r"CACE\[([^\]]+)\]"),
+    ),
+    (True, False): (
+        re.compile(r"\{([^\}]+)\}"),
+        re.compile(r"\{([^\}]+)\|([^ \}]+)\}"),
+        re.compile(r"\[([^\]]+)\]"),
+    ),
+    (False, False): (
+        re.compile(r"CACE\{([^\}]+)\}"),
+        re.compile(r"CACE\{([^\}]+)\|([^ \}]+)\}"),
+        re.compile(r"CACE\[([^\]]+)\]"),
+    ),
+}
+
+# Placeholders are marked with characters of the private use area
+MARKER_BASE = 0xE000
+MARKER_REGEX = re.compile("([\ue000-\uf8ff])")
+
+
+def get_patterns(cace_format, escape=False):
+    """Return varex, sweepex and brackrex for the datasheet format"""
+
+    return PATTERNS[(cace_format <= 5.0, escape)]
+
+
+def evaluate_expression(expression, original):
+    """Evaluate an expression, returns the original text on error"""
+
+    try:
+        # Avoid catching simple array indexes like "v[0]".
+        # Other non-expressions will just throw exceptions
+        # when passed to safe_eval().
+        int(expression)
+        return original
+    except:
+        pass
+
+    try:
+        return str(safe_eval(expression))
+    except:
+        err(f"Invalid expression: {expression}.")
+    return original
+
+
+class CompiledTemplate:
+    """
+    A template parsed into literal text and placeholders, so that
+    rendering a condition set is a single join. Expressions that do
+    not depend on a placeholder are evaluated once when compiling.
+    """
+
+    def __init__(self, text, cace_format, escape=False):
+        varex, sweepex, brackrex = get_patterns(cace_format, escape)
+
+        # Placeholders as ("var", text, name, indices),
+        # ("sweep", text, name, type) or ("expr", prefix, segments)
+        self.placeholders = []
+
+        # Literal strings and indices into placeholders
+        self.segments = []
+
+        # Concatenate any continuation lines
+        for line in text.replace("\n+", " ").splitlines():
+
+            # Placeholders of the current line
+            self._marked = []
+
+            # Substitute variable name at {name|maximum}
+            line = sweepex.sub(
+                lambda match: self._mark(
+                    ("sweep", match.group(0), match.group(1), match.group(2))
+                ),
+                line,
+            )
+
+            # Substitute variable name {name}
+            line = varex.sub(lambda match: self._mark(self._var(match)), line)
+
+            # Evaluate expressions [2 + 2]
+            line = brackrex.sub(self._expr, line)
+
+            self.segments.extend(self._split(line))
+            self.segments.append("\n")
+
+        # Merge adjacent literals
+        merged = []
+        for segment in self.segments:
+            if merged and isinstance(segment, str) and isinstance(merged[-1], str):
+                merged[-1] += segment
+            else:
+                merged.append(segment)
+        self.segments = merged
+
+    def _mark(self, placeholder):
+        self._marked.append(len(self.placeholders))
+        self.placeholders.append(placeholder)
+        return chr(MARKER_BASE + len(self._marked) - 1)
+
+    def _split(self, text):
+        """Split marked text into literals and placeholder indices"""
+
+        return [
+            (
+                self._marked[ord(part) - MARKER_BASE]
+                if MARKER_REGEX.fullmatch(part)
+                else part
+            )
+            for part in MARKER_REGEX.split(text)
+            if part
+        ]
+
+    def _var(self, match):
+        cond_name = match.group(1)
+
+        # For condition names in the form {cond=value}, use only the name
+        if "=" in cond_name:
+            cond_name, default = cond_name.split("=")
+
+        # Check for bit slices
+        indices = None
+        pmatch = VECTREX.match(cond_name)
+        if pmatch:
+            cond_name = pmatch.group(1)
+            indices = pmatch.group(2).split(":")
+
+        return ("var", match.group(0), cond_name, indices)
+
+    def _expr(self, match):
+        segments = self._split(match.group(1))
+
+        # Constant expression, evaluate it right away
+        if all(isinstance(segment, str) for segment in segments):
+            return evaluate_expression(match.group(1), match.group(0))
+
+        prefix = match.group(0)[: match.start(1) - match.start(0)]
+
+        return self._mark(("expr", prefix, segments))
+
+    def _render(self, index, conditions_set, conditions):
+        placeholder = self.placeholders[index]
+
+        if placeholder[0] == "var":
+            return self._render_var(placeholder, conditions_set)
+
+        if placeholder[0] == "sweep":
+            _, _, cond_name, cond_type = placeholder
+
+            if cond_name in conditions:
+                if cond_type in conditions[cond_name].spec:
+                    return str(conditions[cond_name].spec[cond_type])
+                else:
+                    err(f"Could not find {cond_type} in {cond_name} in conditions.")
+            else:
+                err(f"Could not find {cond_name} in conditions.")
+            return ""
+
+        _, prefix, segments = placeholder
+
+        expression = "".join(
+            (
+                segment
+                if isinstance(segment, str)
+                else self._render(segment, conditions_set, conditions)
+            )
+            for segment in segments
+        )
+
+        return evaluate_expression(expression, f"{prefix}{expression}]")
+
+    def _render_var(self, placeholder, conditions_set):
+        _, original, cond_name, indices = placeholder
+
+        # Check whether the condition is in the set
+        if not cond_name in conditions_set:
+            err(f"Could not find {cond_name} in condition set.")
+
+            # Error, do not change the condition value
+            return original
+
+        value = conditions_set[cond_name]
+
+        # Condition not defined
+        if value == None:
+            return original
+
+        # Simply replace with the full value
+        if not indices:
+            return str(value)
+
+        # Extract certain bits
+        try:
+            # Single bit
+            if len(indices) == 1:
+                # Convert number into binary first
+                length = int(indices[0]) + 1
+                binary = format(int(value), f"0{length}b")
+                end = len(binary)
+                return binary[end - 1 - int(indices[0])]
+            # Bit slice
+            elif len(indices) == 2:
+                # Convert number into binary first
+                length = max(int(indices[0]) + 1, int(indices[1]) + 1)
+                binary = format(int(value), f"0{length}b")
+                end = len(binary)
+                return binary[end - 1 - int(indices[0]) : end - int(indices[1])]
+            else:
+                err(f"This bit slice is not supported: {original}")
+                return ""
+        except:
+            err(f"Can't extract bit from: {value}")
+            return ""
+
+    def render(self, conditions_set, conditions):
+        """Substitute a condition set, returns the text"""
+
+        return "".join(
+            (
+                segment
+                if isinstance(segment, str)
+                else self._render(segment, conditions_set, conditions)
+            )
+            for segment in self.segments
+        )
@@ -16,9 +16,11 @@ import os
 import re
 import sys
 import copy
+import time
 import textwrap
 import traceback
 import subprocess
+import numpy
 from statistics import median, mean
 from enum import Enum
 from abc import abstractmethod, ABC
@@ -46,8 +48,9 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 from ..common import slugify
-from ..common.safe_eval import safe_eval
+from ..common.template import CompiledTemplate
 from ..common.misc import mkdirp
+from ..common.fair_semaphore import get_priority
 from ..common.spiceunits import spice_unit_convert
 from ..common.common import linseq, logseq
 from ..config import Variable, Result
@@ -62,6 +65,25 @@ from ..logging import (
     err,
 )
 
+# Default settings of the spec entries
+SPEC_DEFAULTS = {
+    "minimum": {
+        "fail": True,
+        "calculation": "minimum",
+        "limit": "above",
+    },
+    "typical": {
+        "fail": False,
+        "calculation": "median",
+        "limit": "exact",
+    },
+    "maximum": {
+        "fail": True,
+        "calculation": "maximum",
+        "limit": "below",
+    },
+}
+
 
 class ResultType(Enum):
     UNKNOWN = 0
@@ -96,7 +118,8 @@ class NamedResult:
 
     def __init__(self, name):
         self.name = name
-        self.values = []
+        # Arrays of values, concatenated on access
+        self._chunks = []
         # Maximum/minimum/median of the values
         self.result = {
             "minimum": None,
@@ -116,6 +139,59 @@ class NamedResult:
     def __str__(self):
         return f"{self.name} with values {self.values}"
 
+    @property
+    def values(self):
+        """All values as a single array"""
+
+        if len(self._chunks) != 1:
+            self._chunks = [
+                numpy.concatenate(self._chunks) if self._chunks else numpy.empty(0)
+            ]
+        return self._chunks[0]
+
+    @values.setter
+    def values(self, values):
+        self._chunks = [numpy.asarray(values)]
+
+    def extend(self, values):
+        """Append a list or an array of values"""
+
+        self._chunks.append(numpy.asarray(values))
+
+    def calculate(self, calculation):
+        """Calculate a single value from the values"""
+
+        values = self.values
+
+        # Not a numeric result, e.g. an error message
+        if not values.dtype.kind in "biuf":
+            values = values.tolist()
+            return {
+                "minimum": min,
+                "maximum": max,
+                "median": median,
+                "average": mean,
+            }[
+                calculation
+            ](values)
+
+        if calculation == "minimum":
+            result = numpy.min(values)
+        elif calculation == "maximum":
+            result = numpy.max(values)
+        elif calculation == "median":
+            result = numpy.median(values)
+        elif calculation == "average":
+            result = numpy.mean(values)
+
+        result = result.item()
+
+        # Keep integer results of counts as integers
+        if values.dtype.kind in "biu" and float(result).is_integer():
+            result = int(result)
+
+        return result
+
 
 class Condition:
     def __init__(self):
@@ -133,7 +209,37 @@ class Condition:
         return f"{self.name} {self.description} {self.display} {self.unit} {self.spec} {self.values}"
 
     def generate_values(self):
-        self.values = [val for val in self.condition_gen()]
+        """Generate the distinct values, in the order of their first occurrence"""
+
+        self.values = []
+        distinct = set()
+
+        for value in self.condition_gen():
+            # Remove the rounding errors of the sequences
+            if isinstance(value, float):
+                value = float(f"{value:.12g}")
+
+            converted = self.convert(value)
+
+            # Compare numbers by their value, e.g. 1.8 and 1.80
+            try:
+                key = float(converted)
+            except (TypeError, ValueError):
+                key = converted
+
+            if key in distinct:
+                continue
+            distinct.add(key)
+
+            self.values.append(value)
+
+    def convert(self, value):
+        """Return the value as substituted in the netlist"""
+
+        if self.unit:
+            return spice_unit_convert((str(self.unit), str(value)))
+
+        return str(value)
 
     def condition_gen(self):
         """
@@ -186,6 +292,97 @@ class Condition:
                 yield self.spec["maximum"]
 
 
+class ConditionTable:
+    """
+    The condition sets of a parameter, the unique combinations of all
+    conditions with the first condition changing fastest. Each condition
+    is stored as a column of its distinct values, a condition set is
+    created as a dict when it is accessed.
+
+    Condition sets keep the index of their combination (their row) when
+    a subset is selected, so that they still match their run directories.
+    """
+
+    def __init__(self, conditions):
+        self.names = list(conditions)
+
+        # The values of each condition are converted once
+        self.columns = []
+        for cond in self.names:
+            if conditions[cond].values:
+                self.columns.append(
+                    [
+                        conditions[cond].convert(value)
+                        for value in conditions[cond].values
+                    ]
+                )
+            else:
+                self.columns.append([None])
+
+        self.strides = []
+        stride = 1
+        for column in self.columns:
+            self.strides.append(stride)
+            stride *= len(column)
+
+        # Number of combinations
+        self.size = stride
+
+        # Index of the combination of each condition set
+        self.rows = range(stride)
+
+        # Function returning the reserved variables of a row,
+        # they replace conditions of the same name
+        self.derived = None
+
+        # Changed values by row, e.g. the collated values
+        self.changes = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, position):
+        row = self.row(position)
+
+        condition_set = {
+            name: column[(row // stride) % len(column)]
+            for name, column, stride in zip(self.names, self.columns, self.strides)
+        }
+
+        if self.derived:
+            for name, value in self.derived(row).items():
+                if name in condition_set:
+                    condition_set[name] = value
+
+        if row in self.changes:
+            condition_set.update(self.changes[row])
+
+        return condition_set
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def row(self, position):
+        """Index of the combination of a condition set"""
+
+        return int(self.rows[position])
+
+    def update(self, position, values):
+        """Change values of a condition set"""
+
+        self.changes.setdefault(self.row(position), {}).update(values)
+
+    def select(self, positions):
+        """Return a table with the given condition sets"""
+
+        table = copy.copy(self)
+        table.rows = numpy.asarray(
+            [self.rows[position] for position in positions], dtype=numpy.int64
+        )
+        return table
+
+
 class Parameter(ABC, Thread):
     """
     Base class for all parameters.
@@ -199,6 +396,9 @@ class Parameter(ABC, Thread):
     config_vars: ClassVar[List[Variable]] = []
     config_results: ClassVar[List[Result]] = []
 
+    # Netlists or layouts the tool reads, see ArtifactGraph
+    artifacts: ClassVar[List[str]] = []
+
     # Instance Variables
     name: str
 
@@ -268,6 +468,7 @@ class Parameter(ABC, Thread):
         run_dir,
         max_jobs,
         jobs_sem,
+        job_scheduler,
         start_cb=None,
         end_cb=None,
         cancel_cb=None,
@@ -285,17 +486,48 @@ class Parameter(ABC, Thread):
         self.run_dir = run_dir
         self.max_jobs = max_jobs
         self.jobs_sem = jobs_sem
+        self.job_scheduler = job_scheduler
         self.start_cb = start_cb
         self.end_cb = end_cb
         self.cancel_cb = cancel_cb
         self.step_cb = step_cb
 
+        # Priority lane for acquiring jobs
+        self.priority = get_priority(self.runtime_options["priority"])
+
         self.started = False
 
         self.harvested = False
 
+        # Called by the thread once it has completed,
+        # set by the ParameterManager
+        self.complete_cb = None
+
+        # Runtimes of previous runs, set by the ParameterManager
+        self.runtime_history = None
+
+        # Results of previous simulations, set by the ParameterManager
+        self.sim_cache = None
+
+        # Wall time of the parameter and its simulations
+        self.runtime = None
+        self.simulation_runtimes = {}
+
+        # Runs covered by the simulation runtimes
+        self.simulated_runs = 0
+
+        # Runs restored from an interrupted run or the simulation cache
+        self.reused_runs = 0
+
         self.subproc_handle = None
 
+        # Templates parsed by substitute()
+        self.templates = {}
+
+        # Input artifacts that could not be produced,
+        # set by the ParameterManager
+        self.failed_artifacts = []
+
         self.param_dir = os.path.abspath(
             os.path.join(self.run_dir, "parameters", pname)
         )
@@ -353,7 +585,47 @@ class Parameter(ABC, Thread):
     def is_runnable(self):
         return True
 
+    def get_required_artifacts(self):
+        """Return the artifacts that must exist before the parameter runs"""
+
+        return self.artifacts
+
+    def get_expected_runtime(self):
+        """Return the wall time of a previous run or None"""
+
+        if self.runtime_history:
+            return self.runtime_history.get_parameter_runtime(self.pname)
+
+        return None
+
+    def plan(self):
+        """
+        Return the runs of the parameter and their expected CPU and
+        wall time in seconds, without running any tool
+        """
+
+        runtime = self.get_expected_runtime()
+
+        return {
+            "tool": self.toolname,
+            "runs": 1,
+            "cpu_time": runtime,
+            "wall_time": runtime,
+        }
+
     def run(self):
+        start_time = time.monotonic()
+
+        try:
+            self.run_parameter()
+        finally:
+            self.runtime = time.monotonic() - start_time
+
+            # Also notify on exit via a cancel point
+            if self.complete_cb:
+                self.complete_cb(self)
+
+    def run_parameter(self):
 
         self.started = True
         rule(f'Started {self.param["display"]}')
@@ -373,7 +645,12 @@ class Parameter(ABC, Thread):
             self.cancel_point()
 
             # Run the implementation
-            if self.is_runnable():
+            if self.failed_artifacts:
+                err(
+                    f'Parameter {self.pname}: Failed to generate {", ".join(self.failed_artifacts)}.'
+                )
+                self.result_type = ResultType.ERROR
+            elif self.is_runnable():
                 self.implementation()
 
             self.cancel_point()
@@ -406,55 +683,75 @@ class Parameter(ABC, Thread):
 
     def run_subprocess(self, proc, args=[], env=None, input=None, cwd=None):
 
+        # Drive the subprocess from the event loop
+        if self.job_scheduler.engine == "asyncio":
+            return self.job_scheduler.run_subprocess(
+                self, proc, args, env=env, input=input, cwd=cwd
+            )
+
         dbg(
             f'Subprocess {proc} {" ".join(args)} at \'[repr.filename][link=file://{os.path.abspath(cwd)}]{os.path.relpath(cwd)}[/link][/repr.filename]\'…'
         )
 
-        with subprocess.Popen(
-            [proc] + args,
-            cwd=cwd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            stdin=subprocess.PIPE if input else subprocess.DEVNULL,
-            env=env,
-            text=True,
-        ) as process:
-
-            self.subproc_handle = process
-
-            if input != None:
-                dbg(f"input: {input}")
-            stdout, stderr = process.communicate(input)
-            returncode = process.returncode
-
-            if returncode != 0:
-                err(f"Subprocess exited with error code {returncode}")
-
-            # Print stderr
-            if stderr and returncode != 0:
-                err("Error output generated by subprocess:")
-                for line in stderr.splitlines():
-                    err(line.rstrip("\n"))
-            else:
-                dbg("Error output generated by subprocess:")
-                for line in stderr.splitlines():
-                    dbg(line.rstrip("\n"))
-
-            # Write stderr to file
-            if stderr:
-                with open(f"{os.path.join(cwd, proc)}_stderr.out", "w") as stderr_file:
-                    stderr_file.write(stderr)
-
-            # Print stdout
-            if stdout:
-                dbg(f"Output from subprocess {proc}:")
-                for line in stdout.splitlines():
-                    dbg(line.rstrip())
-
-            # Write stdout to file
-            if stdout:
-                with open(f"{os.path.join(cwd, proc)}_stdout.out", "w") as stdout_file:
-                    stdout_file.write(stdout)
+        # Wait for enough free memory
+        memory_governor = self.job_scheduler.memory_governor
+        reservation = memory_governor.reserve(self.pname, lambda: self.canceled)
+        if not reservation:
+            return -1
+
+        try:
+            with subprocess.Popen(
+                [proc] + args,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.PIPE if input else subprocess.DEVNULL,
+                env=env,
+                text=True,
+            ) as process:
+
+                self.subproc_handle = process
+                memory_governor.attach(reservation, process.pid)
+
+                if input != None:
+                    dbg(f"input: {input}")
+                stdout, stderr = process.communicate(input)
+                returncode = process.returncode
+
+                if returncode != 0:
+                    err(f"Subprocess exited with error code {returncode}")
+
+                # Print stderr
+                if stderr and returncode != 0:
+                    err("Error output generated by subprocess:")
+                    for line in stderr.splitlines():
+                        err(line.rstrip("\n"))
+                else:
+                    dbg("Error output generated by subprocess:")
+                    for line in stderr.splitlines():
+                        dbg(line.rstrip("\n"))
+
+                # Write stderr to file
+                if stderr:
+                    with open(
+                        f"{os.path.join(cwd, proc)}_stderr.out", "w"
+                    ) as stderr_file:
+                        stderr_file.write(stderr)
+
+                # Print stdout
+                if stdout:
+                    dbg(f"Output from subprocess {proc}:")
+                    for line in stdout.splitlines():
+                        dbg(line.rstrip())
+
+                # Write stdout to file
+                if stdout:
+                    with open(
+                        f"{os.path.join(cwd, proc)}_stdout.out", "w"
+                    ) as stdout_file:
+                        stdout_file.write(stdout)
+        finally:
+            memory_governor.release(reservation)
 
         self.subproc_handle = None
 
@@ -462,23 +759,7 @@ class Parameter(ABC, Thread):
 
     def evaluate_result(self):
 
-        defaults = {
-            "minimum": {
-                "fail": True,
-                "calculation": "minimum",
-                "limit": "above",
-            },
-            "typical": {
-                "fail": False,
-                "calculation": "median",
-                "limit": "exact",
-            },
-            "maximum": {
-                "fail": True,
-                "calculation": "maximum",
-                "limit": "below",
-            },
-        }
+        defaults = SPEC_DEFAULTS
 
         # For each named result in the spec
         for named_result in self.param["spec"]:
@@ -510,18 +791,13 @@ class Parameter(ABC, Thread):
                     )
 
                     # Check if there are values for the named result
-                    if self.get_result(named_result).values:
-                        values = self.get_result(named_result).values
+                    if len(self.get_result(named_result).values) > 0:
 
                         # Calculate a single value from a vector
-                        if calculation == "minimum":
-                            result = min(values)
-                        elif calculation == "maximum":
-                            result = max(values)
-                        elif calculation == "median":
-                            result = median(values)
-                        elif calculation == "average":
-                            result = mean(values)
+                        if calculation in ["minimum", "maximum", "median", "average"]:
+                            result = self.get_result(named_result).calculate(
+                                calculation
+                            )
                         else:
                             err(f"Unknown calculation type: {calculation}")
                     else:
@@ -585,6 +861,61 @@ class Parameter(ABC, Thread):
                         # If any spec fails, fail the whole parameter
                         self.result_type = ResultType.FAILURE
 
+    def get_spec_limits(self):
+        """
+        Return the failing limits of the spec as
+        {named_result: [(entry, calculation, limit, value)]}.
+        """
+
+        spec_limits = {}
+
+        for named_result, spec in self.param["spec"].items():
+            for entry in ["minimum", "typical", "maximum"]:
+                if not entry in spec:
+                    continue
+
+                settings = dict(SPEC_DEFAULTS[entry])
+                settings.update(spec[entry])
+
+                if settings["value"] == "any" or settings["fail"] != True:
+                    continue
+
+                # Prefer the local unit, else use the global unit
+                unit = spec["unit"] if "unit" in spec else None
+                if not unit:
+                    unit = self.param["unit"] if "unit" in self.param else None
+
+                value = settings["value"]
+                if unit:
+                    value = spice_unit_convert((str(unit), str(value)))
+
+                spec_limits.setdefault(named_result, []).append(
+                    (entry, settings["calculation"], settings["limit"], float(value))
+                )
+
+        return spec_limits
+
+    def get_decisive_limits(self):
+        """
+        Return the failing limits that a single value can already violate,
+        as {named_result: [(entry, limit, value)]}. This is the case if the
+        minimum must be above or the maximum must be below the limit.
+        """
+
+        decisive_limits = {}
+
+        for named_result, limits in self.get_spec_limits().items():
+            for entry, calculation, limit, value in limits:
+                if (calculation, limit) in [
+                    ("minimum", "above"),
+                    ("maximum", "below"),
+                ]:
+                    decisive_limits.setdefault(named_result, []).append(
+                        (entry, limit, value)
+                    )
+
+        return decisive_limits
+
     def get_default_conditions(self):
         # Get the global default conditions
         conditions_default = {}
@@ -646,53 +977,7 @@ class Parameter(ABC, Thread):
         return conditions_param
 
     def generate_condition_sets(self, conditions):
-        num_sets = 1
-
-        # Get the total number of condition sets
-        for cond in conditions:
-            num_sets *= max(len(conditions[cond].values), 1)
-
-        # Get the condition sets for each simulation
-        # (the unique combinations of all conditions)
-        condition_sets = []
-        cond_index = [0] * len(conditions)
-
-        for _ in range(num_sets):
-            condition_set = {}
-            overflow = False
-
-            for index, cond in enumerate(conditions):
-                if conditions[cond].values:
-                    if conditions[cond].unit:
-                        value = conditions[cond].values[cond_index[index]]
-                        unit = conditions[cond].unit
-                        condition_set[cond] = spice_unit_convert(
-                            (str(unit), str(value))
-                        )
-                    else:
-                        condition_set[cond] = str(
-                            conditions[cond].values[cond_index[index]]
-                        )
-                else:
-                    condition_set[cond] = None
-
-                # The first condition always increments its index
-                if index == 0:
-                    cond_index[index] += 1
-                # The conditions that come after only increment
-                # if the previous condition just overflowed
-                elif overflow:
-                    cond_index[index] += 1
-                    overflow = False
-
-                # Check whether the condition reached its maximum
-                if cond_index[index] == max(len(conditions[cond].values), 1):
-                    cond_index[index] = 0
-                    overflow = True
-
-            condition_sets.append(condition_set)
-
-        return condition_sets
+        return ConditionTable(conditions)
 
     def get_condition_names_used(self, template, escape=False):
         """
@@ -761,160 +1046,27 @@ class Parameter(ABC, Thread):
         reserved,
         escape=False,
     ):
-        # Regular expressions
-        # varex:		variable name {name}
-        # sweepex:		name in {cond|value} format
-        # brackrex:		expressions in [expression] format
-
-        if escape:
-            if self.datasheet["cace_format"] <= 5.0:
-                varex = re.compile(r"\\\{([^\\\}]+)\\\}")
-                sweepex = re.compile(r"\\\{([^\\\}]+)\|([^ \\\}]+)\\\}")
-                brackrex = re.compile(r"\[([^\]]+)\]")
-            else:
-                varex = re.compile(r"CACE\\\{([^\\\}]+)\\\}")
-                sweepex = re.compile(r"CACE\\\{([^\\\}]+)\|([^ \\\}]+)\\\}")
-                brackrex = re.compile(r"CACE\[([^\]]+)\]")
-        else:
-            if self.datasheet["cace_format"] <= 5.0:
-                varex = re.compile(r"\{([^\}]+)\}")
-                sweepex = re.compile(r"\{([^\}]+)\|([^ \}]+)\}")
-                brackrex = re.compile(r"\[([^\]]+)\]")
-            else:
-                varex = re.compile(r"CACE\{([^\}]+)\}")
-                sweepex = re.compile(r"CACE\{([^\}]+)\|([^ \}]+)\}")
-                brackrex = re.compile(r"CACE\[([^\]]+)\]")
-
         if not os.path.isfile(template_path):
             err(f"Could not find template file {template_path}.")
             self.result_type = ResultType.ERROR
             return
 
-        # Read template into a list
-        with open(template_path, "r") as infile:
-            template_text = infile.read()
-
-        # Concatenate any continuation lines
-        template_lines = template_text.replace("\n+", " ").splitlines()
-
-        def varex_sub(matchobj):
-            cond_name = matchobj.group(1)
-            dbg(f"Found condition: {cond_name}.")
-
-            # For condition names in the form {cond=value}, use only the name
-            if "=" in cond_name:
-                cond_name, default = cond_name.split("=")
-
-            # Check for bit slices
-            indices = None
-            pmatch = self.vectrex.match(cond_name)
-            if pmatch:
-                cond_name = pmatch.group(1)
-                indices = pmatch.group(2).split(":")
-
-            # Check whether the condition is in the set
-            if cond_name in conditions_set:
-
-                # Condition not defined
-                if conditions_set[cond_name] == None:
-                    return matchobj.group(0)
-
-                # Simply replace with the full value
-                if not indices:
-                    replace = str(conditions_set[cond_name])
-                # Extract certain bits
-                else:
-                    try:
-
-                        # Single bit
-                        if len(indices) == 1:
-                            # Convert number into binary first
-                            length = int(indices[0]) + 1
-                            binary = format(
-                                int(conditions_set[cond_name]), f"0{length}b"
-                            )
-                            end = len(binary)
-                            replace = binary[end - 1 - int(indices[0])]
-                        # Bit slice
-                        elif len(indices) == 1:
-                            # Convert number into binary first
-                            length = max(int(indices[0]) + 1, int(indices[1]) + 1)
-                            binary = format(
-                                int(conditions_set[cond_name]), f"0{length}b"
-                            )
-                            end = len(binary)
-                            replace = binary[
-                                end - 1 - int(indices[0]) : end - int(indices[1])
-                            ]
-                        else:
-                            err(f"This bit slice is not supported: {matchobj.group(1)}")
-                            return ""
-                    except:
-                        err(f"Can't extract bit from: {conditions_set[cond_name]}")
-                        return ""
-
-                dbg(f"Replacing with {replace}.")
-                return replace
-            else:
-                err(f"Could not find {cond_name} in condition set.")
-
-            # Error, do not change the condition value
-            return matchobj.group(0)
-
-        def sweepex_sub(matchobj):
-            cond_name = matchobj.group(1)
-            cond_type = matchobj.group(2)
-            dbg(f"Found condition: {cond_name} with type {cond_type}.")
-
-            if cond_name in conditions:
-                if cond_type in conditions[cond_name].spec:
-                    replace = str(conditions[cond_name].spec[cond_type])
-                    dbg(f"Replacing with {replace}.")
-                    return replace
-                else:
-                    err(f"Could not find {cond_type} in {cond_name} in conditions.")
-            else:
-                err(f"Could not find {cond_name} in conditions.")
-            return ""
-
-        def brackrex_sub(matchobj):
-            expression = matchobj.group(1)
-            dbg(f"Found expression: {expression}.")
-
-            try:
-                # Avoid catching simple array indexes like "v[0]".
-                # Other non-expressions will just throw exceptions
-                # when passed to safe_eval().
-                btest = int(expression)
-                return matchobj.group(0)
-            except:
-                pass
-
-            try:
-                return str(safe_eval(expression))
-            except:
-                err(f"Invalid expression: {expression}.")
-            return matchobj.group(0)
-
-        # Substitute values
-        substituted_lines = []
-        for template_line in template_lines:
-
-            # Substitute variable name at {name|maximum}
-            template_line = sweepex.sub(sweepex_sub, template_line)
-
-            # Substitute variable name {name}
-            template_line = varex.sub(varex_sub, template_line)
-
-            # Evaluate expressions [2 + 2]
-            template_line = brackrex.sub(brackrex_sub, template_line)
+        # Parse the template only once
+        mtime = os.stat(template_path).st_mtime_ns
+        mtime_compiled, compiled = self.templates.get(
+            (template_path, escape), (None, None)
+        )
 
-            substituted_lines.append(template_line)
+        if mtime_compiled != mtime:
+            with open(template_path, "r") as infile:
+                compiled = CompiledTemplate(
+                    infile.read(), self.datasheet["cace_format"], escape
+                )
+            self.templates[(template_path, escape)] = (mtime, compiled)
 
         # Write the output file
         with open(substituted_path, "w") as outfile:
-            for line in substituted_lines:
-                outfile.write(f"{line}\n")
+            outfile.write(compiled.render(conditions_set, conditions))
 
     def makeplot(
         self,
@@ -1148,10 +1300,14 @@ class Parameter(ABC, Thread):
         yvalues_list = []
         label_list = []
 
+        # Values of the xvariable of each condition set
+        condition_xvalues = None
+
         if xvariable in conditions:
 
             new_condition_sets = []
             new_results_for_plot = []
+            new_xvalues = []
             hashes = []
 
             # We only want ticks at certain locations
@@ -1166,14 +1322,26 @@ class Parameter(ABC, Thread):
                     labels=conditions[xvariable].values,
                 )
 
+            # Condition sets hold the values as substituted in the netlist,
+            # plot the values of the condition like the ticks
+            condition_values = {
+                conditions[xvariable].convert(value): value
+                for value in conditions[xvariable].values
+            }
+
             # Get the result
             for condition_set, results in zip(condition_sets, results_for_plot):
 
-                # Create a deep copy of the condition set
-                condition_set = copy.deepcopy(condition_set)
+                # A shallow copy suffices, conditions are only removed
+                condition_set = dict(condition_set)
 
-                # Remove the condition at the xaxis from the condition_set
-                condition_set.pop(xvariable)
+                # Remove the condition at the xaxis from the condition_set,
+                # collated conditions contain the values of the collected runs
+                xvalues = condition_set.pop(xvariable)
+                if isinstance(xvalues, list):
+                    xvalues = list(xvalues)
+                else:
+                    xvalues = [condition_values.get(xvalues, xvalues)]
 
                 # We also need to remove unique elements, or else no hash will match
                 condition_set.pop("N")
@@ -1185,6 +1353,7 @@ class Parameter(ABC, Thread):
                 if not cur_hash in hashes:
                     new_condition_sets.append(condition_set)
                     new_results_for_plot.append(copy.deepcopy(results))
+                    new_xvalues.append(xvalues)
                     hashes.append(cur_hash)
 
                 # If it is already, we need to extend the results
@@ -1197,12 +1366,16 @@ class Parameter(ABC, Thread):
                                 new_results_for_plot[index][key].extend(
                                     list(results[key])
                                 )
+                            new_xvalues[index].extend(xvalues)
 
             condition_sets = new_condition_sets
             results_for_plot = new_results_for_plot
+            condition_xvalues = new_xvalues
 
         # Generate the x and y values
-        for condition_set, results in zip(condition_sets, results_for_plot):
+        for index, (condition_set, results) in enumerate(
+            zip(condition_sets, results_for_plot)
+        ):
 
             xvalues = None
             if xvariable:
@@ -1211,7 +1384,7 @@ class Parameter(ABC, Thread):
                     xvalues = results[xvariable]
                 # Else it may be a condition?
                 elif xvariable in conditions:
-                    xvalues = conditions[xvariable].values
+                    xvalues = condition_xvalues[index]
                 else:
                     err(f"Unknown variable: {xvariable} in plot {plot_name}.")
                     self.result_type = ResultType.ERROR
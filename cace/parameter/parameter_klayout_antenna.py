@@ -47,6 +47,7 @@ class ParameterKLayoutAntenna(Parameter):
 
     id = "KLayout.AntennaCheck"
     name = "Antenna check (KLayout)"
+    artifacts = ["gds"]
 
     config_vars = [
         Variable(
@@ -109,7 +110,7 @@ class ParameterKLayoutAntenna(Parameter):
             jobs = min(jobs, os.cpu_count())
 
         # Acquire job(s) from the global jobs semaphore
-        self.jobs_sem.acquire(jobs)
+        ticket = self.jobs_sem.acquire(jobs, self.priority)
 
         projname = self.datasheet["name"]
         paths = self.datasheet["paths"]
@@ -125,7 +126,7 @@ class ParameterKLayoutAntenna(Parameter):
         if not os.path.isfile(layout_filepath):
             err("No layout found!")
             self.result_type = ResultType.ERROR
-            self.jobs_sem.release(jobs)
+            self.jobs_sem.release(ticket.count)
             return
 
         drc_script_path = self.config["drc_script_path"]
@@ -146,7 +147,7 @@ class ParameterKLayoutAntenna(Parameter):
         if not os.path.exists(drc_script_path):
             err(f"DRC script {drc_script_path} does not exist!")
             self.result_type = ResultType.ERROR
-            self.jobs_sem.release(jobs)
+            self.jobs_sem.release(ticket.count)
             return
 
         report_file_path = os.path.join(self.param_dir, "report.xml")
@@ -179,7 +180,7 @@ class ParameterKLayoutAntenna(Parameter):
         )
 
         # Free job(s) from the global jobs semaphore
-        self.jobs_sem.release(jobs)
+        self.jobs_sem.release(ticket.count)
 
         # Advance progress bar
         if self.step_cb:
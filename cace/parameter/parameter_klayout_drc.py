@@ -48,6 +48,7 @@ class ParameterKLayoutDRC(Parameter):
 
     id = "KLayout.DRC"
     name = "Design Rule Check (KLayout)"
+    artifacts = ["gds"]
 
     config_vars = [
         Variable(
@@ -110,7 +111,7 @@ class ParameterKLayoutDRC(Parameter):
             jobs = min(jobs, os.cpu_count())
 
         # Acquire job(s) from the global jobs semaphore
-        self.jobs_sem.acquire(jobs)
+        ticket = self.jobs_sem.acquire(jobs, self.priority)
 
         projname = self.datasheet["name"]
         paths = self.datasheet["paths"]
@@ -126,7 +127,7 @@ class ParameterKLayoutDRC(Parameter):
         if not os.path.isfile(layout_filepath):
             err("No layout found!")
             self.result_type = ResultType.ERROR
-            self.jobs_sem.release(jobs)
+            self.jobs_sem.release(ticket.count)
             return
 
         drc_script_path = self.config["drc_script_path"]
@@ -155,7 +156,7 @@ class ParameterKLayoutDRC(Parameter):
         if not os.path.exists(drc_script_path):
             err(f"DRC script {drc_script_path} does not exist!")
             self.result_type = ResultType.ERROR
-            self.jobs_sem.release(jobs)
+            self.jobs_sem.release(ticket.count)
             return
 
         report_file_path = os.path.join(self.param_dir, "drc_report.lyrdb")
@@ -203,7 +204,7 @@ class ParameterKLayoutDRC(Parameter):
         )
 
         # Free job(s) from the global jobs semaphore
-        self.jobs_sem.release(jobs)
+        self.jobs_sem.release(ticket.count)
 
         # Advance progress bar
         if self.step_cb:
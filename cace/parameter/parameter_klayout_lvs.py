@@ -48,6 +48,7 @@ class ParameterKLayoutLVS(Parameter):
 
     id = "KLayout.LVS"
     name = "Layout Versus Schematic (KLayout)"
+    artifacts = ["schematic", "gds"]
 
     config_vars = [
         Variable(
@@ -95,7 +96,7 @@ class ParameterKLayoutLVS(Parameter):
         self.cancel_point()
 
         # Acquire a job from the global jobs semaphore
-        with self.jobs_sem:
+        with self.jobs_sem.permits(priority=self.priority):
 
             info("Running KLayout to get LVS report.")
 
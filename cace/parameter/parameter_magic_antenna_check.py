@@ -50,6 +50,7 @@ class ParameterMagicAntennaCheck(Parameter):
 
     id = "Magic.AntennaCheck"
     name = "Antenna check (Magic)"
+    artifacts = ["gds"]
 
     config_vars = [
         Variable(
@@ -100,7 +101,7 @@ class ParameterMagicAntennaCheck(Parameter):
         self.cancel_point()
 
         # Acquire a job from the global jobs semaphore
-        with self.jobs_sem:
+        with self.jobs_sem.permits(priority=self.priority):
 
             info(f"Running magic to check for antenna violations.")
 
@@ -50,6 +50,7 @@ class ParameterMagicArea(Parameter):
 
     id = "Magic.Geometry"
     name = "Get area, width and height (Magic)"
+    artifacts = ["gds"]
 
     config_vars = [
         Variable(
@@ -90,7 +91,7 @@ class ParameterMagicArea(Parameter):
         self.cancel_point()
 
         # Acquire a job from the global jobs semaphore
-        with self.jobs_sem:
+        with self.jobs_sem.permits(priority=self.priority):
 
             info(f"Running magic to get area measurements.")
 
@@ -45,6 +45,7 @@ class ParameterMagicDRC(Parameter):
 
     id = "Magic.DRC"
     name = "Design Rule Check (Magic)"
+    artifacts = ["gds"]
 
     config_vars = [
         Variable(
@@ -93,7 +94,7 @@ class ParameterMagicDRC(Parameter):
         self.cancel_point()
 
         # Acquire a job from the global jobs semaphore
-        with self.jobs_sem:
+        with self.jobs_sem.permits(priority=self.priority):
 
             """
             Run magic to get a DRC report
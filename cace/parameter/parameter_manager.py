@@ -23,15 +23,19 @@ import signal
 import datetime
 import threading
 
-from ..common.custom_semaphore import CustomSemaphore
+from ..common.fair_semaphore import FairSemaphore, PRIORITY_NAMES
+from ..common.job_scheduler import JobScheduler
+from ..common.runtime_history import RuntimeHistory, RUNTIMES_FILE
+from ..common.sim_cache import SimulationCache, DEFAULT_CACHE_SIZE
 
 from ..common.misc import mkdirp
 from ..common.cace_read import cace_read, cace_read_yaml
 from ..common.cace_write import (
     markdown_summary,
+    markdown_plan,
     generate_documentation,
 )
-from ..common.cace_regenerate import regenerate_netlists, regenerate_gds
+from ..common.artifact_graph import ArtifactGraph, ARTIFACTS
 from ..common.common import get_pdk_root
 
 from ..logging import (
@@ -46,6 +50,7 @@ from ..logging import (
 )
 
 from .registry import find_tool
+from .parameter import ResultType
 
 
 class ParameterManager:
@@ -56,11 +61,19 @@ class ParameterManager:
     manipulate it.
     """
 
-    def __init__(self, datasheet={}, max_runs=None, run_path=None, max_jobs=None):
+    def __init__(
+        self,
+        datasheet={},
+        max_runs=None,
+        run_path=None,
+        max_jobs=None,
+        resume_dir=None,
+    ):
         """Initialize the object with a datasheet"""
         self.datasheet = datasheet
         self.max_runs = max_runs
         self.run_path = run_path
+        self.resume_dir = resume_dir
 
         self.worker_thread = None
 
@@ -68,11 +81,30 @@ class ParameterManager:
         self.queued_lock = threading.Lock()
 
         self.running_threads = []
-        self.running_lock = threading.Lock()
+        self.running_lock = threading.RLock()
+
+        # Signaled whenever a parameter completes, so that
+        # the dispatcher can start the next one right away
+        self.running_cond = threading.Condition(self.running_lock)
+        self.completed_threads = []
+
+        # Time between a parameter completing and the
+        # next queued parameter being started
+        self.slot_freed_time = None
+        self.dispatch_latencies = []
 
         self.results = {}
         self.result_types = {}
 
+        # Produces the netlists and layouts for the parameters
+        self.artifacts = None
+
+        # Wall times of parameters and simulations
+        self.runtime_history = RuntimeHistory()
+
+        # Results of previous simulations, if enabled
+        self.sim_cache = None
+
         self.runtime_options = {}
 
         self.default_runtime_options = {
@@ -81,6 +113,15 @@ class ParameterManager:
             "sequential": False,
             "noplot": False,  # TODO test
             "parallel_parameters": 4,
+            "priority": "batch",
+            "engine": "thread",
+            "ngspice_backend": "subprocess",
+            "memory_budget": None,
+            "workers": [],
+            "resume": False,
+            "fail_fast": False,
+            "sim_cache": None,
+            "sim_cache_size": DEFAULT_CACHE_SIZE,
             "filename": None,
         }
 
@@ -100,7 +141,11 @@ class ParameterManager:
         if not self.max_jobs:
             self.max_jobs = os.cpu_count()
 
-        self.jobs_sem = CustomSemaphore(value=self.max_jobs)
+        self.jobs_sem = FairSemaphore(value=self.max_jobs)
+
+        # Shared queue for the simulation jobs of all parameters
+        self.job_scheduler = JobScheduler(max_workers=self.max_jobs)
+        self.job_scheduler.memory_governor.history = self.runtime_history
 
         info(f"Maximum number of jobs is {self.max_jobs}.")
 
@@ -238,13 +283,18 @@ class ParameterManager:
         return self.datasheet
 
     def summarize_datasheet(self):
-        return markdown_summary(
+        summary = markdown_summary(
             self.datasheet,
             self.runtime_options,
             self.results,
             self.result_types,
         )
 
+        if self.sim_cache:
+            summary += self.sim_cache.summary()
+
+        return summary
+
     def generate_documentation(self):
         if "documentation" in self.datasheet["paths"]:
             doc_path = os.path.join(
@@ -440,6 +490,15 @@ class ParameterManager:
         if not self.runtime_options["parallel_parameters"] > 0:
             err(f"parallel_parameters must be at least 1")
 
+        if not self.runtime_options["priority"] in PRIORITY_NAMES.values():
+            err(f'Invalid priority: {self.runtime_options["priority"]}')
+
+        if not self.runtime_options["engine"] in JobScheduler.engines:
+            err(f'Invalid engine: {self.runtime_options["engine"]}')
+
+        if not self.runtime_options["ngspice_backend"] in JobScheduler.ngspice_backends:
+            err(f'Invalid ngspice backend: {self.runtime_options["ngspice_backend"]}')
+
         # TODO check that other keys exist
 
     ### simulation functions ####
@@ -523,6 +582,8 @@ class ParameterManager:
                     self.max_jobs,
                     # Semaphore for starting new jobs
                     self.jobs_sem,
+                    # Queue for simulation jobs
+                    self.job_scheduler,
                     # Callbacks
                     start_cb,
                     end_cb,
@@ -530,6 +591,12 @@ class ParameterManager:
                     step_cb,
                 )
 
+                # Notify the dispatcher on completion
+                new_sim_param.complete_cb = self.parameter_completed
+
+                # Used to start the longest parameters first
+                new_sim_param.runtime_history = self.runtime_history
+
                 dbg(f"Inserting parameter {pname} into queue.")
 
                 with self.queued_lock:
@@ -547,28 +614,64 @@ class ParameterManager:
         for pname in self.datasheet["parameters"]:
             warn(pname)
 
+    def parameter_completed(self, param_thread):
+        """Called by a parameter thread once it has completed"""
+
+        with self.running_cond:
+            self.completed_threads.append(param_thread)
+
+            if param_thread in self.running_threads:
+                self.slot_freed_time = time.monotonic()
+
+            self.running_cond.notify_all()
+
     def prune_running_threads(self):
-        """Remove threads that are either marked as done or have been canceled"""
+        """Harvest the results of completed threads and remove them"""
 
-        needs_unlock = False
-        if not self.running_lock.locked():
-            self.running_lock.acquire()
-            needs_unlock = True
+        runtimes_updated = False
+
+        with self.running_lock:
+            for t in self.completed_threads:
+                # Threads canceled while queued were never running
+                if not t in self.running_threads:
+                    continue
 
-        # Get the results
-        for t in self.running_threads:
-            if not t.is_alive() and t.started:
                 if t.pname in self.results:
                     warn(f"{t.pname} already in results!")
                 self.results[t.pname] = t.results_dict
                 self.result_types[t.pname] = t.result_type
                 t.harvested = True
 
-        # Remove completed threads
-        self.running_threads = [t for t in self.running_threads if not t.harvested]
+                self.running_threads.remove(t)
+
+                # Record the runtime of completed parameters
+                if t.result_type in [ResultType.SUCCESS, ResultType.FAILURE]:
+                    runtime = t.runtime
 
-        if needs_unlock:
-            self.running_lock.release()
+                    # Resumed or cached runs would shorten the wall time
+                    if t.reused_runs:
+                        runtime = (
+                            self.runtime_history.get_parameter_runtime(t.pname)
+                            or runtime
+                        )
+
+                    # Nothing was simulated, keep the previous entry
+                    if t.reused_runs and not t.simulated_runs:
+                        self.runtime_history.keep_parameter(t.pname)
+                    else:
+                        self.runtime_history.record_parameter(
+                            t.pname,
+                            runtime,
+                            t.simulation_runtimes,
+                            self.job_scheduler.memory_governor.get_peak(t.pname),
+                            t.simulated_runs,
+                        )
+                    runtimes_updated = True
+
+            self.completed_threads = []
+
+        if runtimes_updated:
+            self.runtime_history.save(os.path.join(self.run_dir, RUNTIMES_FILE))
 
     def get_results(self):
         return self.results
@@ -599,7 +702,11 @@ class ParameterManager:
 
         return num_running
 
-    def prepare_run_dir(self):
+    def prepare_run_dir(self, dry_run=False):
+        """
+        Create the run directory and load the runtimes of previous runs.
+        With dry_run, nothing is created or deleted.
+        """
 
         self.design_dir = "."
 
@@ -618,14 +725,29 @@ class ParameterManager:
         # Check if run dir already exists
         runs = sorted(glob.glob(os.path.join(self.design_dir, run_path, "*")))
 
-        if self.run_dir in runs:
-            error("Run directory exists already. Please try again.")
+        # Continue an interrupted run
+        if self.resume_dir:
+            self.run_dir = os.path.abspath(self.resume_dir)
+
+            if not os.path.isdir(self.run_dir):
+                err(f"Run directory {self.resume_dir} does not exist.")
+                sys.exit(1)
 
-        info(f"Starting a new run with tag '{tag}'.")
-        mkdirp(self.run_dir)
+            if not dry_run:
+                info(f"Resuming the run in '{os.path.relpath(self.run_dir)}'.")
+                self.runtime_options["resume"] = True
+
+            # Never delete the resumed run
+            runs = [run for run in runs if os.path.abspath(run) != self.run_dir]
+        elif not dry_run:
+            if self.run_dir in runs:
+                error("Run directory exists already. Please try again.")
+
+            info(f"Starting a new run with tag '{tag}'.")
+            mkdirp(self.run_dir)
 
         # Delete the oldest runs if max_runs set
-        if self.max_runs and len(runs) >= self.max_runs:
+        if not dry_run and self.max_runs and len(runs) >= self.max_runs:
             runs = runs[::-1]  # Reverse runs
             # Select runs to remove
             remove = runs[self.max_runs - 1 :]
@@ -634,27 +756,94 @@ class ParameterManager:
             for run in remove:
                 shutil.rmtree(run)
 
+        # Load the runtimes of previous runs
+        self.runtime_history.load(
+            os.path.join(self.design_dir, run_path), exclude=self.run_dir
+        )
+
+        # Keep the runtimes recorded before the interruption
+        if self.resume_dir:
+            self.runtime_history.resume(self.run_dir)
+
         info(f"PDK root is '{get_pdk_root()}'.")
 
+    def configure_job_scheduler(self):
+        """Apply the runtime options to the job scheduler"""
+
+        # Distribute simulations to remote workers
+        self.job_scheduler.set_workers(self.runtime_options["workers"])
+
+        # Select how simulations and tools are run
+        self.job_scheduler.set_engine(self.runtime_options["engine"])
+        self.job_scheduler.set_ngspice_backend(self.runtime_options["ngspice_backend"])
+
+        # Hold back subprocesses that would exceed the memory budget
+        self.job_scheduler.memory_governor.set_budget(
+            self.runtime_options["memory_budget"]
+        )
+
+    def configure_sim_cache(self):
+        """Open the simulation cache of the runtime options for the queued parameters"""
+
+        path = self.runtime_options["sim_cache"]
+
+        if not path:
+            self.sim_cache = None
+        elif not self.sim_cache or self.sim_cache.path != os.path.abspath(path):
+            info(f"Using the simulation cache in '{path}'.")
+            self.sim_cache = SimulationCache(
+                path, self.runtime_options["sim_cache_size"]
+            )
+        else:
+            self.sim_cache.max_size = self.runtime_options["sim_cache_size"]
+
+        with self.queued_lock:
+            for param_thread in self.queued_threads:
+                param_thread.sim_cache = self.sim_cache
+
+    def request_artifacts(self):
+        """Start producing the netlists and layouts of all queued parameters"""
+
+        # Check again whether the artifacts are up to date
+        if not self.artifacts or self.artifacts.idle():
+            if self.artifacts:
+                self.artifacts.shutdown()
+            self.artifacts = ArtifactGraph(
+                self.datasheet, self.runtime_options, notify=self.artifact_completed
+            )
+
+        with self.queued_lock:
+            required = set()
+            for param_thread in self.queued_threads:
+                required.update(param_thread.get_required_artifacts())
+
+        self.artifacts.request(
+            [artifact for artifact in ARTIFACTS if artifact in required]
+        )
+
+    def artifact_completed(self):
+        """Called once an artifact has been produced"""
+
+        # Parameters waiting for it may be able to run now
+        with self.running_cond:
+            self.running_cond.notify_all()
+
+    def parameter_ready(self, param_thread):
+        """Whether the inputs of a parameter have been produced"""
+
+        artifacts = param_thread.get_required_artifacts()
+        self.artifacts.request(artifacts)
+        return self.artifacts.done(artifacts)
+
     def run_parameters_async(self):
         """Start a worker thread to start parameter threads"""
 
-        # Start by regenerating the netlists for the circuit-under-test
-        # (This may not be quick but all tests depend on the existence
-        # of the netlist, so it has to be done here and cannot be
-        # parallelized).
+        self.configure_job_scheduler()
+        self.configure_sim_cache()
 
-        fullnetlistpath = regenerate_netlists(self.datasheet, self.runtime_options)
-        if not fullnetlistpath:
-            err("Failed to regenerate project netlist, aborting.")
-            self.cancel_parameters(True)
-            return 1
-
-        # If mag files are given as layout, regenerate the gds if needed
-        if regenerate_gds(self.datasheet, self.runtime_options):
-            err("Failed to regenerate GDSII layout from magic layout, aborting.")
-            self.cancel_parameters(True)
-            return 1
+        # Extract the netlists and layouts in the background, each
+        # parameter is started once its own inputs are ready
+        self.request_artifacts()
 
         # Only start a new worker thread, if
         # the previous one hasn't completed yet
@@ -668,31 +857,127 @@ class ParameterManager:
     def run_parameters_thread(self):
         """Called as a thread, starts the threads of queued parameters"""
 
-        while self.queued_threads:
-
-            # Check whether we can start another parameter in parallel
-            if (
-                self.num_running_parameters()
-                < self.runtime_options["parallel_parameters"]
-            ):
-                param_thread = None
+        while True:
+            with self.running_cond:
+                # Wait until another parameter can run in parallel
+                # and the inputs of a queued parameter are ready
+                self.running_cond.wait_for(
+                    lambda: not self.queued_threads
+                    or self.num_running_parameters()
+                    < self.runtime_options["parallel_parameters"]
+                    and any(map(self.parameter_ready, list(self.queued_threads)))
+                )
 
                 # Holding both locks, move a parameter
                 # from queued to running
-                with self.running_lock:
-                    with self.queued_lock:
-                        # Could have been cancelled meanwhile
-                        if self.queued_threads:
-                            param_thread = self.queued_threads.pop()
-                            self.running_threads.append(param_thread)
+                with self.queued_lock:
+                    # Could have been cancelled meanwhile
+                    if not self.queued_threads:
+                        break
 
-                if param_thread and not param_thread.canceled:
-                    dbg(f"Running parameter {param_thread.pname}")
-                    param_thread.start()
+                    param_thread = self.pop_next_parameter(ready_only=True)
+                    self.running_threads.append(param_thread)
 
-            # Else wait until another parameter has completed
-            else:
-                time.sleep(0.1)
+                param_thread.failed_artifacts = self.artifacts.failed(
+                    param_thread.get_required_artifacts()
+                )
+
+                if self.slot_freed_time != None:
+                    latency = time.monotonic() - self.slot_freed_time
+                    self.dispatch_latencies.append(latency)
+                    self.slot_freed_time = None
+                    dbg(f"Dispatch latency: {latency * 1000:.3f} ms")
+
+            if not param_thread.canceled:
+                dbg(f"Running parameter {param_thread.pname}")
+                param_thread.start()
+
+    def pop_next_parameter(self, ready_only=False):
+        """
+        Remove the queued parameter with the longest expected
+        runtime from the queue, must hold the queued lock.
+        Parameters without a runtime history are started first,
+        ties are started in the order they were queued.
+        If ready_only is set, only parameters whose inputs
+        have been produced are considered.
+        """
+
+        def expected_runtime(index):
+            runtime = self.queued_threads[index].get_expected_runtime()
+            if runtime == None:
+                runtime = float("inf")
+            return (runtime, index)
+
+        candidates = [
+            index
+            for index, param_thread in enumerate(self.queued_threads)
+            if not ready_only or self.parameter_ready(param_thread)
+        ]
+
+        index = max(candidates, key=expected_runtime)
+
+        param_thread = self.queued_threads.pop(index)
+
+        if (runtime := param_thread.get_expected_runtime()) != None:
+            dbg(f"Expected runtime of {param_thread.pname} is {runtime:.1f}s.")
+
+        return param_thread
+
+    def plan_parameters(self):
+        """
+        Return the plan of the queued parameters without running
+        any tool, with the expected CPU and wall time in seconds
+        """
+
+        with self.queued_lock:
+            param_threads = list(self.queued_threads)
+
+        # In the order they were queued
+        parameters = {
+            param_thread.pname: param_thread.plan()
+            for param_thread in reversed(param_threads)
+        }
+
+        known = [
+            param_plan
+            for param_plan in parameters.values()
+            if param_plan["cpu_time"] != None
+        ]
+
+        cpu_time = sum(param_plan["cpu_time"] for param_plan in known)
+
+        # The CPUs are shared, but no parameter finishes faster than on its own
+        wall_time = max(
+            [cpu_time / self.max_jobs]
+            + [param_plan["wall_time"] for param_plan in known]
+        )
+
+        return {
+            "netlist_source": self.runtime_options["netlist_source"],
+            "jobs": self.max_jobs,
+            "runs": sum(param_plan["runs"] for param_plan in parameters.values()),
+            "cpu_time": round(cpu_time, 3),
+            "wall_time": round(wall_time, 3),
+            "unknown": [
+                pname
+                for pname, param_plan in parameters.items()
+                if param_plan["cpu_time"] == None
+            ],
+            "parameters": parameters,
+        }
+
+    def summarize_plan(self, plan):
+        return markdown_plan(self.datasheet, plan)
+
+    def get_dispatch_latencies(self):
+        """Return the measured dispatch latencies in seconds"""
+
+        return self.dispatch_latencies
+
+    def get_job_statistics(self):
+        """Return how long jobs have been waiting for a free CPU"""
+
+        return self.jobs_sem.statistics()
 
     def join_parameters(self):
         """Join all running parameter threads"""
@@ -703,20 +988,59 @@ class ParameterManager:
         self.worker_thread = None
 
         # Wait until all parameters are completed
-        for param_thread in self.running_threads:
-            param_thread.join()
+        for param_thread in list(self.running_threads):
+            # Parameters canceled before they were started
+            if param_thread.ident != None:
+                param_thread.join()
 
         # Remove completed threads
         self.prune_running_threads()
 
+        # Stop the simulation processes and threads
+        self.shutdown()
+
+        if self.dispatch_latencies:
+            verbose(
+                f"Parameter dispatch latency: mean {sum(self.dispatch_latencies) / len(self.dispatch_latencies) * 1000:.3f} ms, max {max(self.dispatch_latencies) * 1000:.3f} ms"
+            )
+
     def run_parameters(self):
         """Run parameters sequentially, note that simulations can still be parallelized"""
 
+        self.configure_job_scheduler()
+        self.configure_sim_cache()
+
+        self.request_artifacts()
+
         with self.queued_lock:
             while self.queued_threads:
-                param_thread = self.queued_threads.pop()
+                param_thread = self.pop_next_parameter()
+
+                param_thread.failed_artifacts = self.artifacts.wait(
+                    param_thread.get_required_artifacts()
+                )
+
+                with self.running_lock:
+                    self.running_threads.append(param_thread)
+
                 param_thread.run()
 
+        # Collect the results
+        self.prune_running_threads()
+
+        self.shutdown()
+
+    def shutdown(self):
+        """
+        Stop the worker processes and threads of the job scheduler,
+        they are started again by the next parameter
+        """
+
+        self.job_scheduler.shutdown()
+
+        if self.artifacts:
+            self.artifacts.shutdown()
+
     def cancel_parameters(self, no_cb=False):
         """Cancel all parameters"""
 
@@ -735,16 +1059,23 @@ class ParameterManager:
                 param_thread.cancel(no_cb)
                 param_thread.start()
 
+        # Wake up the dispatcher
+        with self.running_cond:
+            self.running_cond.notify_all()
+
     def cancel_running_parameters(self, no_cb=False):
         """Cancel all running parameters"""
 
-        with self.running_lock:
+        with self.running_cond:
             # Remove completed threads
             self.prune_running_threads()
 
             for param_thread in self.running_threads:
                 param_thread.cancel(no_cb)
 
+            # Canceled parameters free their slot
+            self.running_cond.notify_all()
+
     def cancel_parameter(self, pname, no_cb=False):
         """Cancel a single parameter"""
 
@@ -772,10 +1103,14 @@ class ParameterManager:
                 param_thread.cancel(no_cb)
                 param_thread.start()
 
+        # Wake up the dispatcher
+        with self.running_cond:
+            self.running_cond.notify_all()
+
     def cancel_running_parameter(self, pname, no_cb=False):
         """Cancel a single running parameter"""
 
-        with self.running_lock:
+        with self.running_cond:
 
             # Remove completed threads
             self.prune_running_threads()
@@ -784,3 +1119,6 @@ class ParameterManager:
                 # TODO also check source
                 if param_thread.param["name"] == pname:
                     param_thread.cancel(no_cb)
+
+            # Canceled parameters free their slot
+            self.running_cond.notify_all()
@@ -55,6 +55,7 @@ class ParameterNetgenLVS(Parameter):
 
     id = "Netgen.LVS"
     name = "Layout Versus Schematic (Netgen)"
+    artifacts = ["schematic", "layout"]
 
     config_vars = [
         Variable(
@@ -97,12 +98,19 @@ class ParameterNetgenLVS(Parameter):
 
         return True
 
+    def get_required_artifacts(self):
+        # LVS is not run on the schematic, don't extract the layout
+        if self.runtime_options["netlist_source"] == "schematic":
+            return []
+
+        return self.artifacts
+
     def implementation(self):
 
         self.cancel_point()
 
         # Acquire a job from the global jobs semaphore
-        with self.jobs_sem:
+        with self.jobs_sem.permits(priority=self.priority):
 
             info("Running netgen to get LVS report.")
 
@@ -14,16 +14,19 @@
 
 import os
 import re
+import math
 import csv
 import sys
 import yaml
 import time
 import shutil
+import queue
+import asyncio
 import threading
 import traceback
 import subprocess
-from multiprocessing.pool import ThreadPool
-from importlib.machinery import SourceFileLoader
+import warnings
+import numpy
 from typing import (
     Optional,
     List,
@@ -35,6 +38,10 @@ from ..config import Variable, Result
 from ..common.misc import mkdirp
 from ..common.types import Path
 from ..common.spiceunits import spice_unit_convert
+from ..common.rawfile import read_rawfile
+from ..common.spice_batch import BatchNetlist, write_batch_netlist
+from ..common.adaptive_mc import AdaptiveMonteCarlo
+from ..common.adaptive_sweep import AdaptiveSweep
 from ..common.common import (
     run_subprocess,
     set_xschem_paths,
@@ -78,17 +85,52 @@ class ParameterNgspice(Parameter):
         Variable(
             "template",
             Path,
-            "The template testbench under the `templates/` folder.",
+            "The template testbench under the `templates/` folder, either an xschem schematic (`.sch`) or a SPICE netlist (`.spice`).",
         ),
         Variable(
             "collate",
             Optional[str],
             "Merge runs with the same conditions but different iterations. Used to collate results for plotting Monte Carlo simulations.",
         ),
+        Variable(
+            "adaptive",
+            bool,
+            "Run the iterations of the `collate` condition in batches of `adaptive_batch` and stop the iterations of a condition set once each result in the spec is settled: the outcome of its limits can not change anymore with the confidence `adaptive_confidence`, or its mean is known to the relative precision `adaptive_precision`.",
+            default=False,
+        ),
+        Variable(
+            "adaptive_batch",
+            int,
+            "Number of iterations after which adaptive Monte Carlo checks whether a condition set is settled.",
+            default=10,
+        ),
+        Variable(
+            "adaptive_confidence",
+            float,
+            "Confidence of the decisions of adaptive Monte Carlo.",
+            default=0.95,
+        ),
+        Variable(
+            "adaptive_precision",
+            Optional[float],
+            "Relative precision of the mean at which adaptive Monte Carlo settles a result, e.g. `0.01` for 1%. Results in the spec without failing limits are only settled by their precision.",
+        ),
+        Variable(
+            "sweep",
+            Literal["full", "adaptive"],
+            "Either simulate all combinations of the conditions, or `adaptive` to start with the extremes and the typical value of each condition with a `step` and refine only the intervals where a result in the spec is close to its limit or deviates from a linear change.",
+            default="full",
+        ),
+        Variable(
+            "sweep_tolerance",
+            float,
+            "Margin for the refinement of an adaptive sweep, relative to the range of a result over the simulated condition sets.",
+            default=0.1,
+        ),
         Variable(
             "format",
-            Literal["ascii"],
-            "Output format of the testbench simulation result file. Currently only `ascii` is supported.",
+            Literal["ascii", "raw"],
+            "Output format of the testbench simulation result file. Either `ascii` with a column per variable, or `raw` for an ngspice rawfile with a vector per variable. Complex vectors are converted to their magnitude.",
             default="ascii",
         ),
         Variable(
@@ -112,6 +154,18 @@ class ParameterNgspice(Parameter):
             Optional[List[str | None]],
             "Results generated by the user-defined Python script. These results are available in addition to the ones specified under `variables`.",
         ),
+        Variable(
+            "netlist_once",
+            bool,
+            "Netlist the `.sch` template only once with xschem and substitute the conditions in the resulting SPICE netlist. Requires that xschem passes the `CACE{}` placeholders through unchanged.",
+            default=False,
+        ),
+        Variable(
+            "batch",
+            int,
+            "Maximum number of condition sets simulated in a single run of ngspice. Condition sets whose netlists only differ in `.param` and `.temp` values or in the values of sources and passive devices share the loaded circuit, the values are changed with `alterparam`, `option` and `alter`. The testbench must write its results in a `.control` section.",
+            default=1,
+        ),
         Variable(
             "spiceinit_path",
             Optional[Path],
@@ -133,14 +187,441 @@ class ParameterNgspice(Parameter):
         # used for the progress bar
         self.num_sims = 1
 
+        # Conditions generated by pre_start()
+        self.conditions = None
+
         self.queued_jobs = []
 
+        # Signaled whenever a job completes or the parameter is canceled
+        self.jobs_cond = threading.Condition()
+        self.pending_jobs = 0
+
+        # Set to the reason once a result violates the spec
+        self.fail_fast_limits = {}
+        self.failed_fast = None
+        self.fail_fast_lock = threading.Lock()
+
+        # Reads the results while simulations are running
+        self.collector = None
+
+        # Batches written so far
+        self.num_batches = 0
+
+        # Stops the Monte Carlo iterations that are settled
+        self.adaptive = None
+
+        # Refines the condition sets in rounds
+        self.sweep = None
+
+        # Condition set index by result file
+        self.result_sets = {}
+
     def cancel(self, no_cb):
         super().cancel(no_cb)
 
         for job in self.queued_jobs:
             job.cancel(no_cb)
 
+        if self.collector:
+            self.collector.close(wait=False)
+
+        with self.jobs_cond:
+            self.jobs_cond.notify_all()
+
+    def job_done(self, future):
+        """Wake up the parameter waiting for its jobs"""
+
+        with self.jobs_cond:
+            self.pending_jobs -= 1
+            self.jobs_cond.notify_all()
+
+    def check_results(self, job, results):
+        """Check the results of a completed simulation, job is None for previous runs"""
+
+        self.check_fail_fast(job, results)
+
+        if self.adaptive:
+            self.check_adaptive(results)
+
+    def check_fail_fast(self, job, results):
+        """
+        Check the results of a completed simulation against the decisive
+        limits and cancel the remaining simulations on a violation.
+        """
+
+        if not self.fail_fast_limits or self.failed_fast:
+            return
+
+        if job != None and job._return != 0:
+            return
+
+        for values in results.values():
+            for variable, limits in self.fail_fast_limits.items():
+                if not variable in values or len(values[variable]) == 0:
+                    continue
+
+                for spec_entry, limit, limit_value in limits:
+                    if limit == "above":
+                        value = numpy.min(values[variable])
+                        violated = value < limit_value
+                    else:
+                        value = numpy.max(values[variable])
+                        violated = value > limit_value
+
+                    if violated:
+                        self.fail_fast(
+                            f"{variable} = {value} violates the {spec_entry} of {limit_value}"
+                        )
+                        return
+
+    def read_result_file(self, result_file):
+        """Read the values of each variable from a simulation result file as arrays"""
+
+        variables = self.config["variables"] if self.config["variables"] else []
+
+        values = {}
+        for variable in variables:
+            if variable != None:
+                values[variable] = numpy.empty(0)
+
+        # Binary or ASCII rawfile, a vector per variable
+        if self.config["format"] == "raw":
+            plots = read_rawfile(result_file)
+
+            if plots:
+                for variable, vector in zip(variables, plots[0].vectors):
+                    if variable != None:
+                        if numpy.iscomplexobj(vector):
+                            vector = numpy.abs(vector)
+                        values[variable] = vector
+
+            return values
+
+        # Columns of whitespace separated values
+        try:
+            with warnings.catch_warnings():
+                # Do not warn about empty files
+                warnings.simplefilter("ignore", UserWarning)
+                data = numpy.loadtxt(result_file, dtype=numpy.float64, ndmin=2)
+            ragged = False
+        except ValueError:
+            # Rows of different length
+            ragged = True
+
+        if not ragged:
+            if data.shape[1] > len(variables) and data.shape[0] > 0:
+                raise IndexError(
+                    f"{data.shape[1]} columns, but only {len(variables)} variables"
+                )
+
+            for _index, variable in enumerate(variables[: data.shape[1]]):
+                if variable != None:
+                    values[variable] = data[:, _index]
+
+            return values
+
+        collected = {variable: [] for variable in values}
+
+        with open(result_file, newline="") as csvfile:
+            reader = csv.reader(csvfile, delimiter=" ", skipinitialspace=True)
+            for row in reader:
+                for _index, entry in enumerate(row):
+                    # Ignore empty entries (often the last element)
+                    if entry != "":
+                        # Check if there is a named variable at this index
+                        if variables[_index] != None:
+                            # If so, append the entry
+                            collected[variables[_index]].append(float(entry))
+
+        for variable in collected:
+            values[variable] = numpy.array(collected[variable], dtype=numpy.float64)
+
+        return values
+
+    def check_adaptive(self, results):
+        """Stop the Monte Carlo iterations of the settled condition sets"""
+
+        for result_file, values in results.items():
+            index = self.result_sets.get(result_file)
+            if index == None:
+                continue
+
+            reason = self.adaptive.add(index, values)
+            if not reason:
+                continue
+
+            dbg(
+                f'Parameter {self.param["name"]}: Condition set {index} settled: {reason}.'
+            )
+
+            for sim_job in self.queued_jobs:
+                if sim_job._return == None and self.is_settled(sim_job.result_files):
+                    self.settled_runs.update(sim_job.runs)
+                    sim_job.cancel(True)
+
+    def create_adaptive(self, variables, collate_condition):
+        """Return the AdaptiveMonteCarlo for the results in the spec or None"""
+
+        if not collate_condition or len(collate_condition.values) < 2:
+            warn(
+                f'Parameter {self.param["name"]}: Adaptive Monte Carlo requires a "collate" condition with iterations.'
+            )
+            return None
+
+        spec_limits = self.get_spec_limits()
+        precision = self.config["adaptive_precision"]
+
+        # Results without limits are settled by their precision
+        limits = {
+            variable: spec_limits.get(variable, [])
+            for variable in self.param["spec"]
+            if variable in variables and (variable in spec_limits or precision != None)
+        }
+
+        if not limits:
+            warn(
+                f'Parameter {self.param["name"]}: No limits or precision for adaptive Monte Carlo, running all iterations.'
+            )
+            return None
+
+        info(
+            f'Parameter {self.param["name"]}: Adaptive Monte Carlo in batches of {self.config["adaptive_batch"]} iterations.'
+        )
+
+        return AdaptiveMonteCarlo(
+            limits,
+            len(collate_condition.values),
+            self.config["adaptive_batch"],
+            self.config["adaptive_confidence"],
+            precision,
+        )
+
+    def create_sweep(self, conditions, variables):
+        """Return the AdaptiveSweep over the conditions with a step or None"""
+
+        shape = []
+        axes = {}
+        typical = {}
+
+        for dimension, condition in enumerate(conditions.values()):
+            shape.append(max(len(condition.values), 1))
+
+            # Up to three values are simulated anyway
+            if not "step" in condition.spec or len(condition.values) < 4:
+                continue
+
+            try:
+                numbers = [float(value) for value in condition.values]
+            except (TypeError, ValueError):
+                continue
+
+            # Distinct values in ascending order
+            distinct = {}
+            for value_index, number in enumerate(numbers):
+                distinct.setdefault(number, value_index)
+            axes[dimension] = sorted(
+                [(value_index, number) for number, value_index in distinct.items()],
+                key=lambda entry: entry[1],
+            )
+
+            # The typical value comes first
+            if "typical" in condition.spec:
+                typical[dimension] = 0
+
+        spec_limits = self.get_spec_limits()
+        limits = {
+            variable: [value for _, _, _, value in spec_limits.get(variable, [])]
+            for variable in self.param["spec"]
+            if variable in variables
+        }
+
+        if not axes or not limits:
+            warn(
+                f'Parameter {self.param["name"]}: No swept conditions or results for the adaptive sweep, simulating all condition sets.'
+            )
+            return None
+
+        return AdaptiveSweep(
+            shape, axes, typical, limits, self.config["sweep_tolerance"]
+        )
+
+    def refine_sweep(self, selected):
+        """Add the results of a round to the sweep, returns the next condition sets"""
+
+        if self.failed_fast:
+            return []
+
+        selected = set(selected)
+
+        for result_file, index in self.result_sets.items():
+            if not index in selected:
+                continue
+
+            # Canceled or failed simulations have no results
+            try:
+                values = self.collector.get(result_file)
+            except (OSError, ValueError, KeyError, IndexError):
+                continue
+
+            self.sweep.add(index, values)
+
+        refined = self.sweep.refine()
+
+        if refined:
+            info(
+                f'Parameter {self.param["name"]}: Refining the sweep with {len(refined)} condition sets.'
+            )
+
+        return refined
+
+    def is_settled(self, result_files):
+        """Whether the condition sets of all result files are settled"""
+
+        if not self.adaptive:
+            return False
+
+        return all(
+            self.result_sets.get(result_file) in self.adaptive.settled
+            for result_file in result_files
+        )
+
+    def fail_fast(self, reason):
+        """Cancel the simulations that have not completed yet"""
+
+        with self.fail_fast_lock:
+            if self.failed_fast:
+                return
+            self.failed_fast = reason
+
+        info(
+            f'Parameter {self.param["name"]}: {reason}, canceling the remaining simulations.'
+        )
+
+        for sim_job in self.queued_jobs:
+            if sim_job._return == None:
+                sim_job.cancel(True)
+
+    def is_completed(self, outpath, condition_set, result_name):
+        """
+        Check whether a previous run already completed the simulation
+        in outpath with the same conditions and a valid result file.
+        """
+
+        conditions_path = os.path.join(outpath, "conditions.yaml")
+        result_path = os.path.join(outpath, result_name + self.config["suffix"])
+
+        if not os.path.isfile(conditions_path) or not os.path.isfile(result_path):
+            return False
+
+        try:
+            with open(conditions_path, "r") as ifile:
+                previous = yaml.load(ifile, Loader=yaml.Loader)
+        except yaml.YAMLError:
+            return False
+
+        # Compare as written to conditions.yaml
+        current = yaml.load(
+            yaml.dump(condition_set, allow_unicode=True), Loader=yaml.Loader
+        )
+
+        # The random seed differs for each run
+        if not isinstance(previous, dict):
+            return False
+        previous.pop("random", None)
+        current.pop("random", None)
+
+        if previous != current:
+            return False
+
+        # The rawfile must contain complete plots
+        if self.config["format"] == "raw":
+            try:
+                plots = read_rawfile(result_path)
+            except (OSError, ValueError, KeyError, IndexError):
+                return False
+            return bool(plots) and not any(plot.truncated for plot in plots)
+
+        # Each entry must be a number, also rejects truncated files
+        try:
+            with open(result_path, "r") as ifile:
+                rows = [line.split() for line in ifile if line.strip()]
+            if not rows:
+                return False
+            for row in rows:
+                for entry in row:
+                    float(entry)
+        except (OSError, ValueError):
+            return False
+
+        return True
+
+    def create_batches(self, runs):
+        """
+        Group the runs whose netlists only differ in values that ngspice
+        can change and write a netlist for each batch of runs.
+        Returns {run: (batch outpath, runs of the batch)}.
+        """
+
+        # The runs are simulated in their own directories
+        if self.job_scheduler.executors.has_remote():
+            warn(
+                f'Parameter {self.param["name"]}: Batched simulations are not supported with remote workers.'
+            )
+            return {}
+
+        netlistname = os.path.splitext(self.config["template"])[0] + ".spice"
+
+        netlists = {}
+        groups = {}
+        for outpath in runs:
+            try:
+                with open(os.path.join(outpath, netlistname), "r") as ifile:
+                    netlist = BatchNetlist(ifile.read())
+            except OSError:
+                continue
+
+            key = netlist.key()
+            if key == None:
+                continue
+
+            netlists[outpath] = netlist
+            groups.setdefault(key, []).append(outpath)
+
+        batches = {}
+        num_batches = 0
+        for group in groups.values():
+            for start in range(0, len(group), self.config["batch"]):
+                members = group[start : start + self.config["batch"]]
+
+                if len(members) < 2:
+                    continue
+
+                # Unique across the rounds of an adaptive sweep
+                outpath = os.path.join(
+                    self.param_dir, f"batch_{self.num_batches + num_batches}"
+                )
+                mkdirp(outpath)
+
+                write_batch_netlist(
+                    os.path.join(outpath, netlistname),
+                    [netlists[member] for member in members],
+                    [os.path.abspath(member) for member in members],
+                )
+                self.copy_spiceinit(outpath)
+
+                for member in members:
+                    batches[member] = (outpath, members)
+                num_batches += 1
+
+        if num_batches:
+            info(
+                f'Parameter {self.param["name"]}: Simulating {len(batches)} condition sets in {num_batches} batches.'
+            )
+
+        self.num_batches += num_batches
+
+        return batches
+
     def add_simulation_job(self, job):
         self.queued_jobs.append(job)
 
@@ -157,6 +638,46 @@ class ParameterNgspice(Parameter):
             self.result_type = ResultType.ERROR
             return
 
+        self.conditions = self.get_conditions(
+            template_path, escape=template.endswith(".sch")
+        )
+
+        # Get the total number of simulations
+        self.num_sims = 1
+        for cond in self.conditions:
+            self.num_sims *= max(len(self.conditions[cond].values), 1)
+
+    def get_jobs(self):
+        """Return the number of jobs of each simulation"""
+
+        jobs = self.config["jobs"]
+
+        if jobs == "max":
+            # Set the number of jobs to the number of cores
+            return os.cpu_count()
+
+        # Make sure that jobs doesn't exceed max jobs
+        return min(jobs, self.max_jobs)
+
+    def get_collate_variable(self):
+        """Return the name of the collate condition or None"""
+
+        collate_variable = self.config["collate"]
+
+        if collate_variable:
+            # Remove any bit slices
+            pmatch = self.vectrex.match(collate_variable)
+            if pmatch:
+                collate_variable = pmatch.group(1)
+
+        return collate_variable
+
+    def get_conditions(self, template_path, escape):
+        """
+        Merge the conditions used in the template with the
+        default and parameter conditions and generate their values
+        """
+
         # Get global default conditions
         conditions_default = self.get_default_conditions()
 
@@ -169,12 +690,14 @@ class ParameterNgspice(Parameter):
 
         # Get the condition names used in the template
         # (and the default values if given)
-        conditions_template = self.get_condition_names_used(template_path, escape=True)
+        conditions_template = self.get_condition_names_used(
+            template_path, escape=escape
+        )
 
         dbg(conditions_template)
 
         if not conditions_template:
-            warn(f"No conditions found in template {template}")
+            warn(f'No conditions found in template {self.config["template"]}')
 
         # Merge, to get the final conditions
         conditions = conditions_template
@@ -201,15 +724,167 @@ class ParameterNgspice(Parameter):
         for cond in conditions:
             conditions[cond].generate_values()
 
-        # Get the total number of simulations
-        self.num_sims = 1
-        for cond in conditions:
-            self.num_sims *= max(len(conditions[cond].values), 1)
+        return conditions
+
+    def get_reserved_variables(self, outpath, index, jobs, random):
+        """Values of the reserved variables of a run"""
+
+        template = self.config["template"]
+        dutpath = self.get_dut_path()
+
+        return {
+            "filename": os.path.splitext(template)[0],
+            "templates": os.path.abspath(self.paths["templates"]),
+            "root": os.path.abspath(self.paths["root"]),
+            "simpath": os.path.abspath(outpath),
+            "DUT_name": self.datasheet["name"],
+            "netlist_source": self.runtime_options["netlist_source"],
+            "jobs": jobs,
+            "N": index,
+            "DUT_path": os.path.abspath(dutpath),
+            "PDK_ROOT": get_pdk_root(),
+            "PDK": get_pdk(),
+            "include_DUT": os.path.abspath(dutpath),
+            "random": random,
+        }
+
+    def get_dut_path(self):
+        """Return the path to the DUT netlist of the selected netlist source"""
+
+        source = self.runtime_options["netlist_source"]
+
+        if source == "schematic":
+            netlistpath = os.path.join(self.paths["netlist"], "schematic")
+        elif source == "layout":
+            netlistpath = os.path.join(self.paths["netlist"], "layout")
+        elif source == "pex":
+            netlistpath = os.path.join(self.paths["netlist"], "pex")
+        elif source == "rcx":
+            netlistpath = os.path.join(self.paths["netlist"], "rcx")
+
+        return os.path.join(
+            self.paths["root"],
+            netlistpath,
+            self.datasheet["name"] + ".spice",
+        )
+
+    def write_primitive_symbol(self, outpath):
+        """Copy the xschem symbol of the DUT and convert it to a primitive"""
+
+        dname = self.datasheet["name"]
+        xschemname = dname + ".sym"
+
+        schempath = self.paths["schematic"]
+        symbolfilename = os.path.join(schempath, xschemname)
+        primfilename = os.path.join(outpath, xschemname)
+
+        if not os.path.isfile(symbolfilename):
+            err(f"Could not find xschem symbol {symbolfilename}.")
+            return False
+
+        with open(symbolfilename, "r") as ifile:
+            symboldata = ifile.read()
+            primdata = symboldata.replace("type=subcircuit", "type=primitive")
+
+        with open(primfilename, "w") as ofile:
+            ofile.write(primdata)
+
+        return True
+
+    def run_xschem(self, schematic, outpath, netlistname):
+        """Run xschem to convert a testbench schematic to a SPICE netlist"""
+
+        # Add the path with the modififed DUT symbol to the search path.
+        # Note that testbenches use a version of the DUT symbol that is
+        # marked as "primitive" so that it does not get added to the netlist directly.
+        # The netlist must be included by a ".include" statement in the testbenches.
+        primfilename = os.path.join(outpath, self.datasheet["name"] + ".sym")
+        tcllist = ["append XSCHEM_LIBRARY_PATH :" + primfilename]
+
+        # Add the templates path to the search path
+        # It could be that there are symbols for stimuli generation etc.
+        tcllist.append(
+            "append XSCHEM_LIBRARY_PATH :" + os.path.abspath(self.paths["templates"])
+        )
+
+        tclstr = " ; ".join(tcllist)
+
+        # Xschem arguments:
+        # -n:  Generate a netlist
+        # -s:  Netlist type is SPICE
+        # -r:  Bypass readline (because stdin/stdout are piped)
+        # -x:  No X11 / No GUI window
+        # -q:  Quit after processing command line
+        # --tcl: Tcl commands
+        xschemargs = [
+            "-n",
+            "-s",
+            "-r",
+            "-x",
+            "-q",
+            "--tcl",
+            tclstr,
+        ]
+
+        pdk_root = get_pdk_root()
+        pdk = get_pdk()
+
+        # Use the PDK xschemrc file for xschem startup
+        xschemrcfile = os.path.join(pdk_root, pdk, "libs.tech", "xschem", "xschemrc")
+        if os.path.isfile(xschemrcfile):
+            xschemargs.extend(["--rcfile", xschemrcfile])
+        else:
+            err(f"No xschemrc file found in the {pdk} PDK.")
+
+        xschemargs.extend(["-o", outpath, "-N", netlistname])
+        xschemargs.append(schematic)
+
+        return self.run_subprocess("xschem", xschemargs, cwd=outpath)
+
+    def copy_spiceinit(self, outpath):
+        """Copy the .spiceinit file to the simulation directory"""
+
+        pdk_root = get_pdk_root()
+        pdk = get_pdk()
+
+        # If none, get the spiceinit file from the PDK
+        if spiceinit_path := self.config["spiceinit_path"] == None:
+            spiceinit_path = os.path.join(
+                pdk_root, pdk, "libs.tech", "ngspice", "spiceinit"
+            )
+            if not os.path.isfile(spiceinit_path):
+                spiceinit_path = os.path.join(
+                    pdk_root,
+                    pdk,
+                    "libs.tech",
+                    "ngspice",
+                    ".spiceinit",
+                )
+                if not os.path.isfile(spiceinit_path):
+                    spiceinit_path = os.path.join(
+                        pdk_root,
+                        pdk,
+                        "libs.tech",
+                        "ngspice",
+                        "spinit",
+                    )
+
+        if os.path.isfile(spiceinit_path):
+            # Copy spiceinit file to run dir
+            shutil.copyfile(spiceinit_path, os.path.join(outpath, ".spiceinit"))
+        else:
+            warn(f'No "spiceinit" file found in the {pdk} PDK.')
 
     def implementation(self):
 
         info(f'Parameter {self.param["name"]}: Generating simulation files…')
 
+        # Simulations completed by a previous, interrupted run
+        self.completed_runs = []
+
+        # Simulations skipped or canceled as their condition set settled
+        self.settled_runs = set()
+
         variables = self.config["variables"] if self.config["variables"] else []
 
         # Add all named results
@@ -226,108 +901,155 @@ class ParameterNgspice(Parameter):
             if variable != None:
                 self.add_result(NamedResult(variable))
 
-        jobs = self.config["jobs"]
+        # Limits that a single simulation result can violate
+        if self.runtime_options["fail_fast"]:
+            self.fail_fast_limits = {
+                named_result: limits
+                for named_result, limits in self.get_decisive_limits().items()
+                if named_result in variables
+            }
 
-        if jobs == "max":
-            # Set the number of jobs to the number of cores
-            jobs = os.cpu_count()
-        else:
-            # Make sure that jobs doesn't exceed max jobs
-            jobs = min(jobs, self.max_jobs)
+        jobs = self.get_jobs()
 
         template = self.config["template"]
         template_path = os.path.join(self.paths["templates"], template)
         run_template_path = os.path.join(self.param_dir, template)
         template_ext = os.path.splitext(template)[1]
 
-        # A schematic is given as template, this means we need
-        # to perform the substitutions on the schematic
-        if template_ext == ".sch":
+        # A schematic or a SPICE netlist is given as template
+        if not template_ext in [".sch", ".spice"]:
+            err(f"Unsupported file extension for template: {template}")
+            self.result_type = ResultType.ERROR
+            return
+
+        if not os.path.isfile(template_path):
+            err(f"Could not find template file {template_path}.")
+            self.result_type = ResultType.ERROR
+            return
+
+        # Copy template testbench to run dir
+        shutil.copyfile(template_path, run_template_path)
+
+        # The conditions are generated by pre_start()
+        if self.conditions == None:
+            self.pre_start()
+        conditions = self.conditions
 
-            if not os.path.isfile(template_path):
-                err(f"Could not find template file {template_path}.")
+        dbg(f"Total number of simulations: {self.num_sims}")
+
+        # If "collate" is set this means we need to merge
+        # the results were all conditions but the collate conditions is the same
+        # This is useful for MC simulations, where the results of different iterations,
+        # but under the same conditions (e.g. temperature) should be collated.
+
+        # First remove the collate condition from the conditions
+        if collate_variable := self.get_collate_variable():
+            info(f'Collating results using condition "{collate_variable}"')
+
+            if collate_variable in conditions:
+                collate_condition = conditions.pop(collate_variable)
+                dbg(collate_condition)
+            else:
+                err(
+                    f'Couldn\'t find condition "{collate_variable}" used for collating the results.'
+                )
+
+        # Stop the iterations once the results are settled
+        if self.config["adaptive"]:
+            self.adaptive = self.create_adaptive(
+                variables, collate_condition if self.config["collate"] else None
+            )
+
+        # Generate the condition sets for each simulation
+        condition_sets = self.generate_condition_sets(conditions)
+
+        # Simulate only the condition sets that matter
+        if self.config["sweep"] == "adaptive":
+            self.sweep = self.create_sweep(conditions, variables)
+
+        # Substitute the conditions directly in the SPICE netlist
+        template_netlist = run_template_path
+
+        # Netlist the template once, the placeholders are
+        # kept by xschem and substituted in the SPICE netlist
+        if template_ext == ".sch" and self.config["netlist_once"]:
+            netlist_dir = os.path.join(self.param_dir, "netlist")
+            mkdirp(netlist_dir)
+
+            netlistname = os.path.splitext(template)[0] + ".spice"
+            template_netlist = os.path.join(netlist_dir, netlistname)
+
+            if not self.write_primitive_symbol(netlist_dir):
                 self.result_type = ResultType.ERROR
                 return
 
-            # Copy template testbench to run dir
-            shutil.copyfile(template_path, run_template_path)
+            returncode = self.run_xschem(run_template_path, netlist_dir, netlistname)
+
+            if returncode or not os.path.isfile(template_netlist):
+                err(f"Failed to netlist the template {template}.")
+                self.result_type = ResultType.ERROR
+                return
+
+        # Result files of the runs
+        result_files = {}
+
+        # Iteration of the collate condition by run
+        run_iterations = {}
+
+        # Keys of the runs in the simulation cache
+        cache_entries = {}
 
-            # Get global default conditions
-            conditions_default = self.get_default_conditions()
+        # Read each result as soon as its simulation has completed
+        self.collector = ResultCollector(
+            self.read_result_file,
+            self.check_results if self.fail_fast_limits or self.adaptive else None,
+        )
+        self.collector.start()
+
+        # Seed of the last run of each condition set
+        seeds = numpy.zeros(condition_sets.size, dtype=numpy.int64)
+
+        def derived(row):
+            """The reserved variables of the last run of a condition set"""
+
+            max_digits = len(str(condition_sets.size))
+            outpath = os.path.join(self.param_dir, f"run_{row:0{max_digits}d}")
+
+            if self.config["collate"]:
+                last = max(len(collate_condition.values) - 1, 0)
+                outpath = os.path.join(outpath, f"run_{last:0{max_digits}d}")
+
+            return self.get_reserved_variables(outpath, row, jobs, str(seeds[row]))
+
+        # Keep the reserved variables for the summaries and scripts
+        condition_sets.derived = derived
 
-            # Get parameter conditions
-            conditions_param = self.get_param_conditions()
+        # Hack until reserved variables and conditions are properly separated
+        for cond in self.get_reserved_variables(self.param_dir, 0, jobs, "0"):
+            if cond in conditions and conditions[cond].values:
+                warn(f"Condition uses name of reserved variable: {cond}")
 
-            # Get the condition names used in the template
-            # (and the default values if given)
-            conditions_template = self.get_condition_names_used(
-                run_template_path, escape=True
+        # Condition sets to simulate, refined in rounds by an adaptive sweep
+        selected = list(range(len(condition_sets)))
+        if self.sweep:
+            selected = self.sweep.initial_sets()
+            info(
+                f'Parameter {self.param["name"]}: Adaptive sweep starting with {len(selected)} of {len(condition_sets)} condition sets.'
             )
 
-            if not conditions_template:
-                warn(f"No conditions found in template {template}")
-
-            # Merge, to get the final conditions
-            conditions = conditions_template
-            for cond in conditions:
-
-                # First, overwrite with global defaults
-                if cond in conditions_default:
-                    conditions[cond] = conditions_default[cond]
-
-                # Secondly, overwrite with parameter
-                if cond in conditions_param:
-                    if conditions_param[cond].description:
-                        conditions[cond].description = conditions_param[
-                            cond
-                        ].description
-                    if conditions_param[cond].display:
-                        conditions[cond].display = conditions_param[cond].display
-                    if conditions_param[cond].unit:
-                        conditions[cond].unit = conditions_param[cond].unit
-                    if conditions_param[cond].spec:
-                        conditions[cond].spec = conditions_param[cond].spec
-
-            # Generate the values for each condition
-            for cond in conditions:
-                conditions[cond].generate_values()
-
-            # Get the total number of simulations
-            self.num_sims = 1
-            for cond in conditions:
-                self.num_sims *= max(len(conditions[cond].values), 1)
-
-            dbg(f"Total number of simulations: {self.num_sims}")
-
-            # If "collate" is set this means we need to merge
-            # the results were all conditions but the collate conditions is the same
-            # This is useful for MC simulations, where the results of different iterations,
-            # but under the same conditions (e.g. temperature) should be collated.
-
-            # First remove the collate condition from the conditions
-            if collate_variable := self.config["collate"]:
-                # Remove any bit slices
-                pmatch = self.vectrex.match(collate_variable)
-                if pmatch:
-                    collate_variable = pmatch.group(1)
-
-                info(f'Collating results using condition "{collate_variable}"')
-
-                if collate_variable in conditions:
-                    collate_condition = conditions.pop(collate_variable)
-                    dbg(collate_condition)
-                else:
-                    err(
-                        f'Couldn\'t find condition "{collate_variable}" used for collating the results.'
-                    )
+        while selected:
+            num_completed = len(self.completed_runs)
+            num_queued = len(self.queued_jobs)
 
-            # Generate the condition sets for each simulation
-            condition_sets = self.generate_condition_sets(conditions)
+            # Runs to simulate in this round
+            pending_runs = []
+            cached_runs = 0
 
             # For each condition set, substitute the
             # testbench template with it
             max_digits = len(str(len(condition_sets)))
-            for index, condition_set in enumerate(condition_sets):
+            for index in selected:
+                condition_set = condition_sets[index]
 
                 # Inner loop for collate variable (if set)
                 collate_values = [1]
@@ -353,50 +1075,22 @@ class ParameterNgspice(Parameter):
                     mkdirp(outpath)
 
                     # Get DUT netlist path
-                    source = self.runtime_options["netlist_source"]
-
-                    if source == "schematic":
-                        netlistpath = os.path.join(self.paths["netlist"], "schematic")
-                    elif source == "layout":
-                        netlistpath = os.path.join(self.paths["netlist"], "layout")
-                    elif source == "pex":
-                        netlistpath = os.path.join(self.paths["netlist"], "pex")
-                    elif source == "rcx":
-                        netlistpath = os.path.join(self.paths["netlist"], "rcx")
-
-                    dutpath = os.path.join(
-                        self.paths["root"],
-                        netlistpath,
-                        self.datasheet["name"] + ".spice",
-                    )
+                    dutpath = self.get_dut_path()
 
                     if not os.path.isfile(dutpath):
                         err(f"Could not find dut netlist {dutpath}.")
 
-                    reserved = {
-                        "filename": os.path.splitext(template)[0],
-                        "templates": os.path.abspath(self.paths["templates"]),
-                        "root": os.path.abspath(self.paths["root"]),
-                        "simpath": os.path.abspath(outpath),
-                        "DUT_name": self.datasheet["name"],
-                        "netlist_source": source,
-                        "jobs": jobs,
-                        "N": index,
-                        "DUT_path": os.path.abspath(dutpath),
-                        "PDK_ROOT": get_pdk_root(),
-                        "PDK": get_pdk(),
-                        "include_DUT": os.path.abspath(dutpath),
-                        "random": str(int(time.time() * 1000) & 0x7FFFFFFF),
-                    }
+                    reserved = self.get_reserved_variables(
+                        outpath,
+                        index,
+                        jobs,
+                        str(int(time.time() * 1000) & 0x7FFFFFFF),
+                    )
+                    seeds[index] = int(reserved["random"])
 
                     # Set the reserved variables
                     for cond in condition_set:
                         if cond in reserved:
-                            # Hack until reserved variables and conditions are properly separated
-                            if collate_index == 0 and condition_set[cond] != None:
-                                warn(
-                                    f"Condition uses name of reserved variable: {cond}"
-                                )
                             condition_set[cond] = reserved[cond]
 
                     # Add the collate condition
@@ -409,6 +1103,25 @@ class ParameterNgspice(Parameter):
                         if condition_set[cond] == None:
                             warn(f"Condition {cond} not defined")
 
+                    result_files[outpath] = os.path.join(
+                        outpath,
+                        os.path.splitext(template)[0]
+                        + f"_{index}"
+                        + self.config["suffix"],
+                    )
+                    self.result_sets[result_files[outpath]] = index
+                    run_iterations[outpath] = collate_index
+
+                    # Reuse the simulation of an interrupted run
+                    if self.runtime_options["resume"] and self.is_completed(
+                        outpath,
+                        condition_set,
+                        os.path.splitext(template)[0] + f"_{index}",
+                    ):
+                        dbg(f"Reusing results in '{os.path.relpath(outpath)}'.")
+                        self.completed_runs.append(outpath)
+                        continue
+
                     # Write conditions set
                     with open(os.path.join(outpath, "conditions.yaml"), "w") as outfile:
                         yaml.dump(
@@ -418,199 +1131,173 @@ class ParameterNgspice(Parameter):
                             allow_unicode=True,
                         )
 
-                    outfile = os.path.join(outpath, template)
-                    dbg(f"Substituting with {condition_set} in {outfile}")
+                    netlistname = os.path.splitext(template)[0] + ".spice"
 
-                    # Run the substitution
-                    self.substitute(
-                        run_template_path,
-                        outfile,
-                        condition_set,
-                        conditions,
-                        reserved={},
-                        escape=True,
-                    )
+                    # Substitute the conditions in the SPICE netlist
+                    if template_ext == ".spice" or self.config["netlist_once"]:
+                        outfile = os.path.join(outpath, netlistname)
+                        dbg(f"Substituting with {condition_set} in {outfile}")
 
-                    # Copy the xschem symbol
-                    # and convert to primitive!
+                        self.substitute(
+                            template_netlist,
+                            outfile,
+                            condition_set,
+                            conditions,
+                            reserved={},
+                        )
 
-                    dname = self.datasheet["name"]
-                    xschemname = dname + ".sym"
+                    # Substitute the conditions in the schematic and netlist it
+                    else:
+                        outfile = os.path.join(outpath, template)
+                        dbg(f"Substituting with {condition_set} in {outfile}")
 
-                    schempath = self.paths["schematic"]
-                    symbolfilename = os.path.join(schempath, xschemname)
-                    primfilename = os.path.join(outpath, xschemname)
+                        # Run the substitution
+                        self.substitute(
+                            run_template_path,
+                            outfile,
+                            condition_set,
+                            conditions,
+                            reserved={},
+                            escape=True,
+                        )
 
-                    if not os.path.isfile(symbolfilename):
-                        err(f"Could not find xschem symbol {symbolfilename}.")
-                        self.result_type = ResultType.ERROR
-                        return
+                        if not self.write_primitive_symbol(outpath):
+                            self.collector.close(wait=False)
+                            self.result_type = ResultType.ERROR
+                            return
 
-                    with open(symbolfilename, "r") as ifile:
-                        symboldata = ifile.read()
-                        primdata = symboldata.replace(
-                            "type=subcircuit", "type=primitive"
-                        )
+                        returncode = self.run_xschem(outfile, outpath, netlistname)
 
-                    with open(primfilename, "w") as ofile:
-                        ofile.write(primdata)
+                        """if returncode:
+                            self.result_type = ResultType.ERROR
+                            return"""
 
-                    # Run xschem to convert the testbench schematic
-                    # to a spice netlist
+                    self.copy_spiceinit(outpath)
 
-                    # Add the path with the modififed DUT symbol to the search path.
-                    # Note that testbenches use a version of the DUT symbol that is
-                    # marked as "primitive" so that it does not get added to the netlist directly.
-                    # The netlist must be included by a ".include" statement in the testbenches.
-                    tcllist = ["append XSCHEM_LIBRARY_PATH :" + primfilename]
+                    # Reuse the results of an identical simulation
+                    if self.sim_cache:
+                        key = self.sim_cache.key(outpath, netlistname)
 
-                    # Add the templates path to the search path
-                    # It could be that there are symbols for stimuli generation etc.
-                    tcllist.append(
-                        "append XSCHEM_LIBRARY_PATH :"
-                        + os.path.abspath(self.paths["templates"])
-                    )
+                        if key:
+                            if self.sim_cache.restore(key, outpath) and os.path.isfile(
+                                result_files[outpath]
+                            ):
+                                dbg(
+                                    f"Reusing cached results in '{os.path.relpath(outpath)}'."
+                                )
+                                self.completed_runs.append(outpath)
+                                cached_runs += 1
+                                continue
 
-                    tclstr = " ; ".join(tcllist)
-
-                    # Xschem arguments:
-                    # -n:  Generate a netlist
-                    # -s:  Netlist type is SPICE
-                    # -r:  Bypass readline (because stdin/stdout are piped)
-                    # -x:  No X11 / No GUI window
-                    # -q:  Quit after processing command line
-                    # --tcl: Tcl commands
-                    xschemargs = [
-                        "-n",
-                        "-s",
-                        "-r",
-                        "-x",
-                        "-q",
-                        "--tcl",
-                        tclstr,
-                    ]
+                            cache_entries[outpath] = (
+                                key,
+                                self.sim_cache.snapshot(outpath),
+                            )
 
-                    pdk_root = get_pdk_root()
-                    pdk = get_pdk()
+                    pending_runs.append(outpath)
 
-                    # Use the PDK xschemrc file for xschem startup
-                    xschemrcfile = os.path.join(
-                        pdk_root, pdk, "libs.tech", "xschem", "xschemrc"
-                    )
-                    if os.path.isfile(xschemrcfile):
-                        xschemargs.extend(["--rcfile", xschemrcfile])
-                    else:
-                        err(f"No xschemrc file found in the {pdk} PDK.")
+            # Simulate condition sets with the same circuit together
+            batches = {}
+            if self.config["batch"] > 1 and len(pending_runs) > 1:
+                batches = self.create_batches(pending_runs)
 
-                    xschemargs.extend(
-                        [
-                            "-o",
-                            outpath,
-                            "-N",
-                            os.path.splitext(template)[0] + ".spice",
-                        ]
-                    )
-                    xschemargs.append(outfile)
+            if cached_runs:
+                info(
+                    f'Parameter {self.param["name"]}: Reusing {cached_runs} cached simulations.'
+                )
 
-                    returncode = self.run_subprocess("xschem", xschemargs, cwd=outpath)
+            if len(self.completed_runs) - num_completed > cached_runs:
+                info(
+                    f'Parameter {self.param["name"]}: Reusing {len(self.completed_runs) - num_completed - cached_runs} completed simulations.'
+                )
 
-                    """if returncode:
-                        self.result_type = ResultType.ERROR
-                        return"""
+            # Run all simulations
+            running_jobs = []
 
-                    # Copy the .spiceinit file to the simulation directory
-                    # If none, get the spiceinit file from the PDK
-                    if spiceinit_path := self.config["spiceinit_path"] == None:
-                        spiceinit_path = os.path.join(
-                            pdk_root, pdk, "libs.tech", "ngspice", "spiceinit"
-                        )
-                        if not os.path.isfile(spiceinit_path):
-                            spiceinit_path = os.path.join(
-                                pdk_root,
-                                pdk,
-                                "libs.tech",
-                                "ngspice",
-                                ".spiceinit",
-                            )
-                            if not os.path.isfile(spiceinit_path):
-                                spiceinit_path = os.path.join(
-                                    pdk_root,
-                                    pdk,
-                                    "libs.tech",
-                                    "ngspice",
-                                    "spinit",
-                                )
+            info(f'Parameter {self.param["name"]}: Running simulations…')
 
-                    if os.path.isfile(spiceinit_path):
-                        # Copy spiceinit file to run dir
-                        shutil.copyfile(
-                            spiceinit_path, os.path.join(outpath, ".spiceinit")
-                        )
-                    else:
-                        warn(f'No "spiceinit" file found in the {pdk} PDK.')
+            self.cancel_point()
 
-        # We directly got a spice netlist,
-        # perform the substitutions on it
-        elif template_ext == ".spice":
-            err("TODO: Implement substitution for spice templates!")
-            self.result_type = ResultType.ERROR
-            return
-        else:
-            err(f"Unsupported file extension for template: {template}")
+            # Also read the results of previous runs in the meantime
+            for outpath in self.completed_runs[num_completed:]:
+                self.collector.submit([result_files[outpath]])
 
-        # Run all simulations
-        running_jobs = []
+            # Run simulation jobs sequentially
+            if self.runtime_options["sequential"]:
+                max_digits = len(str(len(condition_sets)))
+                for index in selected:
+                    condition_set = condition_sets[index]
 
-        info(f'Parameter {self.param["name"]}: Running simulations…')
+                    # Inner loop for collate variable (if set)
+                    collate_values = [1]
+                    if self.config["collate"]:
+                        collate_values = collate_condition.values
+                        max_digits_collate = len(str(len(collate_values)))
 
-        self.cancel_point()
+                    for collate_index, collate_value in enumerate(collate_values):
 
-        # Run simulation jobs sequentially
-        if self.runtime_options["sequential"]:
-            max_digits = len(str(len(condition_sets)))
-            for index, condition_set in enumerate(condition_sets):
+                        self.cancel_point()
 
-                # Inner loop for collate variable (if set)
-                collate_values = [1]
-                if self.config["collate"]:
-                    collate_values = collate_condition.values
-                    max_digits_collate = len(str(len(collate_values)))
+                        # Get directory for this run
+                        outpath = os.path.join(
+                            self.param_dir, f"run_{index:0{max_digits}d}"
+                        )
 
-                for collate_index, collate_value in enumerate(collate_values):
+                        if self.config["collate"]:
+                            outpath = os.path.join(
+                                outpath, f"run_{collate_index:0{max_digits}d}"
+                            )
 
-                    self.cancel_point()
+                        # A result already violated the spec
+                        if self.failed_fast:
+                            continue
 
-                    # Get directory for this run
-                    outpath = os.path.join(
-                        self.param_dir, f"run_{index:0{max_digits}d}"
-                    )
+                        # Simulated by an interrupted run
+                        if outpath in self.completed_runs:
+                            if self.step_cb:
+                                self.step_cb(self.param)
+                            continue
 
-                    if self.config["collate"]:
-                        outpath = os.path.join(
-                            outpath, f"run_{collate_index:0{max_digits}d}"
-                        )
+                        runs = [outpath]
 
-                    new_sim_job = SimulationJob(
-                        self.param,
-                        outpath,
-                        os.path.splitext(template)[0] + ".spice",
-                        self.jobs_sem,
-                        jobs,
-                        self.step_cb,
-                    )
-                    self.add_simulation_job(new_sim_job)
+                        # Simulated in a batch, started with its first run
+                        if outpath in batches:
+                            if batches[outpath][1][0] != outpath:
+                                continue
+                            outpath, runs = batches[outpath]
 
-                    new_sim_job.start()
-                    new_sim_job.join()
+                        # The iterations of the condition sets are settled
+                        if self.is_settled([result_files[run] for run in runs]):
+                            self.settled_runs.update(runs)
+                            continue
 
-        # Run simulation jobs in parallel
-        else:
-            # Use a thread pool to get the return value
-            with ThreadPool(processes=None) as pool:
+                        new_sim_job = SimulationJob(
+                            self.param,
+                            outpath,
+                            os.path.splitext(template)[0] + ".spice",
+                            self.jobs_sem,
+                            jobs,
+                            self.priority,
+                            self.job_scheduler,
+                            self.step_cb,
+                        )
+                        new_sim_job.runs = runs
+                        new_sim_job.result_files = [result_files[run] for run in runs]
+                        self.add_simulation_job(new_sim_job)
+
+                        new_sim_job.start()
+                        new_sim_job.join()
+
+                        # Wait for the check before starting the next simulation
+                        self.collector.submit(new_sim_job.result_files, new_sim_job)
+                        self.collector.flush()
 
+            # Run simulation jobs in parallel
+            else:
                 # Schedule all simulations
                 max_digits = len(str(len(condition_sets)))
-                for index, condition_set in enumerate(condition_sets):
+                for index in selected:
+                    condition_set = condition_sets[index]
 
                     # Inner loop for collate variable (if set)
                     collate_values = [1]
@@ -630,36 +1317,120 @@ class ParameterNgspice(Parameter):
                                 outpath, f"run_{collate_index:0{max_digits}d}"
                             )
 
+                        # Simulated by an interrupted run
+                        if outpath in self.completed_runs:
+                            if self.step_cb:
+                                self.step_cb(self.param)
+                            continue
+
+                        runs = [outpath]
+
+                        # Simulated in a batch, started with its first run
+                        if outpath in batches:
+                            if batches[outpath][1][0] != outpath:
+                                continue
+                            outpath, runs = batches[outpath]
+
+                        # The iterations of the condition sets are settled
+                        if self.is_settled([result_files[run] for run in runs]):
+                            self.settled_runs.update(runs)
+                            continue
+
                         new_sim_job = SimulationJob(
                             self.param,
                             outpath,
                             os.path.splitext(template)[0] + ".spice",
                             self.jobs_sem,
                             jobs,
+                            self.priority,
+                            self.job_scheduler,
                             self.step_cb,
                         )
+                        new_sim_job.runs = runs
+                        new_sim_job.result_files = [result_files[run] for run in runs]
                         self.add_simulation_job(new_sim_job)
 
-                        running_jobs.append(pool.apply_async(new_sim_job.run, ()))
+                # Start the longest simulations of previous runs first
+                sim_jobs = self.queued_jobs[num_queued:]
+                if self.adaptive:
+                    # Run the iterations of all condition sets in step
+                    sim_jobs.sort(key=lambda job: run_iterations[job.runs[0]])
+                elif self.runtime_history:
+                    sim_runtimes = self.runtime_history.get_simulation_runtimes(
+                        self.pname
+                    )
+                    sim_jobs.sort(
+                        key=lambda job: -sim_runtimes.get(
+                            os.path.relpath(job.outpath, self.param_dir), float("inf")
+                        )
+                    )
 
-                # Wait for completion
-                while 1:
-                    self.cancel_point()
+                with self.jobs_cond:
+                    self.pending_jobs += len(sim_jobs)
+
+                # Enqueue into the run-wide job queue
+                for sim_job in sim_jobs:
+                    future = self.job_scheduler.submit(sim_job)
+
+                    # Read and check each result as soon as it is available
+                    future.add_done_callback(
+                        lambda future, job=sim_job: self.collector.submit(
+                            job.result_files, job
+                        )
+                    )
 
-                    # Check if all tasks have completed
-                    if all([job.ready() for job in running_jobs]):
-                        break
+                    future.add_done_callback(self.job_done)
 
-                    time.sleep(0.1)
+                    running_jobs.append(future)
 
-                # Get the results
-                for job in running_jobs:
-                    if job.get() != 0:
-                        self.result_type = ResultType.ERROR
-                        return
+                # Wait for completion
+                with self.jobs_cond:
+                    self.jobs_cond.wait_for(
+                        lambda: self.canceled or self.pending_jobs == 0
+                    )
+
+                self.cancel_point()
+
+                # Get the results, canceled jobs have no result
+                if not self.failed_fast:
+                    for sim_job, job in zip(sim_jobs, running_jobs):
+                        if sim_job.canceled:
+                            continue
+                        if job.result() != 0:
+                            self.collector.close(wait=False)
+                            self.result_type = ResultType.ERROR
+                            return
 
                 self.cancel_point()
 
+            # Refine the sweep with the results of this round
+            self.collector.flush()
+
+            selected = self.refine_sweep(selected) if self.sweep else []
+
+        # Wait until the last results have been read
+        self.collector.close()
+
+        # Record the wall time of each simulation
+        for sim_job in self.queued_jobs:
+            if sim_job.runtime != None:
+                self.simulation_runtimes[
+                    os.path.relpath(sim_job.outpath, self.param_dir)
+                ] = sim_job.runtime
+                self.simulated_runs += len(sim_job.runs)
+
+        self.reused_runs = len(self.completed_runs)
+
+        # Add the new results to the simulation cache
+        for sim_job in self.queued_jobs:
+            if sim_job._return != 0:
+                continue
+
+            for run, result_file in zip(sim_job.runs, sim_job.result_files):
+                if run in cache_entries and os.path.isfile(result_file):
+                    key, snapshot = cache_entries[run]
+                    self.sim_cache.store(key, run, snapshot)
+
         info(f'Parameter {self.param["name"]}: Collecting results…')
 
         # Get the result
@@ -672,6 +1443,35 @@ class ParameterNgspice(Parameter):
 
         simulation_values = []
 
+        # The user-defined script runs for all condition sets in parallel
+        script_path = None
+        if script := self.config["script"]:
+            script_path = os.path.join(self.datasheet["paths"]["scripts"], script)
+
+            if not os.path.isfile(script_path):
+                err(f"No such user script {script_path}.")
+                self.result_type = ResultType.ERROR
+                return
+
+            info(
+                f"Running user-defined script '[repr.filename][link=file://{os.path.abspath(script_path)}]{os.path.relpath(script_path)}[/link][/repr.filename]'…"
+            )
+
+        # Collated values and script of each condition set
+        collected_sets = []
+
+        # After failing fast or stopping the iterations,
+        # only the completed simulations are collected
+        partial = (
+            self.failed_fast != None or self.adaptive != None or self.sweep != None
+        )
+        if partial:
+            completed_runs = set(self.completed_runs)
+            for sim_job in self.queued_jobs:
+                if sim_job._return == 0:
+                    completed_runs.update(sim_job.runs)
+            skipped_sets = set()
+
         for index, condition_set in enumerate(condition_sets):
 
             # Inner loop for collate variable (if set)
@@ -686,6 +1486,12 @@ class ParameterNgspice(Parameter):
                 if variable != None:
                     collated_values[variable] = []
 
+            # Arrays read from the result files
+            collated_arrays = {variable: [] for variable in collated_values}
+
+            # Values of the collate condition of the collected runs
+            collected_collate_values = []
+
             for collate_index, collate_value in enumerate(collate_values):
 
                 # Get directory for this run
@@ -696,8 +1502,13 @@ class ParameterNgspice(Parameter):
                         outpath, f"run_{collate_index:0{max_digits}d}"
                     )
 
+                if partial and not outpath in completed_runs:
+                    continue
+
+                collected_collate_values.append(collate_value)
+
                 # Read the result file
-                if format == "ascii":
+                if format in ["ascii", "raw"]:
 
                     result_file = os.path.join(
                         outpath,
@@ -709,91 +1520,88 @@ class ParameterNgspice(Parameter):
                         self.result_type = ResultType.ERROR
                         return
 
-                    with open(result_file, newline="") as csvfile:
-                        reader = csv.reader(
-                            csvfile, delimiter=" ", skipinitialspace=True
-                        )
-                        for row in reader:
-                            for _index, entry in enumerate(row):
-                                # Ignore empty entries (often the last element)
-                                if entry != "":
-                                    # Check if there is a named variable at this index
-                                    if variables[_index] != None:
-                                        # If so, append the entry
-                                        collated_values[variables[_index]].append(
-                                            float(entry)
-                                        )
+                    try:
+                        values = self.collector.load(result_file)
+                    except (ValueError, KeyError, IndexError) as e:
+                        err(f"Could not read result file {result_file}: {e}")
+                        self.result_type = ResultType.ERROR
+                        return
+
+                    for variable in values:
+                        collated_arrays[variable].append(values[variable])
                 else:
                     err(f"Unsupported format for the simulation result.")
 
+            # No simulation of this condition set was completed
+            if partial and not collected_collate_values:
+                skipped_sets.add(index)
+                continue
+
+            for variable in collated_arrays:
+                if collated_arrays[variable]:
+                    collated_values[variable] = numpy.concatenate(
+                        collated_arrays[variable]
+                    )
+
             dbg(f"collated values: {collated_values}")
 
             # Put back the collate condition for script and plotting
             if self.config["collate"]:
-                condition_sets[index][collate_variable] = collate_values
+                condition_sets.update(
+                    index, {collate_variable: collected_collate_values}
+                )
+                condition_set = condition_sets[index]
 
-                dbg(f"collated condition: {condition_sets[index][collate_variable]}")
+                dbg(f"collated condition: {condition_set[collate_variable]}")
 
             dbg(f"Extending final result…")
 
             for variable in variables:
                 if variable != None:
                     # Extend the final result
-                    self.get_result(variable).values.extend(collated_values[variable])
+                    self.get_result(variable).extend(collated_values[variable])
 
-            # Postprocess using user-defined script
-            if script := self.config["script"]:
-                script_path = os.path.join(self.datasheet["paths"]["scripts"], script)
+                    # Scripts and plots get the values as lists
+                    collated_values[variable] = numpy.asarray(
+                        collated_values[variable]
+                    ).tolist()
 
-                info(
-                    f"Running user-defined script '[repr.filename][link=file://{os.path.abspath(script_path)}]{os.path.relpath(script_path)}[/link][/repr.filename]'…"
+            # Postprocess using user-defined script
+            task = None
+            if script_path:
+                task = self.job_scheduler.script_runner.submit(
+                    script_path, collated_values, condition_set
                 )
 
-                if not os.path.isfile(script_path):
-                    err(f"No such user script {script_path}.")
-                    self.result_type = ResultType.ERROR
-                    return
-
-                try:
-                    user_script = SourceFileLoader(
-                        "user_script", script_path
-                    ).load_module()
-
-                    class CustomPrint:
-                        def __enter__(self):
-                            self._stdout = sys.stdout
-                            sys.stdout = self
-                            return self
-
-                        def __exit__(self, *args):
-                            sys.stdout = self._stdout
-
-                        def write(self, text):
-                            text = text.rstrip()
-                            if len(text) == 0:
-                                return
-                            info(text)
+            collected_sets.append((collated_values, task))
 
-                        def flush(self):
-                            self._stdout.flush()
+        # Merge the results of the scripts in the order of the condition sets
+        for collated_values, task in collected_sets:
+            script_values = {}
 
-                        def __getattr__(self, attr):
-                            return getattr(self._stdout, attr)
+            if task:
+                script_values, output, error = task.result()
 
-                    with CustomPrint() as output:
-                        script_values = user_script.postprocess(
-                            collated_values, condition_set
-                        )
-
-                        # Merge collated and script variables
-                        collated_values.update(script_values)
+                # Print the output of the script
+                for line in output.splitlines():
+                    if line.strip():
+                        info(line.rstrip())
 
-                except Exception:
+                if error:
                     err(f"Error in user script:")
-                    traceback.print_exc()
+                    for line in error.splitlines():
+                        err(line)
+                    self.result_type = ResultType.ERROR
+                    return
+
+                if not isinstance(script_values, dict):
+                    err(f"User script must return a dictionary.")
                     self.result_type = ResultType.ERROR
                     return
 
+                # Merge collated and script variables
+                collated_values.update(script_values)
+
             for variable in script_variables:
                 if variable != None:
                     # Check for variable in results
@@ -803,11 +1611,21 @@ class ParameterNgspice(Parameter):
                         return
 
                     # Extend the final result
-                    self.get_result(variable).values.extend(script_values[variable])
+                    self.get_result(variable).extend(script_values[variable])
 
             simulation_values.append(collated_values)
             self.result_type = ResultType.SUCCESS
 
+        # Keep the condition sets in line with the simulation values
+        if partial:
+            condition_sets = condition_sets.select(
+                [
+                    index
+                    for index in range(len(condition_sets))
+                    if not index in skipped_sets
+                ]
+            )
+
         dbg(f"simulation_values: {simulation_values}")
         dbg(f"results_dict: {self.results_dict}")
 
@@ -836,6 +1654,25 @@ class ParameterNgspice(Parameter):
             simulation_values,
         )
 
+        # Report the simulations saved by stopping the iterations,
+        # a canceled simulation may have completed nonetheless
+        if self.adaptive:
+            saved = len(self.settled_runs - completed_runs)
+
+            info(
+                f'Parameter {self.param["name"]}: Adaptive Monte Carlo settled {len(self.adaptive.settled)} of {len(condition_sets)} condition sets, saving {saved} of {len(result_files)} simulations.'
+            )
+
+            simulation_summary += f"\n**Adaptive Monte Carlo**: settled {len(self.adaptive.settled)} of {len(condition_sets)} condition sets, saved {saved} of {len(result_files)} simulations\n"
+
+        # Report the condition sets saved by the adaptive sweep
+        if self.sweep:
+            info(
+                f'Parameter {self.param["name"]}: Adaptive sweep simulated {len(self.sweep.simulated)} of {self.sweep.num_sets} condition sets.'
+            )
+
+            simulation_summary += f"\n**Adaptive sweep**: simulated {len(self.sweep.simulated)} of {self.sweep.num_sets} condition sets\n"
+
         # Get path for the simulation summary
         outpath_sim_summary = os.path.join(self.param_dir, f"simulation_summary.md")
 
@@ -851,7 +1688,11 @@ class ParameterNgspice(Parameter):
         console.print(Markdown(simulation_summary))
 
         # Create a plot if specified
-        if "plot" in self.param:
+        if self.failed_fast:
+            info(
+                f'Parameter {self.param["name"]}: Skipping plots of the incomplete results.'
+            )
+        elif "plot" in self.param:
             # Create the plots and save them
             for named_plot in self.param["plot"]:
                 self.makeplot(
@@ -905,13 +1746,13 @@ class ParameterNgspice(Parameter):
         summary_table += f'| {" | ".join(header_separators)} |\n'
 
         # Generate the entries
-        max_digits = len(str(len(condition_sets)))
+        max_digits = len(str(condition_sets.size))
         max_entries_list = 3
         for index, (condition_set, sim_values) in enumerate(
             zip(condition_sets, simulation_values)
         ):
             body_entries = []
-            body_entries.append(f"run_{index:0{max_digits}d}")
+            body_entries.append(f"run_{condition_sets.row(index):0{max_digits}d}")
 
             for cond in conditions_in_summary:
                 if isinstance(condition_set[cond], list):
@@ -1001,13 +1842,13 @@ class ParameterNgspice(Parameter):
             csvwriter.writerow(header_entries)
 
             # Generate the entries
-            max_digits = len(str(len(condition_sets)))
+            max_digits = len(str(condition_sets.size))
             max_entries_list = 3
             for index, (condition_set, sim_values) in enumerate(
                 zip(condition_sets, simulation_values)
             ):
                 body_entries = []
-                body_entries.append(f"run_{index:0{max_digits}d}")
+                body_entries.append(f"run_{condition_sets.row(index):0{max_digits}d}")
 
                 for cond in conditions_in_summary:
                     if isinstance(condition_set[cond], list):
@@ -1077,6 +1918,171 @@ class ParameterNgspice(Parameter):
     def get_num_steps(self):
         return self.num_sims
 
+    def plan(self):
+        plan = super().plan()
+
+        # The conditions of a run
+        self.pre_start()
+
+        if self.result_type == ResultType.ERROR:
+            plan["error"] = f'Could not find template file {self.config["template"]}.'
+            return plan
+
+        conditions = self.conditions
+        runs = self.num_sims
+
+        # Iterations are simulated for each condition set
+        iterations = 1
+        if (collate_variable := self.get_collate_variable()) in conditions:
+            iterations = max(len(conditions[collate_variable].values), 1)
+
+        plan["runs"] = runs
+        plan["condition_sets"] = runs // iterations
+        plan["iterations"] = iterations
+
+        # Swept conditions only
+        plan["conditions"] = {
+            cond: len(condition.values)
+            for cond, condition in conditions.items()
+            if len(condition.values) > 1
+        }
+
+        # Fewer runs may be simulated
+        plan["adaptive"] = bool(
+            self.config["adaptive"] or self.config["sweep"] == "adaptive"
+        )
+
+        # Mean wall time of a run in previous runs
+        plan["cpu_time"] = None
+        plan["wall_time"] = None
+        if self.runtime_history:
+            sim_runtimes = self.runtime_history.get_simulation_runtimes(self.pname)
+            if sim_runtimes:
+                simulated = self.runtime_history.get_simulated_runs(self.pname)
+                run_time = sum(sim_runtimes.values()) / (simulated or len(sim_runtimes))
+
+                # Each simulation reserves as many CPUs as jobs
+                jobs = self.get_jobs()
+
+                parallel = max(self.max_jobs // jobs, 1)
+                if self.runtime_options["sequential"]:
+                    parallel = 1
+
+                plan["cpu_time"] = round(run_time * runs * jobs, 3)
+                plan["wall_time"] = round(run_time * math.ceil(runs / parallel), 3)
+
+        return plan
+
+    def get_required_artifacts(self):
+        # Simulate the netlist of the selected source
+        return [self.runtime_options["netlist_source"]]
+
+
+class ResultCollector(threading.Thread):
+    """
+    Reads the result files of the simulations as they complete,
+    so that the results are ready once the last simulation is done.
+    """
+
+    def __init__(self, read_cb, check_cb=None):
+        self.read_cb = read_cb
+
+        # Called with the job and its results by result file
+        self.check_cb = check_cb
+
+        self.queue = queue.Queue()
+
+        # Values or exception by result file
+        self.results = {}
+        self.results_lock = threading.Lock()
+
+        super().__init__(name="cace-collector", daemon=True)
+
+    def submit(self, result_files, job=None):
+        """Read the result files, of a completed job if given"""
+
+        self.queue.put((result_files, job))
+
+    def flush(self):
+        """Wait until all submitted result files have been read"""
+
+        self.queue.join()
+
+    def close(self, wait=True):
+        """Stop after the submitted result files have been read"""
+
+        self.queue.put(None)
+        if wait:
+            self.join()
+
+    def run(self):
+        while True:
+            entry = self.queue.get()
+
+            try:
+                if entry == None:
+                    return
+
+                result_files, job = entry
+
+                # Failed or canceled
+                if job and job._return != 0:
+                    continue
+
+                results = {}
+                for result_file in result_files:
+                    try:
+                        values = self.read_cb(result_file)
+                        results[result_file] = values
+                    except OSError:
+                        # Read again when collecting
+                        continue
+                    except (ValueError, KeyError, IndexError) as e:
+                        values = e
+
+                    with self.results_lock:
+                        self.results[result_file] = values
+
+                if self.check_cb:
+                    self.check_cb(job, results)
+
+            except Exception:
+                traceback.print_exc()
+
+            finally:
+                self.queue.task_done()
+
+    def get(self, result_file):
+        """Return the values of a result file and keep them for load()"""
+
+        with self.results_lock:
+            values = self.results.get(result_file)
+
+        if values == None:
+            values = self.read_cb(result_file)
+
+            with self.results_lock:
+                self.results[result_file] = values
+
+        if isinstance(values, Exception):
+            raise values
+
+        return values
+
+    def load(self, result_file):
+        """Return the values of a result file, reads it if needed"""
+
+        with self.results_lock:
+            values = self.results.pop(result_file, None)
+
+        if values == None:
+            return self.read_cb(result_file)
+
+        if isinstance(values, Exception):
+            raise values
+
+        return values
+
 
 class SimulationJob(threading.Thread):
     """
@@ -1090,6 +2096,8 @@ class SimulationJob(threading.Thread):
         simfile,
         jobs_sem,
         jobs,
+        priority,
+        job_scheduler,
         step_cb,
         *args,
         **kwargs,
@@ -1099,20 +2107,60 @@ class SimulationJob(threading.Thread):
         self.simfile = simfile
         self.jobs_sem = jobs_sem
         self.jobs = jobs
+        self.priority = priority
+        self.memory_governor = job_scheduler.memory_governor
+        self.executors = job_scheduler.executors
         self.step_cb = step_cb
 
+        # Request for the jobs semaphore
+        self.ticket = None
+        self.ticket_released = False
+        self.ticket_lock = threading.Lock()
+
+        # Future of the job, set by the JobScheduler
+        self.future = None
+
         self.canceled = False
         self.subproc_handle = None
         self._return = None
 
+        # Wall time of the simulation
+        self.runtime = None
+
+        # Run directories simulated by this job, more than one for a batch
+        self.runs = [outpath]
+
+        # Result files, checked when failing fast
+        self.result_files = []
+
         super().__init__(*args, **kwargs)
 
     def cancel(self, no_cb):
         self.canceled = True
 
+        # Stop waiting for the jobs semaphore, or free
+        # the permits if they were granted meanwhile
+        if self.ticket and not self.jobs_sem.withdraw(self.ticket):
+            self.release_ticket()
+
+        # Remove from the job queue or kill the
+        # process when running on the asyncio engine
+        if self.future:
+            self.future.cancel()
+
         if self.subproc_handle:
             self.subproc_handle.kill()
 
+    def release_ticket(self):
+        """Free the permits of a granted ticket, only once"""
+
+        with self.ticket_lock:
+            if not self.ticket or not self.ticket.granted or self.ticket_released:
+                return
+            self.ticket_released = True
+
+        self.jobs_sem.release(self.ticket.count)
+
     def cancel_point(self):
         """If canceled, exit the thread"""
 
@@ -1125,50 +2173,65 @@ class SimulationJob(threading.Thread):
             f'Subprocess {proc} {" ".join(args)} at \'[repr.filename][link=file://{os.path.abspath(cwd)}]{os.path.relpath(cwd)}[/link][/repr.filename]\'…'
         )
 
-        with subprocess.Popen(
-            [proc] + args,
-            cwd=cwd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            stdin=subprocess.PIPE if input else subprocess.DEVNULL,
-            env=env,
-            text=True,
-        ) as process:
-
-            self.subproc_handle = process
-
-            dbg(input)
-            stdout, stderr = process.communicate(input)
-            returncode = process.returncode
-
-            if returncode != 0:
-                err(f"Subprocess exited with error code {returncode}")
-
-            # Print stderr
-            if stderr and returncode != 0:
-                err("Error output generated by subprocess:")
-                for line in stderr.splitlines():
-                    err(line.rstrip("\n"))
-            else:
-                dbg("Error output generated by subprocess:")
-                for line in stderr.splitlines():
-                    dbg(line.rstrip("\n"))
-
-            # Write stderr to file
-            if stderr:
-                with open(f"{os.path.join(cwd, proc)}_stderr.out", "w") as stderr_file:
-                    stderr_file.write(stderr)
-
-            # Print stdout
-            if stdout:
-                dbg(f"Output from subprocess {proc}:")
-                for line in stdout.splitlines():
-                    dbg(line.rstrip())
-
-            # Write stdout to file
-            if stdout:
-                with open(f"{os.path.join(cwd, proc)}_stdout.out", "w") as stdout_file:
-                    stdout_file.write(stdout)
+        # Wait for enough free memory
+        memory_governor = self.memory_governor
+        reservation = memory_governor.reserve(self.param["name"], lambda: self.canceled)
+        if not reservation:
+            return -1
+
+        try:
+            with subprocess.Popen(
+                [proc] + args,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.PIPE if input else subprocess.DEVNULL,
+                env=env,
+                text=True,
+            ) as process:
+
+                self.subproc_handle = process
+                memory_governor.attach(reservation, process.pid)
+
+                dbg(input)
+                stdout, stderr = process.communicate(input)
+                returncode = process.returncode
+
+                # Canceled simulations are killed
+                if returncode != 0 and not self.canceled:
+                    err(f"Subprocess exited with error code {returncode}")
+
+                # Print stderr
+                if stderr and returncode != 0 and not self.canceled:
+                    err("Error output generated by subprocess:")
+                    for line in stderr.splitlines():
+                        err(line.rstrip("\n"))
+                else:
+                    dbg("Error output generated by subprocess:")
+                    for line in stderr.splitlines():
+                        dbg(line.rstrip("\n"))
+
+                # Write stderr to file
+                if stderr:
+                    with open(
+                        f"{os.path.join(cwd, proc)}_stderr.out", "w"
+                    ) as stderr_file:
+                        stderr_file.write(stderr)
+
+                # Print stdout
+                if stdout:
+                    dbg(f"Output from subprocess {proc}:")
+                    for line in stdout.splitlines():
+                        dbg(line.rstrip())
+
+                # Write stdout to file
+                if stdout:
+                    with open(
+                        f"{os.path.join(cwd, proc)}_stdout.out", "w"
+                    ) as stdout_file:
+                        stdout_file.write(stdout)
+        finally:
+            memory_governor.release(reservation)
 
         self.subproc_handle = None
 
@@ -1177,28 +2240,107 @@ class SimulationJob(threading.Thread):
     def run(self):
         self.cancel_point()
 
-        # Acquire job(s) from the global jobs semaphore
-        self.jobs_sem.acquire(self.jobs)
+        # Wait for a free slot on any executor
+        executor = self.executors.acquire(lambda: self.canceled)
+        if not executor:
+            sys.exit()
 
-        self.cancel_point()
+        try:
+            self.run_on(executor)
+        finally:
+            self.executors.release(executor)
 
-        # Run ngspice
-        returncode = self.run_subprocess(
-            "ngspice",
-            ["--batch", self.simfile],
-            cwd=self.outpath,
-        )
+        # For when the join function is called
+        return self._return
 
-        self.cancel_point()
+    def run_on(self, executor):
+        """Run the simulation with the given executor"""
 
-        self._return = returncode
+        # Remote workers have their own CPUs
+        if executor.local:
+            # Acquire job(s) from the global jobs semaphore
+            self.ticket = self.jobs_sem.request(self.jobs, self.priority)
 
-        # Call the step cb -> advance progress bar
-        if self.step_cb:
-            self.step_cb(self.param)
+            # The request was withdrawn
+            if not self.ticket.wait():
+                sys.exit()
 
-        # Free job(s) from the global jobs semaphore
-        self.jobs_sem.release(self.jobs)
+        try:
+            self.cancel_point()
+
+            start_time = time.monotonic()
+
+            # Run ngspice
+            returncode = executor.run(self)
+
+            self.runtime = time.monotonic() - start_time
+
+            self.cancel_point()
+
+            self._return = returncode
+
+            # Call the step cb -> advance progress bar
+            if self.step_cb:
+                for run in self.runs:
+                    self.step_cb(self.param)
+
+        finally:
+            # Free job(s) from the global jobs semaphore
+            if executor.local:
+                self.release_ticket()
+
+    async def run_async(self, engine):
+        """Run the simulation as a coroutine on the asyncio engine"""
+
+        if self.canceled:
+            return None
+
+        # Acquire job(s) from the global jobs semaphore
+        self.ticket = self.jobs_sem.request_async(self.jobs, self.priority)
+
+        try:
+            # The request was withdrawn
+            if not await self.ticket.wait_async():
+                return None
+        except asyncio.CancelledError:
+            # Granted before the cancellation arrived
+            if not self.jobs_sem.withdraw(self.ticket):
+                self.release_ticket()
+            raise
+
+        try:
+            if self.canceled:
+                return None
+
+            # Wait for enough free memory
+            reservation = await self.memory_governor.reserve_async(self.param["name"])
+
+            try:
+                start_time = time.monotonic()
+
+                # Run ngspice
+                returncode = await engine.run_subprocess(
+                    "ngspice",
+                    ["--batch", self.simfile],
+                    cwd=self.outpath,
+                    started_cb=lambda pid: self.memory_governor.attach(
+                        reservation, pid
+                    ),
+                )
+
+                self.runtime = time.monotonic() - start_time
+            finally:
+                self.memory_governor.release(reservation)
+
+            self._return = returncode
+
+            # Call the step cb -> advance progress bar
+            if self.step_cb:
+                for run in self.runs:
+                    self.step_cb(self.param)
+
+        finally:
+            # Free job(s) from the global jobs semaphore
+            self.release_ticket()
 
-        # For when the join function is called
         return self._return